@@ -0,0 +1,147 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# Benchmarks of the local platform and of the federated learning round loop, based on pytest-benchmark.
+# To save the results of a revision, then compare another revision against them:
+#   python -m pytest benchmarks --benchmark-autosave
+#   python -m pytest benchmarks --benchmark-compare
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import subprocess
+
+import numpy as np
+import pytest
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+import pycloudmessenger.ffl.abstractions as ffl
+import demo.platform_utils as utils
+
+
+HOST = '127.0.0.1'
+# Started in a separate process, on a free port, so that the benchmarks do not compete with it for the GIL
+SERVE = 'import musketeer; musketeer.app.run(host=musketeer.HOST, port=%d, debug=False, threaded=True)'
+STARTUP_TIMEOUT = 30
+# Shapes of the weights of the neural_network demo model
+CNN_SHAPES = [(3, 3, 1, 32), (32,), (3, 3, 32, 64), (64,), (9216, 128), (128,), (128, 10), (10,)]
+
+
+def model_weights(scale=1, seed=0):
+    """
+    Random weights shaped like the demo model, its dense layer widened by scale.
+    """
+    random = np.random.RandomState(seed)
+    shapes = list(CNN_SHAPES)
+    shapes[4:7] = [(9216, 128 * scale), (128 * scale,), (128 * scale, 10)]
+
+    return [random.standard_normal(shape).astype(np.float32) for shape in shapes]
+
+
+@pytest.fixture(params=[1, 8], ids=['cnn', 'cnn_x8'])
+def model(request):
+    """
+    Weights of a realistic model: the demo model, and a wider one.
+    """
+    return model_weights(request.param)
+
+
+@pytest.fixture(scope='session')
+def credentials(tmp_path_factory):
+    """
+    Start the local platform and return the path of a credentials file pointing to it.
+    """
+    with socket.socket() as probe:
+        probe.bind((HOST, 0))
+        port = probe.getsockname()[1]
+
+    server = subprocess.Popen([sys.executable, '-c', SERVE % port], cwd=os.path.join(ROOT, 'local_platform'),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    path = tmp_path_factory.mktemp('platform') / 'credentials.json'
+    path.write_text(json.dumps({'url': 'http://' + HOST, 'port': port}))
+
+    start = time.time()
+    while True:
+        try:
+            requests.get('http://%s:%d/get_tasks' % (HOST, port), timeout=1)
+            break
+        except requests.ConnectionError:
+            if server.poll() is not None or time.time() - start > STARTUP_TIMEOUT:
+                server.kill()
+                raise Exception('The local platform did not start')
+            time.sleep(0.1)
+
+    yield str(path)
+
+    server.terminate()
+    server.wait()
+
+
+@pytest.fixture(params=['local', 'inproc'])
+def platform(request, credentials):
+    """
+    Name of the platform to benchmark: the local flask platform, or the in-process broker.
+    """
+    return request.param
+
+
+@pytest.fixture
+def connect(platform, credentials):
+    """
+    Return a function creating a fresh task joined by a number of participants,
+    which returns the aggregator and participants of the task.
+    """
+    def connect(participants=1, definition=None):
+        task_name = 'benchmark_%s' % uuid.uuid4().hex
+        context = utils.platform(platform, credentials, 'aggregator', 'password')
+
+        with ffl.Factory.user(context) as user:
+            user.create_task(task_name, ffl.Topology.star, definition or {})
+
+        users = []
+        for i in range(participants):
+            participant_context = utils.platform(platform, credentials, '%s_%d' % (task_name, i), 'password')
+
+            with ffl.Factory.user(participant_context) as user:
+                user.join_task(task_name)
+
+            users.append(ffl.Factory.participant(participant_context, task_name=task_name))
+
+        aggregator = ffl.Factory.aggregator(context, task_name=task_name)
+
+        with aggregator:
+            for _ in range(participants):
+                aggregator.receive(STARTUP_TIMEOUT)
+
+        return aggregator, users
+
+    return connect
@@ -0,0 +1,68 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import pytest
+
+from fl_algorithm.aggregation import StreamingAverage, RobustAverage, RULES
+
+pytest.importorskip('pytest_benchmark')
+
+# Distinct updates, reused in turn for larger quorums to bound memory
+UPDATES = 4
+
+
+@pytest.mark.parametrize('quorum', [2, 8, 32])
+def test_streaming_average(benchmark, model, quorum):
+    """
+    Time to fold the updates of a round into the average and return the new weights.
+    """
+    updates = [[weights * (1 + seed) for weights in model] for seed in range(UPDATES)]
+    average = StreamingAverage(model)
+
+    def aggregate():
+        average.reset()
+        for i in range(quorum):
+            average.add(updates[i % UPDATES], 1000)
+        return average.result()
+
+    benchmark(aggregate)
+
+
+@pytest.mark.parametrize('quorum', [8, 32])
+@pytest.mark.parametrize('rule', RULES)
+def test_robust_average(benchmark, model, rule, quorum):
+    """
+    Time to stack the updates of a round and aggregate them with each rule, over all the cores.
+    """
+    updates = [[weights * (1 + seed) for weights in model] for seed in range(UPDATES)]
+    average = RobustAverage(model, rule, byzantine=1, capacity=quorum)
+
+    def aggregate():
+        average.reset()
+        for i in range(quorum):
+            average.add(updates[i % UPDATES], 1000)
+        return average.result()
+
+    benchmark(aggregate)
@@ -0,0 +1,76 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+import sys
+import uuid
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('tensorflow')
+
+DEMO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'demo')
+sys.path.append(DEMO)
+
+import simulate
+
+ROUNDS = 2
+TRAINING_SIZE = 10000
+TEST_SIZE = 1000
+
+
+def synthetic_dataset(directory, seed=0):
+    """
+    Fill the dataset cache with random images, so that no download is needed.
+    """
+    random = np.random.RandomState(seed)
+    arrays = {'x_train': random.randint(0, 256, (TRAINING_SIZE, 28, 28), dtype=np.uint8),
+              'y_train': random.randint(0, 10, TRAINING_SIZE, dtype=np.uint8),
+              'x_test': random.randint(0, 256, (TEST_SIZE, 28, 28), dtype=np.uint8),
+              'y_test': random.randint(0, 10, TEST_SIZE, dtype=np.uint8)}
+
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, '%s_%d.npy' % (name, seed)), array)
+
+
+@pytest.mark.parametrize('participants', [2, 4])
+def test_round(benchmark, credentials, tmp_path, monkeypatch, participants):
+    """
+    Time of the rounds of the neural_network task, with each participant training in its own process.
+    """
+    synthetic_dataset(str(tmp_path))
+    monkeypatch.setenv('MUSKETEER_DATA', str(tmp_path))
+    # The demo scripts find the algorithms relative to the demo directory
+    monkeypatch.chdir(DEMO)
+
+    def run():
+        return simulate.simulate('local', credentials, 'aggregator', 'password', 'benchmark_%s' % uuid.uuid4().hex,
+                                 participants, ROUNDS)
+
+    result = benchmark.pedantic(run, rounds=1, iterations=1)
+
+    benchmark.extra_info['rounds'] = [timing['time'] for timing in result['aggregator']]
@@ -0,0 +1,72 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import pytest
+from pycloudmessenger.serializer import JsonPickleSerializer
+
+from comm.serializer import BinarySerializer
+from fl_algorithm.model_state import ModelState
+
+pytest.importorskip('pytest_benchmark')
+
+SERIALIZERS = {'binary': BinarySerializer, 'jsonpickle': JsonPickleSerializer}
+
+
+@pytest.mark.parametrize('serializer', list(SERIALIZERS))
+def test_serialize(benchmark, model, serializer):
+    """
+    Cost of serializing a model update.
+    """
+    serializer = SERIALIZERS[serializer]()
+    message = {'update': model, 'samples': 1000, 'round': 0}
+
+    benchmark(serializer.serialize, message)
+    benchmark.extra_info['bytes'] = len(serializer.serialize(message))
+
+
+@pytest.mark.parametrize('serializer', list(SERIALIZERS))
+def test_deserialize(benchmark, model, serializer):
+    """
+    Cost of deserializing a model update.
+    """
+    serializer = SERIALIZERS[serializer]()
+    message = serializer.serialize({'update': model, 'samples': 1000, 'round': 0})
+
+    benchmark(serializer.deserialize, message)
+    benchmark.extra_info['bytes'] = len(message)
+
+
+def test_model_state_round_trip(benchmark, model):
+    """
+    Cost of sending the global model as a model state and rebuilding its layers on receipt.
+    """
+    serializer = BinarySerializer()
+    state = ModelState.from_layers(model)
+
+    def round_trip():
+        message = serializer.deserialize(serializer.serialize(state.to_message(round=0)))
+        return ModelState.from_message(message).layers
+
+    benchmark(round_trip)
@@ -0,0 +1,79 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+import re
+import sys
+import subprocess
+import uuid
+
+
+DEMO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'demo')
+# Budget of the time spent importing modules by a short command, in seconds
+IMPORT_BUDGET = 0.3
+# Modules the short commands must not import: the algorithms and the cloud platform
+HEAVY = ['tensorflow', 'keras', 'fl_algorithm.neural_network', 'pycloudmessenger.ffl.fflapi', 'pika']
+# Line of the output of -X importtime: self and cumulative microseconds, then the module, indented by depth
+IMPORT_TIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+
+def import_times(*args):
+    """
+    Run the command line with -X importtime, and return the cumulative import time of each module, in seconds,
+    and the total import time.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', 'cli.py'] + list(args), cwd=DEMO,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    total = 0
+
+    for match in IMPORT_TIME.finditer(result.stderr):
+        times[match.group(3)] = int(match.group(1)) / 1e6
+
+        if not match.group(2):
+            total += int(match.group(1)) / 1e6
+
+    return times, total
+
+
+def test_help_startup():
+    times, total = import_times('--help')
+
+    assert [module for module in HEAVY + ['numpy', 'requests'] if module in times] == []
+    assert total < IMPORT_BUDGET
+
+
+def test_command_startup(credentials):
+    platform = ['--credentials', credentials, '--password', 'password', '--platform', 'local']
+    task_name = 'startup_%s' % uuid.uuid4().hex
+
+    for args in [['create', '--user', 'aggregator', '--task_name', task_name],
+                 ['join', '--user', task_name + '_participant', '--task_name', task_name],
+                 ['list', '--user', 'aggregator']]:
+        times, total = import_times(*(args + platform))
+
+        assert [module for module in HEAVY if module in times] == []
+        assert total < IMPORT_BUDGET, '%s imports took %.3fs, mostly %s' % (
+            args[0], total, sorted(times, key=times.get, reverse=True)[:5])
@@ -0,0 +1,104 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# Payload sizes in bytes
+PAYLOADS = [2 ** 10, 2 ** 16, 2 ** 20, 2 ** 24]
+ROUNDS = 20
+TIMEOUT = 30
+
+
+def throughput(benchmark, size):
+    """
+    Record the payload size and the throughput (bytes per second) of a benchmark in its extra info.
+    There are no timings to compute the throughput from with --benchmark-disable.
+    """
+    benchmark.extra_info['payload_bytes'] = size
+
+    if benchmark.stats:
+        benchmark.extra_info['bytes_per_second'] = size / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize('size', PAYLOADS)
+def test_round_trip(benchmark, connect, size):
+    """
+    Latency of a message sent by the aggregator to a participant and sent back.
+    """
+    aggregator, [participant] = connect()
+    message = {'weights': [np.zeros(size // 4, dtype=np.float32)]}
+
+    def round_trip():
+        aggregator.send(message)
+        participant.send(participant.receive(TIMEOUT).content)
+        aggregator.receive(TIMEOUT)
+
+    with aggregator, participant:
+        benchmark(round_trip)
+
+    throughput(benchmark, 2 * size)
+
+
+@pytest.mark.parametrize('participants', [4, 16])
+@pytest.mark.parametrize('size', [2 ** 20])
+def test_broadcast(benchmark, connect, participants, size):
+    """
+    Time for the aggregator to broadcast a message to all the participants and collect their replies,
+    with every participant answering from its own thread.
+    """
+    aggregator, users = connect(participants)
+    message = {'weights': [np.zeros(size // 4, dtype=np.float32)]}
+
+    # The participants echo every message until the last one, as the benchmark may run fewer than ROUNDS rounds
+    def echo(participant):
+        with participant:
+            content = participant.receive(TIMEOUT).content
+
+            while 'stop' not in content:
+                participant.send(content)
+                content = participant.receive(TIMEOUT).content
+
+    def broadcast():
+        aggregator.send(message)
+        for _ in range(participants):
+            aggregator.receive(TIMEOUT)
+
+    threads = [threading.Thread(target=echo, args=(participant,)) for participant in users]
+    for thread in threads:
+        thread.start()
+
+    with aggregator:
+        benchmark.pedantic(broadcast, rounds=ROUNDS, iterations=1)
+        aggregator.send({'stop': True})
+
+    for thread in threads:
+        thread.join()
+
+    throughput(benchmark, 2 * participants * size)
@@ -0,0 +1,322 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import time
+
+import aiohttp
+
+import pycloudmessenger.ffl.abstractions as fflabc
+
+from comm.localapi import BasicParticipant, Reply, TimedOutException, LONG_POLL_TIMEOUT, HTTP_GRACE, POOL_SIZE, \
+    BLOB_HEADER, MESSAGE_ID_HEADER
+
+
+OK = 200
+NOT_FOUND = 404
+
+
+class AsyncBasicParticipant(BasicParticipant):
+    """
+    Base class for an asyncio FFL general user of the local platform.
+    Use it as an asynchronous context manager, which closes its HTTP session on exit.
+    """
+
+    def __init__(self, context):
+        """
+        Class initializer.
+
+        :param context: connection details.
+        :type context: :class:`comm.localapi.Context`
+        """
+        super(AsyncBasicParticipant, self).__init__(context)
+        self.client = None
+
+    @property
+    def session(self):
+        """
+        HTTP session of this user, opened on first use from within the event loop.
+
+        :return: the session.
+        :rtype: :class:`aiohttp.ClientSession`
+        """
+        if self.client is None or self.client.closed:
+            connector = aiohttp.TCPConnector(limit=self.context.get('pool_size', POOL_SIZE))
+            self.client = aiohttp.ClientSession(connector=connector)
+
+        return self.client
+
+    async def close(self):
+        """
+        Close the HTTP session.
+        """
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def __aenter__(self):
+        """
+        Context manager enters.
+
+        :return: self
+        :rtype: :class:`.AsyncBasicParticipant`
+        """
+        return self
+
+    async def __aexit__(self, *args):
+        """
+        Context manager exits - close the HTTP session.
+        """
+        await self.close()
+
+    async def poll(self, endpoint, params, timeout):
+        """
+        Long-poll a receive endpoint until it returns a message or timeout period is exceeded.
+        Throws: An exception on failure.
+
+        :param endpoint: receive endpoint of the local platform.
+        :type endpoint: `str`
+        :param params: query parameters of the request.
+        :type params: `dict`
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: headers and body of the response holding the received message.
+        :rtype: `tuple`
+        """
+        start = time.time()
+
+        while time.time() - start < timeout:
+            wait = min(timeout - (time.time() - start), LONG_POLL_TIMEOUT)
+            params.update({'timeout': wait, 'ack': self.acknowledged})
+
+            async with self.session.get(self.path + endpoint, params=params,
+                                        timeout=aiohttp.ClientTimeout(total=wait + HTTP_GRACE)) as r:
+                status, headers = r.status, r.headers
+                body = await r.read() if status == OK and BLOB_HEADER not in headers else None
+
+            if status == OK:
+                self.record('receive_wait_seconds', time.time() - start)
+                self.acknowledged = int(headers.get(MESSAGE_ID_HEADER, self.acknowledged))
+
+                # Downloaded once the response is released, as a pool of one connection has no other
+                if BLOB_HEADER in headers:
+                    body = await self.transfer(self.read_blob_steps(headers))
+
+                return headers, body
+
+            if status != NOT_FOUND:
+                raise Exception('Unexpected status code when receiving message: %i' % status)
+
+        raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+
+    async def post_message(self, endpoint, message, participant):
+        """
+        Serialize a message and post it to a send endpoint.
+        Throws: An exception on failure.
+
+        :param endpoint: send endpoint of the local platform.
+        :type endpoint: `str`
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        """
+        await self.transfer(self.post_steps(endpoint, message, participant))
+
+    async def transfer(self, steps):
+        """
+        Run a transfer (see :meth:`comm.localapi.BasicParticipant.post_steps`) over the HTTP session.
+        Throws: An exception on failure.
+
+        :param steps: the requests of the transfer.
+        :type steps: `generator`
+        :return: the result of the transfer.
+        """
+        reply = None
+
+        while True:
+            try:
+                method, endpoint, kwargs = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+
+            try:
+                async with self.session.request(method, self.path + endpoint, **kwargs) as r:
+                    reply = Reply(r.status, r.headers, await r.read())
+            except aiohttp.ClientError:
+                reply = None
+
+    async def messages(self, timeout=10):
+        """
+        Asynchronously iterate over the incoming messages.
+        Throws: :class:`comm.localapi.TimedOutException` once no message arrives within timeout.
+
+        :param timeout: timeout in seconds for each message.
+        :type timeout: `int`
+        """
+        while True:
+            yield await self.receive(timeout)
+
+
+class AsyncAggregator(AsyncBasicParticipant):
+    """
+    asyncio counterpart of :class:`comm.localapi.Aggregator`.
+    """
+
+    def __init__(self, context, task_name=None):
+        """
+        Class initializer.
+
+        :param context: Connection details.
+        :type context: :class:`comm.localapi.Context`
+        :param task_name: Name of the task (note: the user must be the creator of this task).
+        :type task_name: `str`
+        """
+        super(AsyncAggregator, self).__init__(context)
+        self.task_name = task_name
+        self.participant_list = []
+
+    async def get_participants(self):
+        """
+        Return a list of participants.
+        Throws: An exception on failure.
+
+        :return participant: list of participants.
+        :rtype participant: `list`
+        """
+        async with self.session.get(self.path + 'get_participants', params={'task_name': self.task_name}) as r:
+            if r.status != OK:
+                raise Exception('Unexpected status code when receiving message: %i' % r.status)
+
+            self.participant_list = (await r.json())['message']
+
+        return self.participant_list
+
+    async def send(self, message=None, participant=None):
+        """
+        Send a message to all/specific task participants and return once it is queued.
+        Throws: An exception on failure.
+
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        """
+        if participant and participant not in self.participant_list:
+            raise Exception('User not join task')
+
+        await self.post_message('aggregator_send', message, participant)
+
+    async def receive(self, timeout=10):
+        """
+        Wait for a message to arrive or until timeout period is exceeded.
+        Throws: An exception on failure.
+
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: received message.
+        :rtype: :class:`pycloudmessenger.ffl.abstractions.Response`
+        """
+        headers, body = await self.poll('aggregator_receive', {'task_name': self.task_name}, timeout)
+        response = self.decode_update(headers, body)
+
+        # A join delivered again, as the platform does until it is acknowledged, is listed once
+        if fflabc.Notification.is_participant_joined(response.notification) and \
+                response.notification['participant'] not in self.participant_list:
+            self.participant_list.append(response.notification['participant'])
+
+        return response
+
+    async def updates(self, timeout=10):
+        """
+        Asynchronously iterate over the model updates sent by participants, skipping other notifications.
+        Throws: :class:`comm.localapi.TimedOutException` once no message arrives within timeout.
+
+        :param timeout: timeout in seconds for each message.
+        :type timeout: `int`
+        """
+        async for response in self.messages(timeout):
+            if fflabc.Notification.is_participant_updated(response.notification):
+                yield response
+
+    async def stop_task(self, model=None):
+        """
+        As a task creator, stop the given task.
+        The status of the task will be changed to 'COMPLETE'.
+        Throws: An exception on failure.
+        """
+        await self.send(message=model)
+
+        async with self.session.post(self.path + 'stop_task', params={'task_name': self.task_name}):
+            pass
+
+
+class AsyncParticipant(AsyncBasicParticipant):
+    """
+    asyncio counterpart of :class:`comm.localapi.Participant`.
+    """
+
+    def __init__(self, context, task_name=None):
+        """
+        Class initializer.
+
+        :param context: connection details.
+        :type context: :class:`comm.localapi.Context`
+        :param task_name: name of the task (the user needs to be a participant of this task).
+        :type task_name: `str`
+        """
+        super(AsyncParticipant, self).__init__(context)
+        self.task_name = task_name
+
+    async def send(self, message=None):
+        """
+        Send a message to the aggregator and return once it is queued.
+        Throws: An exception on failure.
+
+        :param message: message to be sent.
+        :type message: `dict`
+        """
+        await self.post_message('participant_send', message, self.user)
+
+    async def receive(self, timeout=10):
+        """
+        Wait for a message to arrive or until timeout period is exceeded.
+        Throws: An exception on failure.
+
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: received message.
+        :rtype: :class:`pycloudmessenger.ffl.abstractions.Response`
+        """
+        headers, body = await self.poll('participant_receive', {'user': self.user, 'task_name': self.task_name},
+                                        timeout)
+
+        return self.decode_message(headers, body)
+
+    async def leave_task(self):
+        """
+        As a task participant, leave the given task.
+        Throws: An exception on failure.
+        """
+        pass
@@ -0,0 +1,893 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+import time
+import zlib
+import hashlib
+import threading
+from datetime import datetime
+from collections import deque, namedtuple, OrderedDict
+
+import numpy as np
+from pycloudmessenger.ffl.abstractions import Notification
+
+from comm.metrics import METRICS
+from comm.journal import Journal
+from comm.serializer import BinarySerializer, is_binary
+from comm.topology import TREE, group_name
+
+
+class MessageQueue:
+    """
+    A FIFO queue of messages whose consumers can block until a message is queued.
+    Messages are numbered in the order they are queued. A delivered message stays pending until its consumer
+    acknowledges it, by passing its number (or a later one) to the next get: the pending messages that are
+    not acknowledged are delivered again, the others are dropped and handed to on_ack. A get without
+    acknowledgement acknowledges all the pending messages. Queued messages are recorded in journal until
+    acknowledged.
+    The time each message waits in the queue is recorded as `queue_wait_seconds`.
+    """
+
+    def __init__(self, task_name, queue, user=None, journal=None, on_ack=None):
+        self.task_name = task_name
+        self.queue = queue
+        self.user = user
+        self.journal = Journal() if journal is None else journal
+        self.on_ack = on_ack
+        # Queued and delivered messages, as (number, time queued, message) tuples
+        self.messages = deque()
+        self.pending = deque()
+        self.last_id = 0
+        self.condition = threading.Condition()
+        self.labels = {'task': task_name, 'queue': queue, 'user': user}
+
+    def __len__(self):
+        return len(self.messages)
+
+    def put(self, message):
+        """
+        Append a message and wake up a waiting consumer.
+        """
+        with self.condition:
+            self.last_id += 1
+            self.journal.append(self.task_name, self.queue, self.user, self.last_id, message)
+            self.messages.append((self.last_id, time.perf_counter(), message))
+            self.condition.notify()
+
+    def restore(self, message_id, message):
+        """
+        Append a message recovered from the journal.
+        """
+        with self.condition:
+            self.last_id = max(self.last_id, message_id)
+            self.messages.append((message_id, time.perf_counter(), message))
+
+    def acknowledge(self, ack=None):
+        """
+        Drop the pending messages up to number ack, or all of them if ack is None, and queue the others
+        again at the head of the queue. Called with the condition held.
+        """
+        acknowledged = [entry for entry in self.pending if ack is None or entry[0] <= ack]
+        self.messages.extendleft(reversed([entry for entry in self.pending if ack is not None and entry[0] > ack]))
+        self.pending.clear()
+
+        if acknowledged:
+            self.journal.ack(self.task_name, self.queue, self.user, acknowledged[-1][0])
+
+        return acknowledged
+
+    def get(self, timeout=0, ack=None):
+        """
+        Acknowledge the pending messages up to number ack, then deliver the oldest message, waiting up to
+        timeout seconds for one to arrive.
+        Return a (number, message) pair, or None if the queue is still empty after timeout.
+        """
+        with self.condition:
+            acknowledged = self.acknowledge(ack)
+
+            if self.condition.wait_for(lambda: len(self.messages) > 0, timeout):
+                message_id, queued, message = self.messages.popleft()
+                self.pending.append((message_id, queued, message))
+            else:
+                message_id = None
+
+        if self.on_ack is not None:
+            for entry in acknowledged:
+                self.on_ack(entry[2])
+
+        if message_id is None:
+            return None
+
+        METRICS.record('queue_wait_seconds', time.perf_counter() - queued, **self.labels)
+
+        return message_id, message
+
+
+# A message stored once in the blob store, queued by reference: the sha256 digest and the size of its content
+BlobRef = namedtuple('BlobRef', ['blob', 'size'])
+# Default memory budget of a blob store, in bytes
+BLOB_MEMORY = 2 ** 30
+# Suffix of the blob files being written
+TEMPORARY_SUFFIX = '.tmp'
+
+
+class BlobStore:
+    """
+    Content-addressed store of large messages, uploaded in checksummed chunks. A message broadcast to many
+    queues, or uploaded again, is stored once under the sha256 digest of its content.
+    Blobs are kept in memory up to max_memory bytes. Beyond that, the least recently used blobs are dropped,
+    or spilled to directory (if any) while messages still queued refer to them. A persistent store writes
+    the blobs referred to by queued messages to directory straight away, and finds them there on restart.
+    """
+
+    def __init__(self, directory=None, max_memory=BLOB_MEMORY, persistent=False):
+        self.directory = directory
+        self.max_memory = max_memory
+        self.persistent = persistent
+        # Chunks received so far, by digest of the blob being uploaded and chunk number
+        self.uploads = {}
+        # Blobs in memory by digest, least recently used first, and their total size
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        # Sizes of the blobs spilled to disk, and numbers of queued messages referring to blobs, by digest
+        self.spilled = {}
+        self.references = {}
+        self.lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if persistent:
+            for digest in os.listdir(directory):
+                if not digest.endswith(TEMPORARY_SUFFIX):
+                    self.spilled[digest] = os.path.getsize(self.path(digest))
+
+    def clear(self):
+        """
+        Drop all the blobs and uploads.
+        """
+        with self.lock:
+            for digest in self.spilled:
+                self.remove_file(digest)
+
+            self.uploads.clear()
+            self.memory.clear()
+            self.memory_size = 0
+            self.spilled.clear()
+            self.references.clear()
+
+    def path(self, digest):
+        """
+        Path of a spilled blob.
+        """
+        return os.path.join(self.directory, digest)
+
+    def write_file(self, digest, data):
+        """
+        Write a blob to directory, atomically so that a crash never leaves a truncated blob behind.
+        Called with the lock held.
+        """
+        temporary = self.path(digest) + TEMPORARY_SUFFIX
+        with open(temporary, 'wb') as output:
+            output.write(data)
+        os.replace(temporary, self.path(digest))
+        self.spilled[digest] = len(data)
+
+    def remove_file(self, digest):
+        """
+        Remove the file of a spilled blob, if it is still there.
+        """
+        try:
+            os.remove(self.path(digest))
+        except OSError:
+            pass
+
+    def put_chunk(self, digest, index, data, checksum):
+        """
+        Store a chunk of the upload of a blob, unless its crc32 checksum does not match.
+        The chunks of a blob already stored, uploaded concurrently by another sender, are ignored.
+        Return False if the chunk was rejected.
+        """
+        if zlib.crc32(data) != checksum:
+            return False
+
+        with self.lock:
+            if digest not in self.memory and digest not in self.spilled:
+                self.uploads.setdefault(digest, {})[index] = data
+
+        return True
+
+    def received(self, digest):
+        """
+        Return the numbers of the chunks of the upload of a blob received so far.
+        """
+        with self.lock:
+            return sorted(self.uploads.get(digest, {}))
+
+    def commit(self, digest, chunks):
+        """
+        Assemble a complete upload into a blob.
+        Return its reference, or None if chunks are missing or the content does not match the digest.
+        """
+        with self.lock:
+            parts = self.uploads.pop(digest, {})
+
+            if digest in self.memory or digest in self.spilled:
+                return BlobRef(digest, len(self.memory[digest]) if digest in self.memory else self.spilled[digest])
+
+            if sorted(parts) != list(range(chunks)):
+                if parts:
+                    self.uploads[digest] = parts
+                return None
+
+        data = b''.join(parts[index] for index in range(chunks))
+        if hashlib.sha256(data).hexdigest() != digest:
+            return None
+
+        with self.lock:
+            if digest not in self.memory and digest not in self.spilled:
+                self.memory[digest] = data
+                self.memory_size += len(data)
+                self.evict()
+
+        return BlobRef(digest, len(data))
+
+    def evict(self):
+        """
+        Bring the blobs held in memory within budget, starting from the least recently used.
+        The most recently used blob always stays in memory. Called with the lock held.
+        """
+        for digest in list(self.memory)[:-1]:
+            if self.memory_size <= self.max_memory:
+                break
+
+            referenced = self.references.get(digest, 0) > 0
+            if referenced and not self.directory:
+                continue
+
+            data = self.memory.pop(digest)
+            self.memory_size -= len(data)
+
+            if referenced and digest not in self.spilled:
+                self.write_file(digest, data)
+
+    def get(self, digest):
+        """
+        Return the reference of a stored blob, or None if there is no such blob.
+        """
+        with self.lock:
+            if digest in self.memory:
+                self.memory.move_to_end(digest)
+                return BlobRef(digest, len(self.memory[digest]))
+
+            if digest in self.spilled:
+                return BlobRef(digest, self.spilled[digest])
+
+        return None
+
+    def hold(self, ref, count=1):
+        """
+        Add references to a blob, one for each queue it is put in.
+        """
+        with self.lock:
+            self.references[ref.blob] = self.references.get(ref.blob, 0) + count
+
+            if self.persistent and ref.blob in self.memory and ref.blob not in self.spilled:
+                self.write_file(ref.blob, self.memory[ref.blob])
+
+    def prune(self):
+        """
+        Delete the spilled blobs no queued message refers to, e.g. once the queues are recovered.
+        """
+        with self.lock:
+            for digest in [digest for digest in self.spilled if self.references.get(digest, 0) <= 0]:
+                del self.spilled[digest]
+                self.remove_file(digest)
+
+    def release(self, digest):
+        """
+        Release a reference to a blob. A blob on disk is deleted once it is not referenced any more,
+        a blob in memory stays there until evicted, in case the same content is sent again.
+        """
+        with self.lock:
+            count = self.references.get(digest, 0) - 1
+            if count > 0:
+                self.references[digest] = count
+                return
+
+            self.references.pop(digest, None)
+
+            if digest in self.spilled:
+                del self.spilled[digest]
+                self.remove_file(digest)
+
+    def read(self, digest, offset, size):
+        """
+        Return size bytes of a blob from offset, or None if there is no such blob.
+        """
+        with self.lock:
+            if digest in self.memory:
+                self.memory.move_to_end(digest)
+                return self.memory[digest][offset:offset + size]
+
+            if digest not in self.spilled:
+                return None
+
+        try:
+            with open(self.path(digest), 'rb') as data:
+                data.seek(offset)
+                return data.read(size)
+        except OSError:
+            return None
+
+
+class RoundSum:
+    """
+    Running weighted sum of the dense model updates of a round, for a platform that aggregates the updates itself
+    so that the aggregator receives one update per round instead of one per participant. The round is complete
+    once target participants sent their update, or at its deadline if at least one did.
+    """
+
+    def __init__(self, round_id, target):
+        self.round = round_id
+        self.target = target
+        self.layers = None
+        self.samples = 0
+        self.scheme = None
+        self.participants = []
+        self.expired = False
+        self.complete = False
+        self.lock = threading.Lock()
+
+    def add(self, layers, samples, scheme, participant):
+        """
+        Add the dense layers of an update, weighted by its number of samples.
+        Return None if the update is refused (the round is complete, or the participant already sent its update),
+        otherwise whether it completes the round.
+        """
+        with self.lock:
+            if self.complete or participant in self.participants:
+                return None
+
+            if self.layers is None:
+                self.layers = [np.multiply(layer, samples, dtype=np.float64) for layer in layers]
+            else:
+                for total, layer in zip(self.layers, layers):
+                    total += np.multiply(layer, samples, dtype=np.float64)
+
+            self.samples += samples
+            self.scheme = scheme
+            self.participants.append(participant)
+            self.complete = self.expired or len(self.participants) >= self.target
+
+            return self.complete
+
+    def expire(self):
+        """
+        Reach the deadline of the round. Return True if this completes the round.
+        """
+        with self.lock:
+            self.expired = True
+
+            if self.complete or not self.participants:
+                return False
+
+            self.complete = True
+            return True
+
+    def result(self):
+        """
+        The average of the updates, as an update of the round: full weights or a difference from the weights
+        of the round, depending on the compression scheme of the updates.
+        """
+        return {'update': {'scheme': 'none' if self.scheme == 'none' else 'delta',
+                           'layers': [(total / self.samples).astype(np.float32) for total in self.layers]},
+                'samples': self.samples, 'round': self.round, 'participants': list(self.participants)}
+
+
+class Task:
+    """
+    The state of a task: its definition, status, participants and message queues, recorded in journal.
+    Given densify, a function decoding the model update of a message into dense layers, the task can sum up the
+    binary updates of a round itself, as asked by the aggregator.
+    """
+
+    def __init__(self, task_name, definition, blobs=None, journal=None, densify=None):
+        self.task_name = task_name
+        self.definition = {'definition': definition}
+        self.status = 'CREATED'
+        self.added = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        self.journal = Journal() if journal is None else journal
+        self.aggregator_queue = MessageQueue(task_name, 'aggregator', None, self.journal, self.release_update)
+        self.participant_queue = {}
+        self.participant_list = []
+        # Set-based indexes of participant_list and of the users whose join is still queued
+        self.participant_index = set()
+        self.pending_joins = set()
+        # Latest round sent by the aggregator, and how many rounds late an update may be before it is dropped
+        self.round = None
+        self.max_staleness = None
+        self.dropped = 0
+        self.blobs = BlobStore() if blobs is None else blobs
+        # Number of groups of a tree task, and the group task each participant was routed to
+        self.groups = 0
+        self.routes = {}
+        # Sum of the updates of the current round, when aggregated by the platform, and its deadline timer
+        self.densify = densify
+        self.sum = None
+        self.timer = None
+        # Last round whose sum was queued for the aggregator; later updates of that round are dropped
+        self.flushed = None
+        # Guards the task state above; each queue has its own lock
+        self.lock = threading.Lock()
+
+    def info(self):
+        """
+        Summary of the task, as listed by get_tasks.
+        """
+        return {'task_name': self.task_name, 'status': self.status, 'added': self.added}
+
+    def state(self):
+        """
+        The state of the task recorded in the journal.
+        """
+        return {'definition': self.definition['definition'], 'status': self.status, 'added': self.added,
+                'round': self.round, 'max_staleness': self.max_staleness, 'dropped': self.dropped,
+                'groups': self.groups, 'routes': dict(self.routes)}
+
+    def save(self, replace=False):
+        """
+        Record the state of the task in the journal.
+        """
+        with self.lock:
+            state = self.state()
+
+        self.journal.save_task(self.task_name, state, replace)
+
+    def restore(self, state, participants, messages):
+        """
+        Restore the state of the task recovered from the journal: its participants, and its queued messages
+        as (queue, user, number, message) tuples.
+        """
+        self.status = state['status']
+        self.added = state['added']
+        self.round = state['round']
+        self.max_staleness = state['max_staleness']
+        self.dropped = state['dropped']
+        self.groups = state.get('groups', 0)
+        self.routes = dict(state.get('routes', {}))
+
+        for user in participants:
+            self.register(user, record=False)
+
+        for queue, user, message_id, message in messages:
+            if queue == 'aggregator':
+                self.aggregator_queue.restore(message_id, message)
+
+                if message[1] is Notification.participant_joined:
+                    if message[0] not in self.participant_index:
+                        self.pending_joins.add(message[0])
+                elif isinstance(message[0][0], BlobRef):
+                    self.blobs.hold(message[0][0])
+            else:
+                self.get_participant_queue(user).restore(message_id, message)
+
+                if isinstance(message, BlobRef):
+                    self.blobs.hold(message)
+
+    def stop(self):
+        """
+        Mark the task as complete.
+        """
+        with self.lock:
+            self.status = 'COMPLETE'
+
+        self.save()
+
+    def get_participant_queue(self, user):
+        """
+        Return the queue of a participant, creating it if needed.
+        """
+        with self.lock:
+            if user not in self.participant_queue:
+                self.participant_queue[user] = MessageQueue(self.task_name, 'participant', user, self.journal,
+                                                            self.release_message)
+
+            return self.participant_queue[user]
+
+    def release_message(self, message):
+        """
+        Release the blob of a message acknowledged by a participant, if any.
+        """
+        if isinstance(message, BlobRef):
+            self.blobs.release(message.blob)
+
+    def release_update(self, content):
+        """
+        Release the blob of an update acknowledged by the aggregator, if any.
+        """
+        if content[1] is Notification.participant_updated:
+            self.release_message(content[0][0])
+
+    def is_joined(self, user):
+        """
+        Check whether a user has joined the task.
+        """
+        with self.lock:
+            return user in self.participant_index or user in self.pending_joins or user in self.routes
+
+    def size(self):
+        """
+        Number of users who joined the task, registered or not yet.
+        """
+        with self.lock:
+            return len(self.participant_index | self.pending_joins)
+
+    def join(self, user):
+        """
+        Queue the join notification of a user, return False if the user already joined.
+        """
+        with self.lock:
+            if user in self.participant_index or user in self.pending_joins:
+                return False
+
+            self.pending_joins.add(user)
+            self.aggregator_queue.put((user, Notification.participant_joined))
+
+        return True
+
+    def register(self, user, record=True):
+        """
+        Register a user once the aggregator has received its join notification; a join notification
+        delivered again registers nobody.
+        """
+        self.get_participant_queue(user)
+
+        with self.lock:
+            self.pending_joins.discard(user)
+
+            if user in self.participant_index:
+                return
+
+            self.participant_index.add(user)
+            self.participant_list.append(user)
+
+        if record:
+            self.journal.add_participant(self.task_name, user)
+
+    def participants(self):
+        """
+        Return the list of registered participants.
+        """
+        with self.lock:
+            return list(self.participant_list)
+
+    def aggregator_send(self, message, participant=None, round_id=None, max_staleness=None, aggregate=None,
+                        deadline=None):
+        """
+        Queue a message for a participant, or for all the registered participants if none is given.
+        A message tagged with a round id moves the task to that round, which may be an earlier one when the
+        aggregator resumes from a checkpoint. A broadcast tagged with a number of updates to aggregate starts
+        summing up the updates of the round, until that many arrived or deadline seconds passed.
+        """
+        if round_id is not None:
+            with self.lock:
+                previous = self.round, self.max_staleness
+                self.round = round_id
+                self.max_staleness = max_staleness
+                changed = previous != (self.round, self.max_staleness)
+
+            if changed:
+                self.save()
+
+            if participant is None:
+                self.start_sum(round_id, aggregate, deadline)
+
+        users = self.participants() if participant is None else [participant]
+
+        # A broadcast blob is stored once, and referenced by each participant queue
+        if isinstance(message, BlobRef):
+            self.blobs.hold(message, len(users))
+
+        for user in users:
+            self.get_participant_queue(user).put(message)
+
+    def aggregator_receive(self, timeout=0, ack=None):
+        """
+        Acknowledge the notifications of the aggregator queue up to number ack, then deliver the next one,
+        waiting up to timeout seconds for one to arrive, and register the participant of a join notification.
+        Return a (number, notification, message) tuple, or None if the queue is still empty after timeout.
+        """
+        content = self.aggregator_queue.get(timeout, ack)
+
+        if content is None:
+            return None
+
+        message_id, content = content
+
+        if content[1] is Notification.participant_joined:
+            self.register(content[0])
+            return message_id, {'type': Notification.participant_joined, 'participant': content[0]}, None
+
+        return message_id, {'type': Notification.participant_updated, 'participant': content[0][1]}, content[0][0]
+
+    def close(self):
+        """
+        Stop summing up the updates of the current round and cancel its deadline timer, once the task is replaced.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+
+            self.sum = None
+            self.timer = None
+
+    def start_sum(self, round_id, target=None, deadline=None):
+        """
+        Start summing up the updates of a round, if target is set and the task can decode updates.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+
+            self.sum = RoundSum(round_id, target) if target and self.densify is not None else None
+            self.timer = None
+
+            # A round sent again, by an aggregator resuming from a checkpoint, takes updates again
+            if self.flushed == round_id:
+                self.flushed = None
+
+            if self.sum is not None and deadline is not None:
+                self.timer = threading.Timer(deadline, self.expire, [self.sum])
+                self.timer.daemon = True
+                self.timer.start()
+
+    def expire(self, total):
+        """
+        Queue the sum of the updates of a round for the aggregator at its deadline, if there is any update.
+        """
+        if total.expire():
+            self.flush(total)
+
+    def flush(self, total):
+        """
+        Queue the average of the updates of a complete round for the aggregator, as a binary update message.
+        """
+        with self.lock:
+            if self.sum is total:
+                self.sum = None
+            self.flushed = total.round
+
+        message = BinarySerializer().serialize(total.result())
+        self.aggregator_queue.put(((message, None), Notification.participant_updated))
+
+    def add_to_sum(self, message, participant, round_id):
+        """
+        Add a binary update to the sum of its round, if the platform is summing up this round.
+        Return None if the update is to be queued for the aggregator instead, otherwise whether it was added.
+        """
+        with self.lock:
+            total = self.sum
+            flushed = round_id is not None and round_id == self.flushed
+
+        if total is None or round_id != total.round:
+            # An update of a round whose sum is already queued is dropped, like those beyond its target
+            return False if flushed else None
+
+        if isinstance(message, BlobRef):
+            message = self.blobs.read(message.blob, 0, message.size)
+
+        if not is_binary(message):
+            return None
+
+        # The header of an update is decoded as plain json, never with jsonpickle, so that a participant
+        # cannot have the platform build objects; an update whose header is not plain goes to the aggregator
+        with METRICS.timer('server_aggregation_seconds', task=self.task_name, round=round_id):
+            try:
+                content = BinarySerializer(trusted=False).deserialize(message)
+            except ValueError:
+                return None
+
+            complete = total.add(self.densify(content['update']), content.get('samples', 1),
+                                 content['update']['scheme'], participant)
+
+        if complete:
+            self.flush(total)
+
+        return complete is not None
+
+    def is_late(self, round_id):
+        """
+        Check whether an update computed in round_id is too late to be accepted.
+        """
+        with self.lock:
+            if round_id is None or self.round is None or self.max_staleness is None:
+                return False
+
+            return round_id < self.round - self.max_staleness
+
+    def participant_send(self, message, participant, round_id=None):
+        """
+        Queue a model update for the aggregator, unless it is too late.
+        Return False if the update was dropped.
+        """
+        if self.is_late(round_id):
+            with self.lock:
+                self.dropped += 1
+
+            METRICS.record('dropped_updates', 1, task=self.task_name, user=participant, round=round_id)
+            return False
+
+        # Updates beyond the target of a round summed up by the platform, or after its sum, are dropped too
+        added = self.add_to_sum(message, participant, round_id)
+
+        if added is not None:
+            if not added:
+                with self.lock:
+                    self.dropped += 1
+
+                METRICS.record('dropped_updates', 1, task=self.task_name, user=participant, round=round_id)
+            return added
+
+        if isinstance(message, BlobRef):
+            self.blobs.hold(message)
+
+        self.aggregator_queue.put(((message, participant), Notification.participant_updated))
+
+        return True
+
+    def participant_receive(self, user, timeout=0, ack=None):
+        """
+        Acknowledge the messages of a participant up to number ack, then deliver the next one, waiting up to
+        timeout seconds for one to arrive.
+        Return a (number, message) pair, or None if the queue is still empty after timeout.
+        """
+        return self.get_participant_queue(user).get(timeout, ack)
+
+
+class Broker:
+    """
+    The tasks served by a platform, by name, and the blob store they share. A broker given a durable
+    journal recovers the tasks and queued messages recorded there. A broker given densify (see :class:`Task`)
+    aggregates the updates of a round itself when the aggregator asks for it.
+    """
+
+    def __init__(self, blobs=None, journal=None, densify=None):
+        self.tasks = {}
+        self.blobs = BlobStore() if blobs is None else blobs
+        self.journal = Journal() if journal is None else journal
+        self.densify = densify
+        self.lock = threading.Lock()
+        self.recover()
+
+    def recover(self):
+        """
+        Rebuild the tasks recorded in the journal, with their participants and unacknowledged messages,
+        and delete the blobs none of these messages refers to.
+        """
+        tasks, participants, messages = self.journal.load()
+
+        for task_name, state in tasks:
+            registered = [user for name, user in participants if name == task_name]
+            queued = [message[1:] for message in messages if message[0] == task_name]
+            task = Task(task_name, state['definition'], self.blobs, self.journal, self.densify)
+            task.restore(state, registered, queued)
+            self.tasks[task_name] = task
+
+        self.blobs.prune()
+
+    def reset(self):
+        """
+        Drop all the tasks and blobs.
+        """
+        with self.lock:
+            self.tasks.clear()
+
+        self.journal.reset()
+        self.blobs.clear()
+
+    def create_task(self, task_name, definition, topology=None, groups=0):
+        """
+        Create a task; a task created again under the same name replaces the previous one, and the tasks of its
+        groups. A task with the TREE topology gets a task for each of its groups, whose sub-aggregators join the task.
+        """
+        with self.lock:
+            replaced = self.tasks.pop(task_name, None)
+            replaced = [] if replaced is None else \
+                [replaced] + [self.tasks.pop(group_name(task_name, group), None) for group in range(replaced.groups)]
+
+        for previous in replaced:
+            if previous is not None:
+                previous.close()
+                if previous.task_name != task_name:
+                    self.journal.remove_task(previous.task_name)
+
+        task = Task(task_name, definition, self.blobs, self.journal, self.densify)
+        task.groups = groups if topology == TREE else 0
+        task.save(replace=True)
+
+        tasks = [task] + [Task(group_name(task_name, group), definition, self.blobs, self.journal, self.densify)
+                          for group in range(task.groups)]
+
+        for group in tasks[1:]:
+            group.save(replace=True)
+
+        with self.lock:
+            for created in tasks:
+                self.tasks[created.task_name] = created
+
+        for group in tasks[1:]:
+            task.join(group.task_name)
+
+        return task
+
+    def join_task(self, task, user):
+        """
+        Join a user to a task, return False if the user already joined. A participant of a tree task joins the
+        group with the fewest participants, and is routed to the task of that group from then on.
+        """
+        if not task.groups:
+            return task.join(user)
+
+        groups = [self.get_task(group_name(task.task_name, group)) for group in range(task.groups)]
+
+        with task.lock:
+            if user in task.routes or user in task.participant_index or user in task.pending_joins:
+                return False
+
+            group = min(groups, key=lambda group: group.size())
+            group.join(user)
+            task.routes[user] = group.task_name
+
+        task.save()
+
+        return True
+
+    def get_task(self, task_name, user=None):
+        """
+        Return a task, or None if there is no such task. A participant of a tree task gets the task of its group.
+        """
+        with self.lock:
+            task = self.tasks.get(task_name)
+
+            if task is not None and user in task.routes:
+                return self.tasks.get(task.routes[user])
+
+            return task
+
+    def get_tasks(self):
+        """
+        Return the summaries of all the tasks.
+        """
+        with self.lock:
+            return [task.info() for task in self.tasks.values()]
+
+    def get_joined_tasks(self, user):
+        """
+        Return the summaries of the tasks a user has joined.
+        """
+        with self.lock:
+            return [task.info() for task in self.tasks.values() if task.is_joined(user)]
@@ -0,0 +1,355 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import time
+
+import pycloudmessenger.ffl.abstractions as fflabc
+from pycloudmessenger.serializer import JsonPickleSerializer as serializer
+
+from comm.broker import Broker
+from comm.metrics import METRICS
+
+
+class TimedOutException(Exception):
+    """
+    Over-ride exception.
+    """
+
+
+# Tasks shared by all the users of the process; messages are handed over by reference,
+# so receivers must treat them as read-only.
+broker = Broker()
+
+
+def round_tags(message):
+    """
+    Return the round id and maximum staleness a message is tagged with, if any.
+    """
+    if isinstance(message, dict):
+        return message.get('round'), message.get('max_staleness')
+
+    return None, None
+
+
+class Context(dict):
+    """
+    A faked class pretending to hold connection details for an FFL service.
+    """
+
+    def __init__(self, config, *args, **kwargs):
+        self.update(config)
+
+        if len(args) > 0:
+            user = args[0]
+        else:
+            user = kwargs.get('user')
+
+        self.update({'user': user})
+
+
+class BasicParticipant:
+    """
+    Base class for an FFL general user.
+    """
+
+    def __init__(self, context):
+        """
+        Class initializer.
+
+        :param context: connection details.
+        :type context: :class:`.Context`
+        """
+        self.context = context
+        self.user = context['user']
+        self.task_name = None
+        self.serializer = serializer()
+
+    def get_task(self, task_name=None):
+        """
+        Return a task of the in-process broker, by default the task of this user (or the task of its group,
+        for a participant of a tree task).
+        Throws: An exception if there is no such task.
+
+        :param task_name: Name of the task
+        :type task_name: `str`
+        :return: the task.
+        :rtype: :class:`comm.broker.Task`
+        """
+        task = broker.get_task(task_name or self.task_name, self.user)
+
+        if task is None:
+            raise Exception('Unknown task: %s' % (task_name or self.task_name))
+
+        return task
+
+    def __enter__(self):
+        """
+        Context manager enters - call connect.
+        Throws: An exception on failure.
+
+        :return: self
+        :rtype: :class:`.BasicParticipant`
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Context manager exits - call close.
+        Throws: An exception on failure.
+        """
+        pass
+
+
+class User(fflabc.AbstractUser, BasicParticipant):
+    """
+    Class that allows a general user to avail of the FFL platform services.
+    """
+
+    def create_user(self, user_name, password, organisation):
+        """
+        Register a new user on the platform.
+        Throws: An exception on failure.
+
+        :param user_name: user name (must be a non-empty string and unique;
+                                     if a user with this name has registered
+                                     before, an exception is thrown).
+        :type user_name: `str`
+        :param password: password (must be a non-empty string).
+        :type password: `str`
+        :param organisation: name of the user's organisation.
+        :type organisation: `str`
+        """
+        pass
+
+    def create_task(self, task_name, topology, definition):
+        """
+        Creates a task with the given definition and returns a dictionary
+        with the details of the created tasks.
+        Throws: An exception on failure.
+
+        :param task_name: Name of the task
+        :type task_name: `str`
+        :param topology: topology of the task participants' communication network; with `TREE`, the
+                         participants are split into the `groups` of the definition.
+        :type topology: `str`
+        :param definition: definition of the task to be created.
+        :type definition: `dict`
+        :return: details of the created task.
+        :rtype: `dict`
+        """
+        task = broker.create_task(task_name, self.serializer.serialize(definition), topology,
+                                  definition.get('groups', 0))
+
+        return {task_name: task.info()}
+
+    def task_info(self, task_name):
+        """
+        Returns the details of a given task.
+        Throws: An exception on failure.
+
+        :param task_name: Name of the task
+        :type task_name: `str`
+        :return: details of the task.
+        :rtype: `dict`
+        """
+        return self.get_task(task_name).definition
+
+    def join_task(self, task_name):
+        """
+        As a potential task participant, try to join an existing task that has yet to start.
+        Throws: An exception on failure.
+
+        :param task_name: Name of the task
+        :type task_name: `str`
+        :return: details of the task assignment.
+        :rtype: `dict`
+        """
+        task = self.get_task(task_name)
+
+        if not broker.join_task(task, self.user):
+            raise Exception('Join task fails because user already joined this task')
+
+        return {task_name: task.info()}
+
+    def get_tasks(self):
+        """
+        Returns a list with all the available tasks.
+        Throws: An exception on failure.
+
+        :return: list of all the available tasks.
+        :rtype: `list`
+        """
+        return broker.get_tasks()
+
+    def get_joined_tasks(self):
+        """
+        Returns a list with all the joined tasks.
+        Throws: An exception on failure.
+
+        :return: list of all the available tasks.
+        :rtype: `list`
+        """
+        return broker.get_joined_tasks(self.user)
+
+
+class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
+    """
+    This class provides the functionality needed by the aggregator of a federated learning task.
+    """
+
+    def __init__(self, context, task_name=None):
+        """
+        Class initializer.
+        Throws: An exception on failure.
+
+        :param context: Connection details.
+        :type context: :class:`.Context`
+        :param task_name: Name of the task (note: the user must be the creator of this task).
+        :type task_name: `str`
+        """
+        super(Aggregator, self).__init__(context)
+        self.task_name = task_name
+        self.participant_list = []
+
+    def get_participants(self):
+        """
+        Return a list of participants.
+        Throws: An exception on failure.
+
+        :return participant: list of participants.
+        :rtype participant: `list`
+        """
+        self.participant_list = self.get_task().participants()
+
+        return self.participant_list
+
+    def send(self, message=None, participant=None):
+        """
+        Send a message to all/specific task participants and return immediately (not waiting for a reply).
+        The message is shared by reference, not copied.
+        Throws: An exception on failure.
+
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        """
+        if participant and participant not in self.participant_list:
+            raise Exception('User not join task')
+
+        self.get_task().aggregator_send(message, participant, *round_tags(message))
+
+    def receive(self, timeout=10):
+        """
+        Wait for a message to arrive or until timeout period is exceeded.
+        Throws: An exception on failure.
+
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: received message.
+        :rtype: `dict`
+        """
+        start = time.time()
+        content = self.get_task().aggregator_receive(timeout)
+
+        if content is None:
+            raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+
+        METRICS.record('receive_wait_seconds', time.time() - start, user=self.user, task=self.task_name)
+
+        response = fflabc.Response(*content[1:])
+
+        # A join delivered again, as the platform does until it is acknowledged, is listed once
+        if fflabc.Notification.is_participant_joined(response.notification) and \
+                response.notification['participant'] not in self.participant_list:
+            self.participant_list.append(response.notification['participant'])
+
+        return response
+
+    def stop_task(self, model=None):
+        """
+        As a task creator, stop the given task.
+        The status of the task will be changed to 'COMPLETE'.
+        Throws: An exception on failure.
+        """
+        self.send(message=model)
+        self.get_task().stop()
+
+
+class Participant(fflabc.AbstractParticipant, BasicParticipant):
+    """
+    This class provides the functionality needed by the participants of a federated learning task.
+    """
+
+    def __init__(self, context, task_name=None):
+        """
+        Class initializer.
+        Throws: An exception on failure.
+
+        :param context: connection details.
+        :type context: :class:`.Context`
+        :param task_name: name of the task (the user needs to be a participant of this task).
+        :type task_name: `str`
+        """
+        super(Participant, self).__init__(context)
+        self.task_name = task_name
+
+    def send(self, message=None):
+        """
+        Send a message to the aggregator and return immediately (not waiting for a reply).
+        The message is shared by reference, not copied.
+        Throws: An exception on failure.
+
+        :param message: message to be sent.
+        :type message: `dict`
+        """
+        self.get_task().participant_send(message, self.user, round_tags(message)[0])
+
+    def receive(self, timeout=10):
+        """
+        Wait for a message to arrive or until timeout period is exceeded.
+        Throws: An exception on failure.
+
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: received message.
+        :rtype: `dict`
+        """
+        start = time.time()
+        result = self.get_task().participant_receive(self.user, timeout)
+
+        if result is None:
+            raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+
+        METRICS.record('receive_wait_seconds', time.time() - start, user=self.user, task=self.task_name)
+
+        return fflabc.Response(None, result[1])
+
+    def leave_task(self):
+        """
+        As a task participant, leave the given task.
+        Throws: An exception on failure.
+        """
+        pass
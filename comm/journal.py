@@ -0,0 +1,162 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import pickle
+import sqlite3
+import threading
+
+
+# Default synchronous mode of a journal: in WAL mode, NORMAL commits survive a crash of the platform and
+# only sync the log to disk at checkpoints, FULL syncs every commit
+SYNCHRONOUS = 'NORMAL'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tasks (task TEXT PRIMARY KEY, state BLOB);
+CREATE TABLE IF NOT EXISTS participants (task TEXT, user TEXT, PRIMARY KEY (task, user));
+CREATE TABLE IF NOT EXISTS messages (task TEXT, queue TEXT, user TEXT, id INTEGER, message BLOB,
+                                     PRIMARY KEY (task, queue, user, id));
+'''
+
+
+class Journal:
+    """
+    Record of the state of the tasks of a broker: their definitions, participants and queued messages.
+    This default journal keeps nothing, the state of the broker only lives in memory.
+    """
+
+    def load(self):
+        """
+        Return the recorded state: the (task name, state) pairs of the tasks, the (task name, user) pairs of
+        their participants in the order they registered, and the (task name, queue, user, id, message)
+        tuples of the queued messages, in the order they were queued.
+        """
+        return [], [], []
+
+    def save_task(self, task_name, state, replace=False):
+        """
+        Record the state of a task, a dict of its definition, status and round. A task replaced by a new one
+        under the same name loses its participants and messages.
+        """
+
+    def remove_task(self, task_name):
+        """
+        Forget a task, with its participants and messages.
+        """
+
+    def add_participant(self, task_name, user):
+        """
+        Record the registration of a participant.
+        """
+
+    def append(self, task_name, queue, user, message_id, message):
+        """
+        Record a queued message.
+        """
+
+    def ack(self, task_name, queue, user, message_id):
+        """
+        Forget the messages of a queue up to message_id, once their consumer has acknowledged them.
+        """
+
+    def reset(self):
+        """
+        Forget everything.
+        """
+
+    def close(self):
+        """
+        Release the resources of the journal.
+        """
+
+
+class SQLiteJournal(Journal):
+    """
+    A journal kept in a SQLite database in WAL mode, from which a restarted platform recovers its tasks and
+    the messages that were not acknowledged yet. Messages are pickled.
+    """
+
+    def __init__(self, path, synchronous=SYNCHRONOUS):
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=%s' % synchronous)
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def execute(self, *statements):
+        """
+        Run (sql, parameters) statements in a single transaction.
+        """
+        with self.lock:
+            self.connection.execute('BEGIN')
+            try:
+                for sql, parameters in statements:
+                    self.connection.execute(sql, parameters)
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def load(self):
+        with self.lock:
+            tasks = [(task, pickle.loads(state))
+                     for task, state in self.connection.execute('SELECT task, state FROM tasks')]
+            participants = list(self.connection.execute('SELECT task, user FROM participants ORDER BY rowid'))
+            messages = [(task, queue, user or None, message_id, pickle.loads(message))
+                        for task, queue, user, message_id, message in self.connection.execute(
+                            'SELECT task, queue, user, id, message FROM messages ORDER BY task, queue, user, id')]
+
+        return tasks, participants, messages
+
+    def save_task(self, task_name, state, replace=False):
+        statements = [('INSERT OR REPLACE INTO tasks VALUES (?, ?)', (task_name, pickle.dumps(state)))]
+
+        if replace:
+            statements += [('DELETE FROM participants WHERE task = ?', (task_name,)),
+                           ('DELETE FROM messages WHERE task = ?', (task_name,))]
+
+        self.execute(*statements)
+
+    def remove_task(self, task_name):
+        self.execute(('DELETE FROM tasks WHERE task = ?', (task_name,)),
+                     ('DELETE FROM participants WHERE task = ?', (task_name,)),
+                     ('DELETE FROM messages WHERE task = ?', (task_name,)))
+
+    def add_participant(self, task_name, user):
+        self.execute(('INSERT OR IGNORE INTO participants VALUES (?, ?)', (task_name, user)))
+
+    def append(self, task_name, queue, user, message_id, message):
+        self.execute(('INSERT INTO messages VALUES (?, ?, ?, ?, ?)',
+                      (task_name, queue, user or '', message_id, pickle.dumps(message, pickle.HIGHEST_PROTOCOL))))
+
+    def ack(self, task_name, queue, user, message_id):
+        self.execute(('DELETE FROM messages WHERE task = ? AND queue = ? AND user = ? AND id <= ?',
+                      (task_name, queue, user or '', message_id)))
+
+    def reset(self):
+        self.execute(('DELETE FROM tasks', ()), ('DELETE FROM participants', ()), ('DELETE FROM messages', ()))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -24,12 +24,48 @@ limitations are in force until 30/11/2025.
  limitations under the License.
 """
 import time
+import zlib
+import hashlib
+import threading
+import weakref
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, namedtuple
 
 import pycloudmessenger.ffl.abstractions as fflabc
 from pycloudmessenger.serializer import JsonPickleSerializer as serializer
 
+from comm.serializer import SERIALIZERS, BinarySerializer, CONTENT_TYPE, is_binary
+from comm.metrics import METRICS
+
+
+# Longest time a single receive request is held open by the local platform
+LONG_POLL_TIMEOUT = 30
+# Extra time allowed on top of the long-poll before the HTTP request itself gives up
+HTTP_GRACE = 5
+# Default number of keep-alive connections and connection retries of a context
+POOL_SIZE = 10
+RETRIES = 3
+# Default serializer of the messages exchanged between aggregator and participants
+MODEL_SERIALIZER = 'binary'
+# Header carrying the notification of a binary message
+NOTIFICATION_HEADER = 'X-Notification'
+# Header carrying the number of a received message
+MESSAGE_ID_HEADER = 'X-Message-Id'
+# Broadcasts larger than BLOB_SIZE, and any message larger than CHUNK_SIZE, are stored as blobs on the
+# platform, uploaded and downloaded in chunks of CHUNK_SIZE
+BLOB_SIZE = 2 ** 20
+CHUNK_SIZE = 16 * 2 ** 20
+# Default size of the cache of the blobs sent and received through a context
+BLOB_CACHE_SIZE = 2 ** 28
+# Headers describing a message stored as a blob on the platform, and the checksum of a chunk
+BLOB_HEADER = 'X-Blob'
+CHECKSUM_HEADER = 'X-Checksum'
+# Reply of the platform to a request of a transfer: its status code, headers and body
+Reply = namedtuple('Reply', ['status', 'headers', 'body'])
+
 
 class TimedOutException(Exception):
     """
@@ -43,9 +79,118 @@ class ConsumerException(Exception):
     """
 
 
+class SessionPool:
+    """
+    A keep-alive HTTP session shared by all the users created from the same context, for the lifetime of the
+    context: it is closed explicitly, or once the context is garbage collected or the interpreter exits.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, retries=RETRIES):
+        """
+        Class initializer.
+
+        :param pool_size: maximum number of connections kept alive to the local platform.
+        :type pool_size: `int`
+        :param retries: number of times a failed connection attempt is retried.
+        :type retries: `int`
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        self.lock = threading.RLock()
+        self.session = None
+        self.finalizer = None
+
+    def get(self):
+        """
+        Return the shared session, opening it if needed.
+
+        :return: the shared session.
+        :rtype: :class:`requests.Session`
+        """
+        with self.lock:
+            if self.session is None:
+                # Only connection errors are retried, so a message is never posted twice
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                                      max_retries=Retry(total=self.retries, read=0, status=0,
+                                                        backoff_factor=0.1))
+                self.session = requests.Session()
+                self.session.mount('http://', adapter)
+                self.session.mount('https://', adapter)
+                self.finalizer = weakref.finalize(self, self.session.close)
+
+            return self.session
+
+    def close(self):
+        """
+        Close the shared session and its connections; the next request opens a new one.
+        """
+        with self.lock:
+            if self.session is not None:
+                self.finalizer()
+                self.session = None
+                self.finalizer = None
+
+
+class BlobCache:
+    """
+    The blobs most recently sent or received through a context, by digest, up to max_size bytes,
+    so that they are neither uploaded nor downloaded again.
+    """
+
+    def __init__(self, max_size=BLOB_CACHE_SIZE):
+        self.max_size = max_size
+        self.blobs = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __contains__(self, digest):
+        with self.lock:
+            return digest in self.blobs
+
+    def get(self, digest):
+        """
+        Return a cached blob, or None if it is not cached.
+
+        :param digest: sha256 digest of the blob.
+        :type digest: `str`
+        :return: content of the blob.
+        :rtype: `bytes`
+        """
+        with self.lock:
+            if digest not in self.blobs:
+                return None
+
+            self.blobs.move_to_end(digest)
+            return self.blobs[digest]
+
+    def put(self, digest, data):
+        """
+        Cache a blob, evicting the least recently used ones beyond max_size.
+
+        :param digest: sha256 digest of the blob.
+        :type digest: `str`
+        :param data: content of the blob, which must not be modified afterwards.
+        :type data: `bytes`
+        """
+        with self.lock:
+            if digest in self.blobs or len(data) > self.max_size:
+                return
+
+            self.blobs[digest] = data
+            self.size += len(data)
+
+            while self.size > self.max_size:
+                _, evicted = self.blobs.popitem(last=False)
+                self.size -= len(evicted)
+
+
 class Context(dict):
     """
     A faked class pretending to hold connection details for an FFL service.
+    Optional `pool_size` and `retries` keys configure the HTTP session shared by its users,
+    an optional `model_serializer` key (`binary` or `jsonpickle`) the format of the messages,
+    optional `blob_size` and `chunk_size` keys above which broadcasts and other messages are stored as
+    blobs on the platform, and an optional `blob_cache_size` key the size of the cache of these blobs.
     """
 
     def __init__(self, config, *args, **kwargs):
@@ -57,9 +202,20 @@ class Context(dict):
             user = kwargs.get('user')
 
         self.update({'user': user})
+        self.pool = SessionPool(self.get('pool_size', POOL_SIZE), self.get('retries', RETRIES))
+        self.blobs = BlobCache(self.get('blob_cache_size', BLOB_CACHE_SIZE))
 
+    def model_serializer(self):
+        """
+        Return the serializer of the messages exchanged between aggregator and participants.
+        """
+        return SERIALIZERS[self.get('model_serializer', MODEL_SERIALIZER)]()
 
-participant_list = []
+    def close(self):
+        """
+        Close the HTTP session shared by the users of the context.
+        """
+        self.pool.close()
 
 
 class BasicParticipant:
@@ -79,7 +235,391 @@ class BasicParticipant:
         self.port = context['port']
         self.path = self.url + ':' + str(self.port) + '/'
         self.user = context['user']
+        self.task_name = None
         self.serializer = serializer()
+        self.model_serializer = context.model_serializer()
+        self.binary_serializer = BinarySerializer()
+        self.blob_size = context.get('blob_size', BLOB_SIZE)
+        self.chunk_size = context.get('chunk_size', CHUNK_SIZE)
+        self.retries = context.get('retries', RETRIES)
+        # Number of the last message received, acknowledged with the next receive
+        self.acknowledged = 0
+
+    @property
+    def session(self):
+        """
+        HTTP session shared with all the users of the same context.
+
+        :return: the shared session.
+        :rtype: :class:`requests.Session`
+        """
+        return self.context.pool.get()
+
+    def record(self, name, value, round_id=None):
+        """
+        Record a measurement of the messages of this user, labelled with the user, task and round.
+
+        :param name: name of the measurement.
+        :type name: `str`
+        :param value: measured value.
+        :type value: `float`
+        :param round_id: round of the message, if known.
+        :type round_id: `int`
+        """
+        METRICS.record(name, value, user=self.user, task=self.task_name, round=round_id)
+
+    def poll(self, endpoint, params, timeout):
+        """
+        Long-poll a receive endpoint until it returns a message or timeout period is exceeded.
+        Each poll acknowledges the previous message received, which the platform delivers again until then.
+        Throws: An exception on failure.
+
+        :param endpoint: receive endpoint of the local platform.
+        :type endpoint: `str`
+        :param params: query parameters of the request.
+        :type params: `dict`
+        :param timeout: timeout in seconds.
+        :type timeout: `int`
+        :return: response holding the received message.
+        :rtype: :class:`requests.Response`
+        """
+        start = time.time()
+
+        while time.time() - start < timeout:
+            wait = min(timeout - (time.time() - start), LONG_POLL_TIMEOUT)
+            params.update({'timeout': wait, 'ack': self.acknowledged})
+            r = self.session.get(self.path + endpoint, params=params, timeout=wait + HTTP_GRACE)
+
+            if r.status_code == requests.codes.ok:
+                self.record('receive_wait_seconds', time.time() - start)
+                self.acknowledged = int(r.headers.get(MESSAGE_ID_HEADER, self.acknowledged))
+                return r
+
+            if r.status_code != requests.codes.not_found:
+                raise Exception('Unexpected status code when receiving message: %i' % r.status_code)
+
+        raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+
+    def encode_message(self, message, participant):
+        """
+        Serialize a message into the arguments of a send request. Binary messages are sent as a raw
+        octet-stream body, the others are wrapped in json. The `round` and `max_staleness` tags of a
+        message are passed on to the platform, which drops updates from rounds that are over, and so are
+        the `aggregate` and `deadline` tags of a broadcast asking the platform to aggregate the round.
+
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        :return: keyword arguments of the HTTP post.
+        :rtype: `dict`
+        """
+        params = {'task_name': self.task_name}
+        round_id = None
+
+        if isinstance(message, dict):
+            round_id = message.get('round')
+            params.update({'round': round_id, 'max_staleness': message.get('max_staleness'),
+                           'aggregate': message.get('aggregate'), 'deadline': message.get('deadline')})
+
+        start = time.perf_counter()
+        message = self.model_serializer.serialize(message)
+        self.record('serialize_seconds', time.perf_counter() - start, round_id)
+        self.record('sent_bytes', len(message), round_id)
+
+        if is_binary(message):
+            params.update({'participant': participant})
+            request = {'data': message, 'headers': {'Content-Type': CONTENT_TYPE}}
+        else:
+            request = {'json': {'message': message, 'participant': participant}}
+
+        request.update({'params': {key: value for key, value in params.items() if value is not None}})
+
+        return request
+
+    def post_message(self, endpoint, message, participant):
+        """
+        Serialize a message and post it to a send endpoint.
+        Throws: An exception on failure.
+
+        :param endpoint: send endpoint of the local platform.
+        :type endpoint: `str`
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        """
+        self.transfer(self.post_steps(endpoint, message, participant))
+
+    def is_blob(self, request, endpoint, participant):
+        """
+        Check whether a message is to be sent as a blob: a broadcast of more than `blob_size` bytes,
+        or a binary message too large for a single request.
+
+        :param request: keyword arguments of the HTTP post of the message.
+        :type request: `dict`
+        :return: True if yes, False otherwise.
+        :rtype: `bool`
+        """
+        size = len(request.get('data', b''))
+        broadcast = endpoint == 'aggregator_send' and not participant
+
+        return size > self.chunk_size or (broadcast and size > self.blob_size)
+
+    def transfer(self, steps):
+        """
+        Run a transfer (see :meth:`post_steps`) over the HTTP session shared by the users of the context.
+        Throws: An exception on failure.
+
+        :param steps: the requests of the transfer.
+        :type steps: `generator`
+        :return: the result of the transfer.
+        """
+        reply = None
+
+        while True:
+            try:
+                method, endpoint, kwargs = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+
+            try:
+                r = self.session.request(method, self.path + endpoint, **kwargs)
+                reply = Reply(r.status_code, r.headers, r.content)
+            except requests.RequestException:
+                reply = None
+
+    def post_steps(self, endpoint, message, participant):
+        """
+        Transfer serializing a message and posting it to a send endpoint, as a blob if it is large.
+        A transfer is a generator of the HTTP requests it needs, as (method, endpoint, keyword arguments)
+        tuples, which is sent back the :class:`Reply` to each request, or None if the request failed, and
+        returns the result of the transfer. The synchronous and asyncio clients run the same transfers,
+        each over its own HTTP session.
+        Throws: An exception on failure.
+
+        :param endpoint: send endpoint of the local platform.
+        :type endpoint: `str`
+        :param message: message to be sent.
+        :type message: `dict`
+        :param participant: participant id.
+        :type participant: `string`
+        """
+        request = self.encode_message(message, participant)
+        data = request.pop('data', None) if self.is_blob(request, endpoint, participant) else None
+
+        if data is not None:
+            request['params']['blob'] = yield from self.put_blob_steps(data)
+
+        reply = yield 'POST', endpoint, request
+
+        # The platform no longer holds a blob sent earlier
+        if reply is not None and reply.status == requests.codes.not_found and data is not None:
+            yield from self.upload_steps(data, request['params']['blob'])
+            reply = yield 'POST', endpoint, request
+
+        if reply is None:
+            raise Exception('Connection failed when sending message')
+
+        if reply.status != requests.codes.ok:
+            raise Exception('Unexpected status code when sending message: %i' % reply.status)
+
+    def put_blob_steps(self, data):
+        """
+        Transfer making sure the platform holds a blob, uploading it unless it was sent or received through
+        this context before.
+        Throws: An exception on failure.
+
+        :param data: serialized message.
+        :type data: `bytes`
+        :return: sha256 digest of the blob.
+        :rtype: `str`
+        """
+        digest = hashlib.sha256(data).hexdigest()
+
+        if digest not in self.context.blobs:
+            yield from self.upload_steps(data, digest)
+            self.context.blobs.put(digest, data)
+
+        return digest
+
+    def upload_steps(self, data, digest):
+        """
+        Transfer uploading a blob in checksummed chunks. Chunks that fail to arrive are sent again, up to
+        `retries` times.
+        Throws: An exception on failure.
+
+        :param data: serialized message.
+        :type data: `bytes`
+        :param digest: sha256 digest of the blob, which also identifies the upload.
+        :type digest: `str`
+        """
+        view = memoryview(data)
+        chunks = max(1, -(-len(data) // self.chunk_size))
+        missing = range(chunks)
+
+        for _ in range(self.retries + 1):
+            failed = []
+
+            for index in missing:
+                chunk = view[index * self.chunk_size:(index + 1) * self.chunk_size].tobytes()
+                reply = yield 'POST', 'upload_chunk', {
+                    'data': chunk, 'headers': {'Content-Type': CONTENT_TYPE},
+                    'params': {'digest': digest, 'chunk': index, 'checksum': zlib.crc32(chunk)}}
+
+                if reply is None or reply.status != requests.codes.ok:
+                    failed.append(index)
+
+            # A chunk whose request failed may still have arrived, the platform knows which did
+            if failed:
+                reply = yield 'GET', 'upload_status', {'params': {'digest': digest}}
+
+                if reply is None or reply.status != requests.codes.ok:
+                    raise Exception('Upload status of the message unavailable')
+
+                received = set(json.loads(reply.body)['chunks'])
+                missing = [index for index in range(chunks) if index not in received]
+
+                if missing:
+                    continue
+
+            reply = yield 'POST', 'commit_upload', {'params': {'digest': digest, 'chunks': chunks}}
+
+            if reply is not None and reply.status == requests.codes.ok:
+                return
+
+            # The chunks were lost, e.g. to a concurrent upload of the same content
+            missing = range(chunks)
+
+        raise Exception('Upload of %d chunks incomplete after %d attempts' % (chunks, self.retries + 1))
+
+    def download_steps(self, blob):
+        """
+        Transfer downloading a blob in checksummed chunks. A chunk that fails to arrive intact is requested
+        again, up to `retries` times.
+        Throws: An exception on failure.
+
+        :param blob: reference to the blob: its digest and size.
+        :type blob: `dict`
+        :return: content of the blob.
+        :rtype: `bytearray`
+        """
+        data = bytearray(blob['size'])
+
+        for offset in range(0, blob['size'], self.chunk_size):
+            size = min(self.chunk_size, blob['size'] - offset)
+            headers = {'Range': 'bytes=%d-%d' % (offset, offset + size - 1)}
+
+            for _ in range(self.retries + 1):
+                reply = yield 'GET', 'blobs/' + blob['blob'], {'headers': headers}
+
+                if reply is not None and reply.status in (requests.codes.ok, requests.codes.partial_content) and \
+                        len(reply.body) == size and zlib.crc32(reply.body) == int(reply.headers[CHECKSUM_HEADER]):
+                    break
+            else:
+                raise Exception('Download of the chunk at offset %d failed' % offset)
+
+            data[offset:offset + size] = reply.body
+
+        if hashlib.sha256(data).hexdigest() != blob['blob']:
+            raise Exception('Digest mismatch of the downloaded message')
+
+        return data
+
+    def read_blob_steps(self, headers):
+        """
+        Transfer returning the content of the blob of a received message, taken from the cache of the
+        context, or downloaded.
+        Throws: An exception on failure.
+
+        :param headers: headers of the response holding the message, with the reference to the blob.
+        :type headers: `dict`
+        :return: content of the blob.
+        :rtype: `bytes`
+        """
+        blob = json.loads(headers[BLOB_HEADER])
+        data = self.context.blobs.get(blob['blob'])
+
+        if data is None:
+            # Cached read-only, as the arrays of every message deserialized from it are views over it
+            data = bytes((yield from self.download_steps(blob)))
+            self.context.blobs.put(blob['blob'], data)
+
+        return data
+
+    def read_body(self, r):
+        """
+        Return the body of a received message. A message stored as a blob is taken from the cache of the
+        context, or downloaded.
+
+        :param r: response holding the received message.
+        :type r: :class:`requests.Response`
+        :return: body of the message.
+        :rtype: `bytes`
+        """
+        if BLOB_HEADER not in r.headers:
+            return r.content
+
+        return self.transfer(self.read_blob_steps(r.headers))
+
+    def decode_update(self, headers, body):
+        """
+        Decode a message received by the aggregator.
+
+        :param headers: headers of the response.
+        :type headers: `dict`
+        :param body: body of the response.
+        :type body: `bytes`
+        :return: received notification and message.
+        :rtype: :class:`pycloudmessenger.ffl.abstractions.Response`
+        """
+        if headers.get('Content-Type') == CONTENT_TYPE:
+            result = {'notification': json.loads(headers[NOTIFICATION_HEADER]), 'params': body}
+        else:
+            result = json.loads(body)['message']
+
+        if fflabc.Notification.is_participant_joined(result['notification']):
+            return fflabc.Response(result['notification'], None)
+
+        return fflabc.Response(result['notification'], self.deserialize(result['params']))
+
+    def decode_message(self, headers, body):
+        """
+        Decode a message received by a participant.
+
+        :param headers: headers of the response.
+        :type headers: `dict`
+        :param body: body of the response.
+        :type body: `bytes`
+        :return: received message.
+        :rtype: :class:`pycloudmessenger.ffl.abstractions.Response`
+        """
+        if headers.get('Content-Type') == CONTENT_TYPE:
+            return fflabc.Response(None, self.deserialize(body))
+
+        return fflabc.Response(None, self.deserialize(json.loads(body)['message']))
+
+    def deserialize(self, message):
+        """
+        Deserialize a message, whichever format it was sent in.
+
+        :param message: serialized message.
+        :type message: `str` or `bytes`
+        :return: deserialized message.
+        :rtype: `dict`
+        """
+        start = time.perf_counter()
+
+        if is_binary(message):
+            content = self.binary_serializer.deserialize(message)
+        else:
+            content = self.serializer.deserialize(message)
+
+        round_id = content.get('round') if isinstance(content, dict) else None
+        self.record('deserialize_seconds', time.perf_counter() - start, round_id)
+        self.record('received_bytes', len(message), round_id)
+
+        return content
 
     def __enter__(self):
         """
@@ -89,14 +629,14 @@ class BasicParticipant:
         :return: self
         :rtype: :class:`.BasicParticipant`
         """
+        self.context.pool.get()
         return self
 
     def __exit__(self, *args):
         """
-        Context manager exits - call close.
-        Throws: An exception on failure.
+        Context manager exits. The HTTP session is kept open for the next users of the context,
+        see :meth:`.Context.close`.
         """
-        pass
 
 
 class User(fflabc.AbstractUser, BasicParticipant):
@@ -128,22 +668,18 @@ class User(fflabc.AbstractUser, BasicParticipant):
 
         :param task_name: Name of the task
         :type task_name: `str`
-        :param topology: topology of the task participants' communication network.
+        :param topology: topology of the task participants' communication network; with `TREE`, the
+                         participants are split into the `groups` of the definition.
         :type topology: `str`
         :param definition: definition of the task to be created.
         :type definition: `dict`
         :return: details of the created task.
         :rtype: `dict`
         """
-        # First reset the local platform as we only allow it to serve 1 task at a time
-        global participant_list
-        participant_list = []
-        requests.post(self.path + 'reset')
-
-        # Then create a new task
         message = self.serializer.serialize(definition)
-        payload = {'message': message, 'task_name': task_name}
-        r = requests.post(self.path + 'create_task', params=payload)
+        payload = {'message': message, 'task_name': task_name, 'topology': topology,
+                   'groups': definition.get('groups', 0)}
+        r = self.session.post(self.path + 'create_task', params=payload)
 
         return {task_name: r}
 
@@ -157,7 +693,7 @@ class User(fflabc.AbstractUser, BasicParticipant):
         :return: details of the task.
         :rtype: `dict`
         """
-        r = requests.get(self.path + 'task_info', params={})
+        r = self.session.get(self.path + 'task_info', params={'task_name': task_name})
 
         if r.status_code == requests.codes.ok:
             definition = json.loads(r.text)['message']
@@ -176,13 +712,15 @@ class User(fflabc.AbstractUser, BasicParticipant):
         :return: details of the task assignment.
         :rtype: `dict`
         """
-        payload = {'message': self.user}
-        r = requests.post(self.path + 'join_task', params=payload)
+        payload = {'message': self.user, 'task_name': task_name}
+        r = self.session.post(self.path + 'join_task', params=payload)
 
         if r.status_code == requests.codes.ok:
             return {task_name: r}
-        else:
+        elif r.status_code == requests.codes.conflict:
             raise Exception('Join task fails because user already joined this task')
+        else:
+            raise Exception('Unexpected status code when joining task: %i' % r.status_code)
 
     def get_tasks(self):
         """
@@ -192,7 +730,7 @@ class User(fflabc.AbstractUser, BasicParticipant):
         :return: list of all the available tasks.
         :rtype: `list`
         """
-        r = requests.get(self.path + 'get_tasks', params={})
+        r = self.session.get(self.path + 'get_tasks', params={})
 
         if r.status_code == requests.codes.ok:
             task_name = json.loads(r.text)['message']
@@ -210,7 +748,7 @@ class User(fflabc.AbstractUser, BasicParticipant):
         :rtype: `list`
         """
         payload = {'message': self.user}
-        r = requests.get(self.path + 'get_joined_tasks', params=payload)
+        r = self.session.get(self.path + 'get_joined_tasks', params=payload)
 
         if r.status_code == requests.codes.ok:
             joined_tasks = json.loads(r.text)['message']
@@ -240,6 +778,7 @@ class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
         """
         super(Aggregator, self).__init__(context)
         self.task_name = task_name
+        self.participant_list = []
 
     def get_participants(self):
         """
@@ -249,16 +788,14 @@ class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
         :return participant: list of participants.
         :rtype participant: `dict`
         """
-        global participant_list
-
-        r = requests.get(self.path + 'get_participants', params={})
+        r = self.session.get(self.path + 'get_participants', params={'task_name': self.task_name})
 
         if r.status_code == requests.codes.ok:
-            participant_list = json.loads(r.text)['message']
+            self.participant_list = json.loads(r.text)['message']
         else:
             raise Exception('Unexpected status code when receiving message: %i' % r.status_code)
 
-        return participant_list
+        return self.participant_list
 
     def send(self, message=None, participant=None):
         """
@@ -270,13 +807,10 @@ class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
         :param participant: participant id.
         :type participant: `string`
         """
-        message = self.serializer.serialize(message)
-        payload = {'message': message, 'participant': participant}
-
-        if participant and participant not in participant_list:
+        if participant and participant not in self.participant_list:
             raise Exception('User not join task')
 
-        requests.post(self.path + 'aggregator_send', json=payload)
+        self.post_message('aggregator_send', message, participant)
 
     def receive(self, timeout=10):
         """
@@ -288,25 +822,15 @@ class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
         :return: received message.
         :rtype: `dict`
         """
-        start = time.time()
-
-        global participant_list
+        r = self.poll('aggregator_receive', {'task_name': self.task_name}, timeout)
+        response = self.decode_update(r.headers, self.read_body(r))
 
-        while time.time() - start < timeout:
-            r = requests.get(self.path + 'aggregator_receive', params={})
-
-            if r.status_code == requests.codes.ok:
-                result = r.json()['message']
+        # A join delivered again, as the platform does until it is acknowledged, is listed once
+        if fflabc.Notification.is_participant_joined(response.notification) and \
+                response.notification['participant'] not in self.participant_list:
+            self.participant_list.append(response.notification['participant'])
 
-                if fflabc.Notification.is_participant_joined(result['notification']):
-                    participant_list.append(result['notification']['participant'])
-                    return fflabc.Response(result['notification'], None)
-
-                else:
-                    result['params'] = self.serializer.deserialize(result['params'])
-                    return fflabc.Response(result['notification'], result['params'])
-
-        raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+        return response
 
     def stop_task(self, model=None):
         """
@@ -315,6 +839,7 @@ class Aggregator(fflabc.AbstractAggregator, BasicParticipant):
         Throws: An exception on failure.
         """
         self.send(message=model)
+        self.session.post(self.path + 'stop_task', params={'task_name': self.task_name})
 
 
 class Participant(fflabc.AbstractParticipant, BasicParticipant):
@@ -343,9 +868,7 @@ class Participant(fflabc.AbstractParticipant, BasicParticipant):
         :param message: message to be sent (needs to be serializable into json string).
         :type message: `dict`
         """
-        message = self.serializer.serialize(message)
-        payload = {'message': message, 'participant': self.user}
-        requests.post(self.path + 'participant_send', json=payload)
+        self.post_message('participant_send', message, self.user)
 
     def receive(self, timeout=10):
         """
@@ -357,16 +880,9 @@ class Participant(fflabc.AbstractParticipant, BasicParticipant):
         :return: received message.
         :rtype: `dict`
         """
-        start = time.time()
-
-        while time.time() - start < timeout:
-            r = requests.get(self.path + 'participant_receive', params={'user': self.user})
+        r = self.poll('participant_receive', {'user': self.user, 'task_name': self.task_name}, timeout)
 
-            if r.status_code == requests.codes.ok:
-                result = self.serializer.deserialize(r.json()['message'])
-                return fflabc.Response(None, result)
-
-        raise TimedOutException('Timeout when receiving data (%f over %f seconds)' % ((time.time() - start), timeout))
+        return self.decode_message(r.headers, self.read_body(r))
 
     def leave_task(self):
         """
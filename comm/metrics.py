@@ -0,0 +1,138 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+# Number of individual measurements kept for the json lines export; the summaries cover them all
+MAX_RECORDS = 100000
+PREFIX = 'musketeer_'
+# Labels left out of the prometheus summaries, to keep the number of series bounded
+UNSUMMARIZED_LABELS = ('round',)
+
+
+class Metrics:
+    """
+    A thread-safe recorder of measurements (durations in seconds, sizes in bytes, counts), each labelled
+    with e.g. the task, user and round it belongs to. Measurements are kept individually for the json
+    lines export, and summed up by name and label for the prometheus text export.
+    """
+
+    def __init__(self, max_records=MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self.summaries = {}
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        Drop all the measurements.
+        """
+        with self.lock:
+            self.records.clear()
+            self.summaries.clear()
+
+    def record(self, name, value, **labels):
+        """
+        Record a measurement; labels whose value is None are left out.
+
+        :param name: name of the measurement, suffixed by its unit (e.g. `fit_seconds`).
+        :type name: `str`
+        :param value: measured value.
+        :type value: `float`
+        """
+        labels = {key: value for key, value in labels.items() if value is not None}
+        series = (name, tuple(sorted((key, str(value)) for key, value in labels.items()
+                                     if key not in UNSUMMARIZED_LABELS)))
+
+        with self.lock:
+            self.records.append(dict(labels, name=name, value=value, time=time.time()))
+            summary = self.summaries.setdefault(series, [0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Record the time spent in a with block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **labels)
+
+    def to_json_lines(self):
+        """
+        Return the individual measurements, one json object per line.
+
+        :rtype: `str`
+        """
+        with self.lock:
+            records = list(self.records)
+
+        return ''.join(json.dumps(record) + '\n' for record in records)
+
+    def export(self, path):
+        """
+        Append the individual measurements to a json lines file.
+
+        :param path: path of the file.
+        :type path: `str`
+        """
+        with open(path, 'a') as output:
+            output.write(self.to_json_lines())
+
+    def to_prometheus(self):
+        """
+        Return the summaries of the measurements in the prometheus text exposition format.
+
+        :rtype: `str`
+        """
+        with self.lock:
+            summaries = sorted(self.summaries.items())
+
+        lines = []
+        previous = None
+        for (name, labels), (count, total) in summaries:
+            metric = PREFIX + name
+            if name != previous:
+                lines.append('# TYPE %s summary' % metric)
+                previous = name
+
+            tags = ','.join('%s="%s"' % (key, value.replace('\\', '\\\\').replace('"', '\\"'))
+                            for key, value in labels)
+            tags = '{%s}' % tags if tags else ''
+            lines.append('%s_count%s %d' % (metric, tags, count))
+            lines.append('%s_sum%s %r' % (metric, tags, float(total)))
+
+        return '\n'.join(lines) + '\n'
+
+
+# Measurements of this process
+METRICS = Metrics()
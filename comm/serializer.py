@@ -0,0 +1,168 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+
+ http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import json
+import struct
+
+import numpy as np
+
+from pycloudmessenger.serializer import SerializerABC, JsonPickleSerializer
+
+
+CONTENT_TYPE = 'application/octet-stream'
+MAGIC = b'MSKT'
+# Tensor buffers start on this boundary, relative to the start of the message
+ALIGNMENT = 64
+TENSOR_KEY = '__tensor__'
+
+
+def is_binary(message):
+    """
+    Check whether a serialized message is in the binary tensor format.
+
+    :param message: serialized message.
+    :type message: `str` or `bytes`
+    :return: True if yes, False otherwise.
+    :rtype: `bool`
+    """
+    return isinstance(message, (bytes, bytearray, memoryview)) and bytes(message[:len(MAGIC)]) == MAGIC
+
+
+def padding(size):
+    """
+    Number of bytes needed to pad size up to the next alignment boundary.
+    """
+    return -size % ALIGNMENT
+
+
+def plain(values):
+    """
+    Check that a json object of a header is plain data, not the tagged object of a json-pickled header.
+    Throws: ValueError if it is tagged.
+    """
+    for key in values:
+        if key.startswith('py/'):
+            raise ValueError('Message header is not plain json: %s' % key)
+
+    return values
+
+
+class BinarySerializer(SerializerABC):
+    '''
+    Binary serialization of messages holding numpy arrays.
+
+    Every array found in the message is replaced by a reference into a header that describes
+    its dtype, shape and offset, and its raw contiguous buffer is appended after the header.
+    The layout is: magic, header length (uint32, little endian), json-pickled header, then the
+    aligned tensor buffers. Deserialized arrays are read-only views over the received bytes.
+    The header of a message of plain dicts, lists, strings and numbers is plain json. A serializer that
+    does not trust the senders of its messages (such as the platform, which decodes the updates of any
+    participant) only accepts such headers, as jsonpickle can build arbitrary objects.
+    '''
+
+    def __init__(self, trusted=True):
+        self.encoder = JsonPickleSerializer()
+        self.trusted = trusted
+
+    def serialize(self, message: any) -> bytes:
+        '''Convert message to serializable format'''
+        tensors = []
+        skeleton = self.extract(message, tensors)
+
+        descriptors = []
+        offset = 0
+        for tensor in tensors:
+            offset += padding(offset)
+            descriptors.append({'dtype': tensor.dtype.str, 'shape': list(tensor.shape), 'offset': offset})
+            offset += tensor.nbytes
+
+        header = self.encoder.serialize({'message': skeleton, 'tensors': descriptors}).encode('utf-8')
+        preamble = MAGIC + struct.pack('<I', len(header)) + header
+
+        # Join raw byte views of the tensors so that each buffer is copied only once
+        chunks = [preamble, bytes(padding(len(preamble)))]
+        written = 0
+        for tensor, descriptor in zip(tensors, descriptors):
+            chunks.append(bytes(descriptor['offset'] - written))
+            chunks.append(memoryview(tensor.reshape(-1).view(np.uint8)))
+            written = descriptor['offset'] + tensor.nbytes
+
+        return b''.join(chunks)
+
+    def deserialize(self, message: bytes) -> any:
+        '''Convert serialized message to dict'''
+        if not is_binary(message):
+            raise ValueError('Message is not in the binary tensor format')
+
+        view = memoryview(message)
+        length = struct.unpack_from('<I', view, len(MAGIC))[0]
+        end = len(MAGIC) + 4 + length
+        header = bytes(view[len(MAGIC) + 4:end]).decode('utf-8')
+        header = self.encoder.deserialize(header) if self.trusted else json.loads(header, object_hook=plain)
+        start = end + padding(end)
+
+        tensors = []
+        for descriptor in header['tensors']:
+            dtype = np.dtype(descriptor['dtype'])
+            shape = tuple(descriptor['shape'])
+            count = int(np.prod(shape)) if shape else 1
+            tensor = np.frombuffer(view, dtype=dtype, count=count, offset=start + descriptor['offset'])
+            tensors.append(tensor.reshape(shape))
+
+        return self.restore(header['message'], tensors)
+
+    def extract(self, message, tensors):
+        """
+        Replace the numpy arrays of a message by references, collecting them in tensors.
+        """
+        if isinstance(message, np.ndarray) and not message.dtype.hasobject:
+            tensors.append(np.require(message, requirements='C'))
+            return {TENSOR_KEY: len(tensors) - 1}
+
+        if isinstance(message, dict):
+            return {key: self.extract(value, tensors) for key, value in message.items()}
+
+        if isinstance(message, (list, tuple)):
+            return type(message)(self.extract(value, tensors) for value in message)
+
+        return message
+
+    def restore(self, message, tensors):
+        """
+        Put the tensors back in place of their references.
+        """
+        if isinstance(message, dict):
+            if len(message) == 1 and TENSOR_KEY in message:
+                return tensors[message[TENSOR_KEY]]
+
+            return {key: self.restore(value, tensors) for key, value in message.items()}
+
+        if isinstance(message, (list, tuple)):
+            return type(message)(self.restore(value, tensors) for value in message)
+
+        return message
+
+
+SERIALIZERS = {'jsonpickle': JsonPickleSerializer, 'binary': BinarySerializer}
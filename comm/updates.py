@@ -0,0 +1,66 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import numpy as np
+
+
+def densify(update, shapes=None):
+    """
+    Decode an encoded update into dense layers: the full weights for the `none` scheme, otherwise their
+    differences from the weights the update started from. Unlike :func:`fl_algorithm.compression.decode`,
+    no reference weights are needed, so that the platform can sum the updates of a round as they arrive.
+
+    :param update: Encoded update, as returned by :meth:`fl_algorithm.compression.Compressor.encode`.
+    :type update: `dict`
+    :param shapes: Shapes of the layers, by default the ones recorded in the update.
+    :type shapes: `list`
+    :return: List of dense layers.
+    :rtype: `list`
+    """
+    scheme = update['scheme']
+
+    if scheme == 'none':
+        return [np.asarray(layer) for layer in update['layers']]
+
+    layers = []
+    for index, layer in enumerate(update['layers']):
+        if scheme in ('delta', 'fp16'):
+            delta = np.asarray(layer, dtype=np.float32)
+
+        elif scheme == 'int8':
+            delta = np.asarray(layer['values'], dtype=np.float32) * layer['scale']
+
+        elif scheme == 'topk':
+            shape = shapes[index] if shapes is not None else tuple(layer['shape'])
+            delta = np.zeros(int(np.prod(shape)), dtype=np.float32)
+            delta[np.asarray(layer['indices'])] = layer['values']
+            delta = delta.reshape(shape)
+
+        else:
+            raise ValueError('Unknown compression scheme %s' % scheme)
+
+        layers.append(delta)
+
+    return layers
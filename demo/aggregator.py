@@ -31,9 +31,10 @@ import logging
 import traceback
 
 import pycloudmessenger.ffl.abstractions as ffl
-from pycloudmessenger.serializer import JsonPickleSerializer as serializer
 
 import platform_utils as utils
+from comm.metrics import METRICS
+from fl_algorithm import registry
 
 
 # Set up logger
@@ -53,38 +54,63 @@ def args_parse():
     :return: namespace of key/value cmdline args.
     :rtype: `namespace`
     """
-    parser = utils.create_args(description='Musketeer aggregator')
-    parser.add_argument('--task_name', required=True)
+    parser = add_args(utils.create_args(description='Musketeer aggregator'))
     cmdline = parser.parse_args()
 
     return cmdline
 
 
-def get_class(class_name):
+def add_args(parser):
     """
-    Get a class module from its name.
+    Add the options of the aggregator to a parser, shared with the command line of cli.py.
 
-    :param class_name: Full name of a class.
-    :type class_name: `str`
-    :return: The class `module`.
-    :rtype: `module`
+    :param parser: parser of the command line.
+    :type parser: `argparse.ArgumentParser`
+    :return: the parser.
+    :rtype: `argparse.ArgumentParser`
     """
-    sub_mods = class_name.split(".")
-    module_ = __import__(".".join(sub_mods[:-1]), fromlist=sub_mods[-1])
-    class_module = getattr(module_, sub_mods[-1])
+    parser.add_argument('--task_name', required=True)
+    parser.add_argument('--metrics', default=None, help='JSON lines file to append the measurements of this process to')
+    parser.add_argument('--checkpoint_dir', default=None, help='Directory to checkpoint the global model to')
+    parser.add_argument('--checkpoint_every', type=int, default=1, help='Number of rounds between checkpoints')
+    parser.add_argument('--resume', action='store_true', help='Resume training from the latest checkpoint')
+
+    return parser
 
-    return class_module
 
+def algorithm_kwargs(cmdline):
+    """
+    Extra arguments of the algorithm given on the command line: the checkpoints, if any.
 
-def run(context, task_name):
+    :param cmdline: namespace of key/value cmdline args.
+    :type cmdline: `namespace`
+    :return: keyword arguments of :func:`run`.
+    :rtype: `dict`
+    """
+    if cmdline.checkpoint_dir is None:
+        return {}
+
+    return {'checkpoint_dir': cmdline.checkpoint_dir, 'checkpoint_every': cmdline.checkpoint_every,
+            'resume': cmdline.resume}
+
+
+def run(context, task_name, **kwargs):
     """
     Run the algorithm for the given task as aggregator.
+    With a `checkpoint_dir` and `resume`, training continues from the last checkpointed round, after sending
+    the model architecture and the checkpointed model to the participants again.
 
     :param context: context info.
     :type context: `pycloudmessenger.ffl.abstractions.AbstractContext`
     :param task_name: training task to be performed.
     :type task_name: `str`
+    :param kwargs: extra arguments of the algorithm, e.g. `checkpoint_dir`, `checkpoint_every` and `resume`.
+    :type kwargs: `dict`
+    :return: the algorithm that was run.
+    :rtype: `object`
     """
+    from pycloudmessenger.serializer import JsonPickleSerializer as serializer
+
     user = ffl.Factory.user(context)
 
     with user:
@@ -92,11 +118,9 @@ def run(context, task_name):
 
     aggregator = ffl.Factory.aggregator(context, task_name=task_name)
 
-    import sys
-    sys.path.append("../fl_algorithm")
-
-    alg_class = get_class(task_definition['aggregator'])
-    algorithm = alg_class(task_definition, aggregator)
+    # Only the selected algorithm, and its dependencies, are imported
+    alg_class = registry.load(task_definition['aggregator'])
+    algorithm = alg_class(task_definition, aggregator, **kwargs)
 
     try:
         model = algorithm.start()
@@ -112,6 +136,8 @@ def run(context, task_name):
         traceback.print_exc()
         LOGGER.error(str(e))
 
+    return algorithm
+
 
 def get_participants(context, task_name):
     """
@@ -137,8 +163,10 @@ def main():
     try:
         cmdline = args_parse()
         context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+        run(context, cmdline.task_name, **algorithm_kwargs(cmdline))
 
-        run(context, cmdline.task_name)
+        if cmdline.metrics:
+            METRICS.export(cmdline.metrics)
 
     except Exception as err:
         LOGGER.error('Error: %s', err)
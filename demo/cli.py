@@ -0,0 +1,208 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# to run:
+# python3 cli.py <command> --credentials <> --user <> --password <> --platform <> [command options]
+# with the commands: register, create, list, join, aggregate, subaggregate, participate
+
+import argparse
+import logging
+
+import platform_utils as utils
+
+
+# Set up logger
+logging.basicConfig(
+    level=logging.ERROR,
+    format='%(asctime)s.%(msecs)03d %(levelname)-6s %(name)s %(thread)d :: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S')
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(logging.DEBUG)
+
+
+# The commands import their demo module when they run, so that a command only loads what it needs:
+# listing tasks never loads the algorithms (Keras, TensorFlow), nor the platforms it does not use.
+# The scripts running an algorithm are imported to parse their options, they only load it when run.
+
+def register_user(cmdline):
+    """
+    Register a user on the platform.
+    """
+    import register
+
+    context = utils.platform(cmdline.platform, cmdline.credentials)
+    register.create_user(context, cmdline.user, cmdline.password, cmdline.org)
+    LOGGER.info('User %s created', cmdline.user)
+
+
+def create_task(cmdline):
+    """
+    Create the demo task.
+    """
+    import creator
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+    definition = dict(creator.TASK_DEFINITION)
+
+    if cmdline.groups is not None:
+        definition['groups'] = cmdline.groups
+
+    LOGGER.debug(creator.create_task(context, cmdline.task_name, definition))
+    LOGGER.info('Task created.')
+
+
+def list_tasks(cmdline):
+    """
+    List the available tasks.
+    """
+    import listing
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+
+    for task in listing.get_tasks(context):
+        LOGGER.info(f"{task['task_name']} - {task['status']}")
+
+
+def join_task(cmdline):
+    """
+    Join a task.
+    """
+    import join
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+    join.join_task(context, cmdline.task_name)
+    LOGGER.debug('Joined task')
+
+
+def run_aggregator(cmdline):
+    """
+    Run the aggregator of a task.
+    """
+    import aggregator
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+    aggregator.run(context, cmdline.task_name, **aggregator.algorithm_kwargs(cmdline))
+
+
+def run_subaggregator(cmdline):
+    """
+    Run the sub-aggregator of a group of a tree task.
+    """
+    import subaggregator
+    from comm.topology import group_name
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+    upstream_context = utils.platform(cmdline.platform, cmdline.credentials,
+                                      group_name(cmdline.task_name, cmdline.group), cmdline.password)
+    subaggregator.run(context, upstream_context, cmdline.task_name, cmdline.group)
+
+
+def run_participant(cmdline):
+    """
+    Run a participant of a task.
+    """
+    import participant
+
+    context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+    participant.run(context, cmdline.task_name, **participant.algorithm_kwargs(cmdline))
+
+
+def args_parse(args=None):
+    """
+    Parse command line args.
+
+    :param args: command line args, by default those of the process.
+    :type args: `list`
+    :return: namespace of key/value cmdline args, with the function running the command.
+    :rtype: `namespace`
+    """
+    parser = argparse.ArgumentParser(prog='musketeer', description='Musketeer command line')
+    # add_subparsers only takes required from Python 3.7 on
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    command = utils.add_args(commands.add_parser('register', help='Register a user'))
+    command.add_argument('--org', required=True, help='Your organisation')
+    command.set_defaults(run=register_user)
+
+    command = utils.add_args(commands.add_parser('create', help='Create the demo task'))
+    command.add_argument('--task_name', required=True)
+    command.add_argument('--groups', type=int, default=None,
+                         help='Number of groups of participants under sub-aggregators (default: as in creator.py)')
+    command.set_defaults(run=create_task)
+
+    command = utils.add_args(commands.add_parser('list', help='List the available tasks'))
+    command.set_defaults(run=list_tasks)
+
+    command = utils.add_args(commands.add_parser('join', help='Join a task'))
+    command.add_argument('--task_name', required=True)
+    command.set_defaults(run=join_task)
+
+    # The options of the commands running an algorithm are those of their scripts
+    import aggregator
+    import subaggregator
+    import participant
+
+    command = aggregator.add_args(utils.add_args(commands.add_parser('aggregate',
+                                                                     help='Run the aggregator of a task')))
+    command.set_defaults(run=run_aggregator)
+
+    command = subaggregator.add_args(utils.add_args(commands.add_parser(
+        'subaggregate', help='Run the sub-aggregator of a group of a tree task')))
+    command.set_defaults(run=run_subaggregator)
+
+    command = participant.add_args(utils.add_args(commands.add_parser('participate',
+                                                                      help='Run a participant of a task')))
+    command.set_defaults(run=run_participant)
+
+    cmdline = parser.parse_args(args)
+
+    if cmdline.command is None:
+        parser.error('a command is required')
+
+    return cmdline
+
+
+def main(args=None):
+    """
+    Main entry point.
+    """
+    try:
+        cmdline = args_parse(args)
+        cmdline.run(cmdline)
+
+        if getattr(cmdline, 'metrics', None):
+            from comm.metrics import METRICS
+            METRICS.export(cmdline.metrics)
+
+    except Exception as err:
+        LOGGER.error('Error: %s', err)
+        raise err
+
+
+if __name__ == '__main__':
+    main()
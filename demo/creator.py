@@ -32,6 +32,7 @@ import logging
 import pycloudmessenger.ffl.abstractions as ffl
 
 import platform_utils as utils
+from comm.topology import TREE
 
 
 # Set up logger
@@ -43,6 +44,46 @@ logging.basicConfig(
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.DEBUG)
 
+# Definition of the demo machine learning task
+TASK_DEFINITION = {"aggregator": "neural_network.Aggregator",
+                   "participant": "neural_network.Participant",
+                   "sub_aggregator": "neural_network.SubAggregator",
+                   "quorum": 2,
+                   "round": 5,
+                   "epoch": 2,
+                   "batch_size": 256,
+                   "learning_rate": 0.001,
+                   "training_size": 10000,
+                   "test_size": 1000,
+                   # none, delta, fp16, int8 or topk (keeping compression_ratio of each layer)
+                   "compression": "none",
+                   "compression_ratio": 0.01,
+                   # sync, first_k (aggregate the first round_k updates), deadline (aggregate the updates received
+                   # within round_deadline seconds) or async (apply updates as they arrive, buffer_size at a time)
+                   "round_policy": "sync",
+                   "round_k": 2,
+                   "round_deadline": 60,
+                   "buffer_size": 1,
+                   # async only: drop updates more than max_staleness model versions old, discount the others
+                   # by (1 + staleness) ** -staleness_exponent
+                   "max_staleness": 4,
+                   "staleness_exponent": 0.5,
+                   # mean (weighted by samples), or robust to outlying updates: trimmed_mean (ignoring trim_ratio
+                   # of the updates at each end), median or krum (withstanding byzantine malicious updates)
+                   "aggregation": "mean",
+                   "trim_ratio": 0.1,
+                   "byzantine": 0,
+                   # mean and sync, first_k or deadline rounds, over the local platform with binary messages: the
+                   # platform sums up the updates of a round as they arrive and sends the aggregator their mean
+                   "server_aggregation": False,
+                   # local platform, mean and sync rounds only: split the participants into groups, each under a
+                   # sub-aggregator sending the aggregator one update for its group (0: all report to the aggregator)
+                   "groups": 0,
+                   # the next round starts as soon as a round is aggregated; evaluate the global model of the
+                   # round on a replica in the background (or else in the round loop, delaying the next updates)
+                   "pipeline": True,
+                   }
+
 
 def args_parse():
     """
@@ -60,7 +101,7 @@ def args_parse():
 
 def create_task(context, task_name, task_definition):
     """
-    Create a Federated ML task.
+    Create a Federated ML task, with a tree of aggregators if the definition has `groups`.
 
     :param context: context info.
     :type context: `pycloudmessenger.ffl.abstractions.AbstractContext`
@@ -72,7 +113,8 @@ def create_task(context, task_name, task_definition):
     user = ffl.Factory.user(context)
 
     with user:
-        result = user.create_task(task_name, ffl.Topology.star, task_definition)
+        topology = TREE if task_definition.get('groups') else ffl.Topology.star
+        result = user.create_task(task_name, topology, task_definition)
 
     return result
 
@@ -86,18 +128,7 @@ def main():
         context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
 
         # create new machine learning task
-        task_definition = {"aggregator": "neural_network.Aggregator",
-                           "participant": "neural_network.Participant",
-                           "quorum": 2,
-                           "round": 5,
-                           "epoch": 2,
-                           "batch_size": 256,
-                           "learning_rate": 0.001,
-                           "training_size": 10000,
-                           "test_size": 1000,
-                           }
-
-        result = create_task(context, cmdline.task_name, task_definition)
+        result = create_task(context, cmdline.task_name, TASK_DEFINITION)
 
         LOGGER.debug(result)
         LOGGER.info('Task created.')
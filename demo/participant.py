@@ -32,11 +32,10 @@ import logging
 import traceback
 
 import pycloudmessenger.ffl.abstractions as ffl
-from pycloudmessenger.serializer import JsonPickleSerializer as serializer
 
-#from demo.aggregator import get_class
-from aggregator import get_class
 import platform_utils as utils
+from comm.metrics import METRICS
+from fl_algorithm import registry
 
 
 # Set up logger
@@ -56,14 +55,41 @@ def args_parse():
     :return: namespace of key/value cmdline args.
     :rtype: `namespace`
     """
-    parser = utils.create_args(description='Musketeer participant')
-    parser.add_argument('--task_name', required=True)
+    parser = add_args(utils.create_args(description='Musketeer participant'))
     cmdline = parser.parse_args()
 
     return cmdline
 
 
-def run(context, task_name):
+def add_args(parser):
+    """
+    Add the options of the participant to a parser, shared with the command line of cli.py.
+
+    :param parser: parser of the command line.
+    :type parser: `argparse.ArgumentParser`
+    :return: the parser.
+    :rtype: `argparse.ArgumentParser`
+    """
+    parser.add_argument('--task_name', required=True)
+    parser.add_argument('--shard', type=int, default=None, help='Number of the training data shard')
+    parser.add_argument('--metrics', default=None, help='JSON lines file to append the measurements of this process to')
+
+    return parser
+
+
+def algorithm_kwargs(cmdline):
+    """
+    Extra arguments of the algorithm given on the command line: the data shard, if given.
+
+    :param cmdline: namespace of key/value cmdline args.
+    :type cmdline: `namespace`
+    :return: keyword arguments of :func:`run`.
+    :rtype: `dict`
+    """
+    return {} if cmdline.shard is None else {'shard': cmdline.shard}
+
+
+def run(context, task_name, **kwargs):
     """
     Run the algorithm for the given task as participant.
 
@@ -71,7 +97,13 @@ def run(context, task_name):
     :type context: `pycloudmessenger.ffl.abstractions.AbstractContext`
     :param task_name: training task to be performed.
     :type task_name: `str`
+    :param kwargs: extra arguments of the algorithm, e.g. its data `shard`.
+    :type kwargs: `dict`
+    :return: the algorithm that was run.
+    :rtype: `object`
     """
+    from pycloudmessenger.serializer import JsonPickleSerializer as serializer
+
     user = ffl.Factory.user(context)
 
     with user:
@@ -79,11 +111,9 @@ def run(context, task_name):
 
     participant = ffl.Factory.participant(context, task_name=task_name)
 
-    import sys
-    sys.path.append("../fl_algorithm")
-
-    alg_class = get_class(task_definition['participant'])
-    algorithm = alg_class(task_definition, participant)
+    # Only the selected algorithm, and its dependencies, are imported
+    alg_class = registry.load(task_definition['participant'])
+    algorithm = alg_class(task_definition, participant, **kwargs)
 
     try:
         algorithm.start()
@@ -94,6 +124,8 @@ def run(context, task_name):
 
     LOGGER.info('Completed training !!!')
 
+    return algorithm
+
 
 def main():
     """
@@ -102,8 +134,10 @@ def main():
     try:
         cmdline = args_parse()
         context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+        run(context, cmdline.task_name, **algorithm_kwargs(cmdline))
 
-        run(context, cmdline.task_name)
+        if cmdline.metrics:
+            METRICS.export(cmdline.metrics)
 
     except Exception as err:
         LOGGER.error('Error: %s', err)
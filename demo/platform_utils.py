@@ -9,10 +9,12 @@ import pycloudmessenger.ffl.abstractions as ffl
 def platform(config: str = 'cloud', credentials: str = None, user: str = None, password: str = None):
     if config == 'local':
         import comm.localapi as fflapi
+    elif config == 'inproc':
+        import comm.inprocapi as fflapi
     elif config == 'cloud':
         import pycloudmessenger.ffl.fflapi as fflapi
     else:
-        raise ValueError('We currently support only `cloud` or `local` platform')
+        raise ValueError('We currently support only `cloud`, `local` or `inproc` platform')
 
     ffl.Factory.register(config, fflapi.Context, fflapi.User, fflapi.Aggregator, fflapi.Participant)
 
@@ -26,7 +28,16 @@ def create_args(description: str = None):
     :return: namespace of key/value cmdline args.
     :rtype: `namespace`
     """
-    parser = argparse.ArgumentParser(description=description)
+    return add_args(argparse.ArgumentParser(description=description))
+
+
+def add_args(parser):
+    """
+    Add the platform and user args to a command line parser.
+
+    :return: the parser.
+    :rtype: `argparse.ArgumentParser`
+    """
     parser.add_argument('--credentials', required=True, help='Original credentials file from IBM')
     parser.add_argument('--user', required=True)
     parser.add_argument('--password', required=True)
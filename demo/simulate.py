@@ -0,0 +1,264 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# to run:
+# python3 simulate.py --credentials <> --user <> --password <> --task_name <> --platform local --participants <>
+
+import os
+import json
+import time
+import logging
+import multiprocessing
+
+import platform_utils as utils
+from comm.topology import group_name
+from comm.metrics import METRICS
+from fl_algorithm import dataset
+import aggregator
+import participant
+import subaggregator
+import creator
+import join
+
+
+# Set up logger
+logging.basicConfig(
+    level=logging.ERROR,
+    format='%(asctime)s.%(msecs)03d %(levelname)-6s %(name)s %(thread)d :: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S')
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(logging.DEBUG)
+
+
+def args_parse():
+    """
+    Parse command line args.
+
+    :return: namespace of key/value cmdline args.
+    :rtype: `namespace`
+    """
+    parser = utils.create_args(description='Musketeer multi-process simulation')
+    parser.add_argument('--task_name', required=True)
+    parser.add_argument('--participants', type=int, default=2, help='Number of simulated participants')
+    parser.add_argument('--round', type=int, default=None, help='Over-ride the number of rounds')
+    parser.add_argument('--groups', type=int, default=0,
+                        help='Number of groups of participants under sub-aggregators (default: none)')
+    parser.add_argument('--cores', default=None,
+                        help='Comma separated CPU cores to pin participants to (default: all available cores)')
+    parser.add_argument('--threads', type=int, default=1, help='TensorFlow threads per process')
+    parser.add_argument('--output', default=None, help='JSON file to write the per-round timings to')
+    parser.add_argument('--metrics', default=None, help='JSON lines file to write the measurements of all the processes to')
+    cmdline = parser.parse_args()
+
+    return cmdline
+
+
+def limit_threads(threads):
+    """
+    Limit the number of threads used by TensorFlow (and the BLAS libraries) in this process.
+
+    :param threads: number of threads.
+    :type threads: `int`
+    """
+    for variable in ['OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS']:
+        os.environ[variable] = str(threads)
+
+    import tensorflow as tf
+    from keras import backend
+
+    config = tf.ConfigProto(intra_op_parallelism_threads=threads, inter_op_parallelism_threads=threads)
+    backend.set_session(tf.Session(config=config))
+
+
+def init_worker(counter, cores, threads):
+    """
+    Initialize a participant process: pin it to its CPU core and limit its threads.
+
+    :param counter: shared count of the started processes.
+    :type counter: `multiprocessing.Value`
+    :param cores: CPU cores to pin the processes to, in turn.
+    :type cores: `list`
+    :param threads: number of TensorFlow threads.
+    :type threads: `int`
+    """
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cores[index % len(cores)]})
+
+    limit_threads(threads)
+
+
+def simulate_participant(platform, credentials, user, password, task_name, shard):
+    """
+    Run a participant in a worker process, training on its own data shard.
+
+    :return: the user, the per-round timings of its algorithm and the measurements of the process.
+    :rtype: `tuple`
+    """
+    context = utils.platform(platform, credentials, user, password)
+    algorithm = participant.run(context, task_name, shard=shard)
+
+    return user, algorithm.timings, list(METRICS.records)
+
+
+def simulate_subaggregator(platform, credentials, user, password, task_name, group):
+    """
+    Run the sub-aggregator of a group in a worker process.
+
+    :return: the measurements of the process.
+    :rtype: `list`
+    """
+    context = utils.platform(platform, credentials, user, password)
+    upstream_context = utils.platform(platform, credentials, group_name(task_name, group), password)
+    subaggregator.run(context, upstream_context, task_name, group)
+
+    return list(METRICS.records)
+
+
+def simulate(platform, credentials, user, password, task_name, participants, rounds=None, cores=None, threads=1,
+             groups=0):
+    """
+    Create a task, join it with synthetic users and run them in a pool of processes,
+    while this process runs the aggregator. With groups, the participants are split into groups
+    under sub-aggregators, which run in the pool too. Each participant trains on its own shard of the train
+    set, smaller than in the demo task definition if there are too many participants for its shards.
+
+    :param platform: platform to run on (the `inproc` platform cannot be shared by processes).
+    :type platform: `str`
+    :param credentials: credentials file.
+    :type credentials: `str`
+    :param user: aggregator user.
+    :type user: `str`
+    :param password: password of all the users.
+    :type password: `str`
+    :param task_name: name of the task to create.
+    :type task_name: `str`
+    :param participants: number of simulated participants.
+    :type participants: `int`
+    :param rounds: number of rounds (default: as in the demo task definition).
+    :type rounds: `int`
+    :param cores: CPU cores to pin participants to.
+    :type cores: `list`
+    :param threads: number of TensorFlow threads per process.
+    :type threads: `int`
+    :param groups: number of groups of participants, 0 for none.
+    :type groups: `int`
+    :return: per-round timings of the aggregator and participants, the number of update messages the
+             aggregator received in each round, and the measurements of all the processes.
+    :rtype: `dict`
+    """
+    if platform == 'inproc':
+        raise ValueError('The `inproc` platform cannot be shared by several processes')
+
+    if participants > dataset.TRAIN_SAMPLES:
+        raise ValueError('At most %d participants can have a shard of their own' % dataset.TRAIN_SAMPLES)
+
+    context = utils.platform(platform, credentials, user, password)
+
+    training_size = min(creator.TASK_DEFINITION['training_size'], dataset.TRAIN_SAMPLES // participants)
+    definition = dict(creator.TASK_DEFINITION, quorum=participants, groups=groups, training_size=training_size)
+    if rounds:
+        definition['round'] = rounds
+
+    creator.create_task(context, task_name, definition)
+
+    users = ['%s_participant_%d' % (task_name, i) for i in range(participants)]
+    for name in users:
+        join.join_task(utils.platform(platform, credentials, name, password), task_name)
+
+    LOGGER.info('Starting %d participants', participants)
+
+    # TensorFlow does not survive a fork, so the workers are spawned
+    spawn = multiprocessing.get_context('spawn')
+    counter = spawn.Value('i', 0)
+
+    with spawn.Pool(participants + groups, initializer=init_worker, initargs=(counter, cores, threads)) as pool:
+        futures = [pool.apply_async(simulate_participant, (platform, credentials, name, password, task_name, shard))
+                   for shard, name in enumerate(users)]
+        sub_futures = [pool.apply_async(simulate_subaggregator,
+                                        (platform, credentials, user, password, task_name, group))
+                       for group in range(groups)]
+
+        limit_threads(threads)
+        start = time.time()
+        algorithm = aggregator.run(context, task_name)
+        end = time.time()
+
+        results = [future.get() for future in futures]
+        sub_results = [future.get() for future in sub_futures]
+
+    fan_in = [record['value'] for record in METRICS.records
+              if record['name'] == 'received_updates' and record.get('role') == 'aggregator']
+
+    return {'participants': participants, 'groups': groups, 'time': end - start, 'fan_in': fan_in,
+            'aggregator': algorithm.timings, 'participant': {name: timings for name, timings, _ in results},
+            'metrics': list(METRICS.records) + [record for _, _, records in results for record in records] +
+            [record for records in sub_results for record in records]}
+
+
+def main():
+    """
+    Main entry point.
+    """
+    try:
+        cmdline = args_parse()
+
+        if cmdline.cores:
+            cores = [int(core) for core in cmdline.cores.split(',')]
+        elif hasattr(os, 'sched_getaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = None
+
+        result = simulate(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password, cmdline.task_name,
+                          cmdline.participants, cmdline.round, cores, cmdline.threads, cmdline.groups)
+
+        for timing in result['aggregator']:
+            LOGGER.info('Round %d, time %f', timing['round'], timing['time'])
+        LOGGER.info('%d participants, total time %f', result['participants'], result['time'])
+        LOGGER.info('Update messages received by the aggregator per round: %s', result['fan_in'])
+
+        metrics = result.pop('metrics')
+
+        if cmdline.output:
+            with open(cmdline.output, 'w') as output:
+                json.dump(result, output, indent=2)
+
+        if cmdline.metrics:
+            with open(cmdline.metrics, 'w') as output:
+                output.writelines(json.dumps(record) + '\n' for record in metrics)
+
+    except Exception as err:
+        LOGGER.error('Error: %s', err)
+        raise err
+
+
+if __name__ == '__main__':
+    main()
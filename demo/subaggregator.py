@@ -0,0 +1,143 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# to run, for each group of a task created with groups (as its creator):
+# python3 subaggregator.py --credentials <> --user <> --password <> --task_name <> --group <> --platform <>
+
+import logging
+import traceback
+
+import pycloudmessenger.ffl.abstractions as ffl
+
+import platform_utils as utils
+from comm.topology import group_name
+from comm.metrics import METRICS
+from fl_algorithm import registry
+
+
+# Set up logger
+logging.basicConfig(
+    level=logging.ERROR,
+    format='%(asctime)s.%(msecs)03d %(levelname)-6s %(name)s %(thread)d :: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S')
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(logging.DEBUG)
+
+
+def args_parse():
+    """
+    Parse command line args.
+
+    :return: namespace of key/value cmdline args.
+    :rtype: `namespace`
+    """
+    parser = add_args(utils.create_args(description='Musketeer sub-aggregator'))
+    cmdline = parser.parse_args()
+
+    return cmdline
+
+
+def add_args(parser):
+    """
+    Add the options of the sub-aggregator to a parser, shared with the command line of cli.py.
+
+    :param parser: parser of the command line.
+    :type parser: `argparse.ArgumentParser`
+    :return: the parser.
+    :rtype: `argparse.ArgumentParser`
+    """
+    parser.add_argument('--task_name', required=True)
+    parser.add_argument('--group', type=int, required=True, help='Number of the group to aggregate')
+    parser.add_argument('--metrics', default=None, help='JSON lines file to append the measurements of this process to')
+
+    return parser
+
+
+def run(context, upstream_context, task_name, group):
+    """
+    Run the algorithm for the given task as the sub-aggregator of a group: the aggregator of the task of
+    the group, and a participant of the task.
+
+    :param context: context info of the aggregator of the group.
+    :type context: `pycloudmessenger.ffl.abstractions.AbstractContext`
+    :param upstream_context: context info of the participant of the task, named after the group.
+    :type upstream_context: `pycloudmessenger.ffl.abstractions.AbstractContext`
+    :param task_name: training task to be performed.
+    :type task_name: `str`
+    :param group: number of the group.
+    :type group: `int`
+    :return: the algorithm that was run.
+    :rtype: `object`
+    """
+    from pycloudmessenger.serializer import JsonPickleSerializer as serializer
+
+    user = ffl.Factory.user(context)
+
+    with user:
+        task_definition = serializer().deserialize(user.task_info(task_name)['definition'])
+
+    aggregator = ffl.Factory.aggregator(context, task_name=group_name(task_name, group))
+    participant = ffl.Factory.participant(upstream_context, task_name=task_name)
+
+    # Only the selected algorithm, and its dependencies, are imported
+    alg_class = registry.load(task_definition['sub_aggregator'])
+    algorithm = alg_class(task_definition, aggregator, participant, group)
+
+    try:
+        algorithm.start()
+
+    except Exception as e:
+        traceback.print_exc()
+        LOGGER.error(str(e))
+
+    LOGGER.info('Completed training !!!')
+
+    return algorithm
+
+
+def main():
+    """
+    Main entry point.
+    """
+    try:
+        cmdline = args_parse()
+        context = utils.platform(cmdline.platform, cmdline.credentials, cmdline.user, cmdline.password)
+        upstream_context = utils.platform(cmdline.platform, cmdline.credentials,
+                                          group_name(cmdline.task_name, cmdline.group), cmdline.password)
+
+        run(context, upstream_context, cmdline.task_name, cmdline.group)
+
+        if cmdline.metrics:
+            METRICS.export(cmdline.metrics)
+
+    except Exception as err:
+        LOGGER.error('Error: %s', err)
+        raise err
+
+
+if __name__ == '__main__':
+    main()
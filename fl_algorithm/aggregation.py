@@ -0,0 +1,323 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# Rules aggregating the updates of a round: their weighted mean, or a statistic robust to outlying or malicious
+# updates (coordinate-wise trimmed mean or median, or the update closest to its neighbours with Krum)
+RULES = ['mean', 'trimmed_mean', 'median', 'krum']
+# Smallest number of parameters worth handing to a thread of its own
+BLOCK_SIZE = 2 ** 16
+
+
+class StreamingAverage:
+    """
+    This class implements a running (weighted) average of model updates. Each update is folded into
+    a preallocated float64 accumulator as soon as it arrives, so that updates never need to be buffered.
+    """
+
+    def __init__(self, template):
+        """
+        Create a :class:`StreamingAverage` instance.
+
+        :param template: List of layer weights giving the shape and type of the model.
+        :type template: `list`
+        """
+        self.dtypes = [np.asarray(layer).dtype for layer in template]
+        self.accumulator = [np.zeros(np.shape(layer), dtype=np.float64) for layer in template]
+        self.total_weight = 0.0
+        self.count = 0
+
+    def reset(self):
+        """
+        Clear the accumulator in place, ready for a new round.
+        """
+        for layer in self.accumulator:
+            layer.fill(0)
+
+        self.total_weight = 0.0
+        self.count = 0
+
+    def add(self, update, weight=1, count=1):
+        """
+        Fold a model update into the running sum.
+
+        :param update: List of layer weights sent by a participant.
+        :type update: `list`
+        :param weight: Weight of the update, e.g. the number of samples it was trained on.
+        :type weight: `float`
+        :param count: Number of updates it stands for, when already averaged by the platform.
+        :type count: `int`
+        """
+        if len(update) != len(self.accumulator):
+            raise ValueError('Model update has %d layers, expected %d' % (len(update), len(self.accumulator)))
+
+        for accumulator, layer in zip(self.accumulator, update):
+            layer = np.asarray(layer)
+
+            if weight == 1:
+                accumulator += layer
+            else:
+                accumulator += weight * layer
+
+        self.total_weight += weight
+        self.count += count
+
+    def result(self, out=None):
+        """
+        Return the weighted average of the updates received so far.
+
+        :param out: List of layers to write the average into, e.g. the layers of a model state.
+        :type out: `list`
+        :return: List of averaged layer weights, with the types of the template.
+        :rtype: `list`
+        """
+        if self.total_weight <= 0:
+            raise ValueError('No model update to average')
+
+        if out is None:
+            return [(layer / self.total_weight).astype(dtype) for layer, dtype in zip(self.accumulator, self.dtypes)]
+
+        for layer, target in zip(self.accumulator, out):
+            np.divide(layer, self.total_weight, out=target, casting='unsafe')
+
+        return out
+
+
+class LayerIndex:
+    """
+    This class maps the layers of a model to their offsets in a flat vector of all its parameters.
+    """
+
+    def __init__(self, template):
+        """
+        Create a :class:`LayerIndex` instance.
+
+        :param template: List of layer weights giving the shape and type of the model.
+        :type template: `list`
+        """
+        self.shapes = [np.shape(layer) for layer in template]
+        self.dtypes = [np.asarray(layer).dtype for layer in template]
+        self.offsets = np.cumsum([0] + [int(np.prod(shape)) for shape in self.shapes]).tolist()
+        self.size = self.offsets[-1]
+
+    def flatten(self, update, out):
+        """
+        Copy the layers of a model update into a flat vector.
+
+        :param update: List of layer weights.
+        :type update: `list`
+        :param out: Vector of the index size to copy the update into.
+        :type out: `np.ndarray`
+        :return: out.
+        :rtype: `np.ndarray`
+        """
+        if len(update) != len(self.shapes):
+            raise ValueError('Model update has %d layers, expected %d' % (len(update), len(self.shapes)))
+
+        for layer, start, stop in zip(update, self.offsets[:-1], self.offsets[1:]):
+            layer = np.asarray(layer)
+
+            if layer.size != stop - start:
+                raise ValueError('Model update has a layer of %d weights, expected %d' % (layer.size, stop - start))
+
+            out[start:stop] = layer.reshape(-1)
+
+        return out
+
+    def unflatten(self, vector, out=None):
+        """
+        Split a flat vector back into layers.
+
+        :param vector: Vector of the index size.
+        :type vector: `np.ndarray`
+        :param out: List of layers to copy the vector into, instead of new ones.
+        :type out: `list`
+        :return: List of layer weights, with the shapes and types of the template.
+        :rtype: `list`
+        """
+        if out is None:
+            return [vector[start:stop].reshape(shape).astype(dtype) for start, stop, shape, dtype
+                    in zip(self.offsets[:-1], self.offsets[1:], self.shapes, self.dtypes)]
+
+        for start, stop, target in zip(self.offsets[:-1], self.offsets[1:], out):
+            np.copyto(target, vector[start:stop].reshape(target.shape), casting='unsafe')
+
+        return out
+
+
+class RobustAverage:
+    """
+    This class aggregates the model updates of a round with one of the aggregation RULES. Updates are flattened
+    into the rows of a preallocated float32 matrix (updates x parameters), which is reduced with vectorized
+    numpy, split into blocks of parameters handled by a pool of threads.
+    It has the interface of :class:`StreamingAverage`, but keeps every update until the result is computed.
+    The trimmed mean and median ignore the weights of the updates, and Krum selects one update.
+    """
+
+    def __init__(self, template, rule='mean', trim_ratio=0.1, byzantine=0, capacity=1, threads=None):
+        """
+        Create a :class:`RobustAverage` instance.
+
+        :param template: List of layer weights giving the shape and type of the model.
+        :type template: `list`
+        :param rule: Aggregation rule, one of RULES.
+        :type rule: `str`
+        :param trim_ratio: Share of the updates ignored at each end by the trimmed mean, for each parameter,
+                           at least 0 and less than 0.5.
+        :type trim_ratio: `float`
+        :param byzantine: Number of malicious updates Krum is to withstand.
+        :type byzantine: `int`
+        :param capacity: Number of updates expected in a round; more are accepted, at the cost of a copy.
+        :type capacity: `int`
+        :param threads: Number of threads, by default the number of cores.
+        :type threads: `int`
+        """
+        if rule not in RULES:
+            raise ValueError('Unknown aggregation rule %s, expected one of %s' % (rule, RULES))
+
+        if not 0 <= trim_ratio < 0.5:
+            raise ValueError('Trim ratio %s out of range, expected at least 0 and less than 0.5' % trim_ratio)
+
+        self.rule = rule
+        self.trim_ratio = trim_ratio
+        self.byzantine = byzantine
+        self.index = LayerIndex(template)
+        self.updates = np.empty((max(capacity, 1), self.index.size), dtype=np.float32)
+        self.weights = []
+        self.total_weight = 0.0
+        # Number of updates, and of rows of the matrix they are stored in
+        self.count = 0
+        self.rows = 0
+        self.threads = threads or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+
+    def reset(self):
+        """
+        Forget the updates received, ready for a new round.
+        """
+        self.weights = []
+        self.total_weight = 0.0
+        self.count = 0
+        self.rows = 0
+
+    def add(self, update, weight=1, count=1):
+        """
+        Store a model update in the next row of the matrix.
+
+        :param update: List of layer weights sent by a participant.
+        :type update: `list`
+        :param weight: Weight of the update, e.g. the number of samples it was trained on.
+        :type weight: `float`
+        :param count: Number of updates it stands for, when already averaged by the platform; the robust
+                      rules still count it as one row.
+        :type count: `int`
+        """
+        if self.rows == len(self.updates):
+            updates = np.empty((2 * len(self.updates), self.index.size), dtype=np.float32)
+            updates[:self.rows] = self.updates
+            self.updates = updates
+
+        self.index.flatten(update, self.updates[self.rows])
+        self.weights.append(weight)
+        self.total_weight += weight
+        self.count += count
+        self.rows += 1
+
+    def map(self, function):
+        """
+        Apply function(start, stop) to blocks of parameters in the thread pool, and return the results.
+        """
+        number = max(1, min(self.threads, self.index.size // BLOCK_SIZE))
+        bounds = np.linspace(0, self.index.size, number + 1).astype(int).tolist()
+        blocks = list(zip(bounds[:-1], bounds[1:]))
+
+        if self.executor is None or number == 1:
+            return [function(start, stop) for start, stop in blocks]
+
+        return list(self.executor.map(lambda block: function(*block), blocks))
+
+    def reduce(self, start, stop, out):
+        """
+        Aggregate the updates of a block of parameters into out.
+        """
+        block = self.updates[:self.rows, start:stop]
+
+        if self.rule == 'mean':
+            scale = np.asarray(self.weights, dtype=np.float32) / np.float32(self.total_weight)
+            np.dot(scale, block, out=out[start:stop])
+        elif self.rule == 'median':
+            np.median(block, axis=0, out=out[start:stop])
+        else:
+            trim = int(self.trim_ratio * self.rows)
+            np.mean(np.sort(block, axis=0)[trim:self.rows - trim], axis=0, out=out[start:stop])
+
+    def krum(self):
+        """
+        Select the update with the smallest sum of squared distances to its count - byzantine - 2 nearest
+        neighbours. Distances come from the Gram matrix of the updates, centered for accuracy, summed over
+        the blocks of parameters.
+
+        :return: Row of the selected update.
+        :rtype: `int`
+        """
+        def gram(start, stop):
+            block = self.updates[:self.rows, start:stop]
+            centered = block - block.mean(axis=0)
+            return np.dot(centered, centered.T).astype(np.float64)
+
+        products = sum(self.map(gram))
+        norms = np.diag(products)
+        distances = norms[:, np.newaxis] + norms[np.newaxis, :] - 2 * products
+        np.fill_diagonal(distances, np.inf)
+
+        neighbours = min(max(self.rows - self.byzantine - 2, 1), self.rows - 1)
+        scores = np.sort(distances, axis=1)[:, :neighbours].sum(axis=1)
+
+        return int(np.argmin(scores))
+
+    def result(self, out=None):
+        """
+        Return the aggregate of the updates received so far.
+
+        :param out: List of layers to write the aggregate into, e.g. the layers of a model state.
+        :type out: `list`
+        :return: List of aggregated layer weights, with the types of the template.
+        :rtype: `list`
+        """
+        if self.rows == 0 or self.total_weight <= 0:
+            raise ValueError('No model update to average')
+
+        if self.rule == 'krum':
+            return self.index.unflatten(self.updates[self.krum() if self.rows > 1 else 0], out)
+
+        vector = np.empty(self.index.size, dtype=np.float32)
+        self.map(lambda start, stop: self.reduce(start, stop, vector))
+
+        return self.index.unflatten(vector, out)
@@ -0,0 +1,164 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+import re
+import logging
+import threading
+
+from comm.serializer import BinarySerializer
+from comm.metrics import METRICS
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Checkpoints are named after the round they resume from, so that their names sort in round order
+FILE_NAME = 'round-%08d.ckpt'
+FILE_PATTERN = re.compile(r'^round-(\d{8})\.ckpt$')
+TEMPORARY_SUFFIX = '.tmp'
+# Number of checkpoints kept in the directory
+KEEP = 2
+
+
+class Checkpointer:
+    """
+    This class writes checkpoints of the state of an aggregator (global weights, optimizer state, round
+    and metrics history) to a directory, in the binary message format, from a background thread so that
+    the round loop does not wait for the disk. A checkpoint is written to a temporary file and renamed
+    once complete, so that a crash never leaves a partial checkpoint behind. If checkpoints are requested
+    faster than they can be written, only the latest one is written.
+    """
+
+    def __init__(self, directory, every=1, keep=KEEP):
+        """
+        Create a :class:`Checkpointer` instance.
+
+        :param directory: Directory of the checkpoints, created if needed.
+        :type directory: `str`
+        :param every: Number of rounds between checkpoints.
+        :type every: `int`
+        :param keep: Number of checkpoints kept, the older ones are deleted.
+        :type keep: `int`
+        """
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.serializer = BinarySerializer()
+        self.pending = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.writer = threading.Thread(target=self.run, name='checkpointer', daemon=True)
+
+        os.makedirs(directory, exist_ok=True)
+        self.writer.start()
+
+    def is_due(self, round_id, last_round):
+        """
+        Whether the state at the end of round_id should be checkpointed: every `every` rounds, and after
+        the last round.
+        """
+        return (round_id + 1) % self.every == 0 or round_id + 1 == last_round
+
+    def save(self, state):
+        """
+        Queue a checkpoint of state for the writer thread and return immediately. The arrays of state are
+        written as they are when the writer gets to them, so the caller must not modify them in place.
+
+        :param state: State to be checkpointed, including the `round` to resume from.
+        :type state: `dict`
+        """
+        with self.condition:
+            self.pending = state
+            self.condition.notify()
+
+    def run(self):
+        """
+        Write the queued checkpoints until closed.
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                state, self.pending = self.pending, None
+
+                if state is None:
+                    return
+
+            try:
+                with METRICS.timer('checkpoint_seconds', round=state['round']):
+                    self.write(state)
+            except Exception as err:
+                LOGGER.error('Checkpoint of round %d failed: %s', state['round'], err)
+
+    def write(self, state):
+        """
+        Write a checkpoint atomically, then delete the old ones.
+        """
+        path = os.path.join(self.directory, FILE_NAME % state['round'])
+        temporary = path + TEMPORARY_SUFFIX
+
+        with open(temporary, 'wb') as output:
+            output.write(self.serializer.serialize(state))
+            output.flush()
+            os.fsync(output.fileno())
+
+        os.replace(temporary, path)
+        LOGGER.info('Checkpoint written to %s', path)
+
+        for old in self.rounds()[:-self.keep]:
+            os.remove(os.path.join(self.directory, FILE_NAME % old))
+
+    def rounds(self):
+        """
+        Return the rounds of the checkpoints in the directory, in increasing order.
+        """
+        return sorted(int(match.group(1)) for match in map(FILE_PATTERN.match, os.listdir(self.directory)) if match)
+
+    def load(self):
+        """
+        Return the state of the latest checkpoint that can be read, or None if there is none.
+
+        :return: The checkpointed state.
+        :rtype: `dict`
+        """
+        for round_id in reversed(self.rounds()):
+            path = os.path.join(self.directory, FILE_NAME % round_id)
+
+            try:
+                with open(path, 'rb') as checkpoint:
+                    return self.serializer.deserialize(checkpoint.read())
+            except Exception as err:
+                LOGGER.error('Cannot read checkpoint %s: %s', path, err)
+
+        return None
+
+    def close(self):
+        """
+        Write the pending checkpoint, if any, and stop the writer thread.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+        self.writer.join()
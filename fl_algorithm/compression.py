@@ -0,0 +1,133 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import numpy as np
+
+from comm.updates import densify
+
+
+# none: full weights, delta: difference from the global weights, fp16/int8: quantized delta,
+# topk: largest `ratio` of the delta coordinates, with error feedback
+SCHEMES = ['none', 'delta', 'fp16', 'int8', 'topk']
+
+
+class Compressor:
+    """
+    This class encodes the model updates of a participant as (compressed) differences from the global weights
+    it received. For top-k sparsification, the coordinates left out are kept as a residual and added to the
+    next update (error feedback), so that no part of the update is lost for good.
+    """
+
+    def __init__(self, scheme='none', ratio=0.01):
+        """
+        Create a :class:`Compressor` instance.
+
+        :param scheme: Compression scheme, one of `SCHEMES`.
+        :type scheme: `str`
+        :param ratio: Fraction of the coordinates of each layer kept by top-k sparsification.
+        :type ratio: `float`
+        """
+        if scheme not in SCHEMES:
+            raise ValueError('Unknown compression scheme %s, expected one of %s' % (scheme, SCHEMES))
+
+        self.scheme = scheme
+        self.ratio = ratio
+        self.residual = None
+
+    def encode(self, weights, reference):
+        """
+        Encode updated weights relative to the reference weights.
+
+        :param weights: List of updated layer weights.
+        :type weights: `list`
+        :param reference: List of layer weights the update started from.
+        :type reference: `list`
+        :return: Encoded update.
+        :rtype: `dict`
+        """
+        if self.scheme == 'none':
+            return {'scheme': self.scheme, 'layers': weights}
+
+        deltas = [np.asarray(w, dtype=np.float32) - np.asarray(r, dtype=np.float32) for w, r in zip(weights, reference)]
+
+        if self.scheme == 'delta':
+            layers = deltas
+
+        elif self.scheme == 'fp16':
+            layers = [delta.astype(np.float16) for delta in deltas]
+
+        elif self.scheme == 'int8':
+            layers = [self.quantize(delta) for delta in deltas]
+
+        else:
+            if self.residual is None:
+                self.residual = [np.zeros_like(delta) for delta in deltas]
+
+            layers = [self.sparsify(delta, residual) for delta, residual in zip(deltas, self.residual)]
+
+        return {'scheme': self.scheme, 'layers': layers}
+
+    @staticmethod
+    def quantize(delta):
+        """
+        Quantize a layer delta to int8 with a per-tensor scale.
+        """
+        peak = float(np.max(np.abs(delta))) if delta.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+
+        return {'scale': scale, 'values': np.round(delta / scale).astype(np.int8)}
+
+    def sparsify(self, delta, residual):
+        """
+        Keep the largest coordinates of a layer delta (plus its residual), updating the residual in place.
+        """
+        residual += delta
+        flat = residual.reshape(-1)
+        k = min(flat.size, max(1, int(self.ratio * flat.size)))
+        indices = np.argpartition(np.abs(flat), flat.size - k)[flat.size - k:]
+        values = flat[indices].copy()
+        flat[indices] = 0
+
+        return {'indices': indices.astype(np.int32), 'values': values, 'shape': list(delta.shape)}
+
+
+def decode(update, reference):
+    """
+    Decode an encoded update back into full layer weights.
+
+    :param update: Encoded update, as returned by :meth:`Compressor.encode`.
+    :type update: `dict`
+    :param reference: List of layer weights the update started from.
+    :type reference: `list`
+    :return: List of updated layer weights.
+    :rtype: `list`
+    """
+    if update['scheme'] == 'none':
+        return update['layers']
+
+    reference = [np.asarray(base) for base in reference]
+    deltas = densify(update, [base.shape for base in reference])
+
+    return [(base + delta.reshape(base.shape)).astype(base.dtype) for base, delta in zip(reference, deltas)]
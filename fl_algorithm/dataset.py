@@ -0,0 +1,122 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import os
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Directory of the cached dataset, shared by all the processes of the host
+DATA_DIR = os.environ.get('MUSKETEER_DATA', os.path.join(os.path.expanduser('~'), '.musketeer', 'mnist'))
+ARRAYS = ['x_train', 'y_train', 'x_test', 'y_test']
+# Number of samples of the MNIST train set, which the participants share out in shards
+TRAIN_SAMPLES = 60000
+
+
+def cache_path(directory, name, seed):
+    """
+    Path of a cached array.
+    """
+    return os.path.join(directory, '%s_%d.npy' % (name, seed))
+
+
+def prepare(directory=DATA_DIR, seed=0):
+    """
+    Convert MNIST once into .npy files, shuffled with the given seed, so that shards are contiguous slices.
+    Concurrent callers wait for the first one to finish the conversion.
+
+    :param directory: Directory of the cache.
+    :type directory: `str`
+    :param seed: Seed of the shuffling.
+    :type seed: `int`
+    """
+    paths = [cache_path(directory, name, seed) for name in ARRAYS]
+
+    if all(os.path.exists(path) for path in paths):
+        return
+
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, '.lock'), 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        if all(os.path.exists(path) for path in paths):
+            return
+
+        from keras.datasets import mnist
+        (x_train, y_train), (x_test, y_test) = mnist.load_data()
+
+        random = np.random.RandomState(seed)
+        train = random.permutation(len(y_train))
+        test = random.permutation(len(y_test))
+
+        for path, array in zip(paths, [x_train[train], y_train[train], x_test[test], y_test[test]]):
+            # Write then rename, so that a reader never sees a partial file
+            temporary = '%s.%d.tmp' % (path, os.getpid())
+            with open(temporary, 'wb') as output:
+                np.save(output, array)
+            os.replace(temporary, path)
+
+
+def load_shard(train, size, shard=0, directory=DATA_DIR, seed=0):
+    """
+    Map a shard of the cached dataset. Shards with different numbers do not overlap.
+    Throws: ValueError if the dataset has no such shard.
+
+    :param train: Load train or test data.
+    :type train: `bool`
+    :param size: Number of samples of the shard.
+    :type size: `int`
+    :param shard: Number of the shard.
+    :type shard: `int`
+    :param directory: Directory of the cache.
+    :type directory: `str`
+    :param seed: Seed of the shuffling.
+    :type seed: `int`
+    :return: Read-only, memory-mapped features and labels of the shard.
+    :rtype: `tuple`
+    """
+    prepare(directory, seed)
+
+    split = 'train' if train else 'test'
+    x = np.load(cache_path(directory, 'x_' + split, seed), mmap_mode='r')
+    y = np.load(cache_path(directory, 'y_' + split, seed), mmap_mode='r')
+
+    shards = len(y) // size
+    if shards == 0:
+        raise ValueError('Shard of %d samples larger than the %s set (%d samples)' % (size, split, len(y)))
+
+    if not 0 <= shard < shards:
+        raise ValueError('No shard %d of %d samples in the %s set, which has %d shards' % (shard, size, split, shards))
+
+    start = shard * size
+
+    return x[start:start + size], y[start:start + size]
@@ -0,0 +1,146 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import numpy as np
+
+from comm.serializer import padding
+
+
+class ModelState:
+    """
+    This class holds the weights of a model in one flat byte buffer, described by a manifest of the shape,
+    type and offset of each layer. The layers are views over the buffer, so a model state is exchanged as a
+    single array, and rebuilt from a received buffer without copying it.
+    """
+
+    def __init__(self, manifest, buffer=None):
+        """
+        Create a :class:`ModelState` instance over buffer, or over a new (uninitialized) buffer.
+
+        :param manifest: Shape, type and offset of each layer, see :meth:`describe`.
+        :type manifest: `list`
+        :param buffer: Flat buffer of the weights.
+        :type buffer: `np.ndarray`
+        """
+        self.manifest = manifest
+        size = max([layer['offset'] + int(np.prod(layer['shape'])) * np.dtype(layer['dtype']).itemsize
+                    for layer in manifest], default=0)
+
+        if buffer is None:
+            buffer = np.empty(size, dtype=np.uint8)
+
+        self.buffer = np.asarray(buffer).reshape(-1).view(np.uint8)
+
+        if self.buffer.size < size:
+            raise ValueError('Model state buffer has %d bytes, expected %d' % (self.buffer.size, size))
+
+        self.layers = [self.buffer[layer['offset']:layer['offset'] + int(np.prod(layer['shape'])) *
+                                   np.dtype(layer['dtype']).itemsize].view(layer['dtype']).reshape(layer['shape'])
+                       for layer in manifest]
+
+    @staticmethod
+    def describe(layers):
+        """
+        Build the manifest of a list of layers, each one aligned within the buffer.
+
+        :param layers: List of layer weights.
+        :type layers: `list`
+        :return: Manifest of the layers.
+        :rtype: `list`
+        """
+        manifest = []
+        offset = 0
+
+        for layer in layers:
+            layer = np.asarray(layer)
+            offset += padding(offset)
+            manifest.append({'shape': list(layer.shape), 'dtype': layer.dtype.str, 'offset': offset})
+            offset += layer.nbytes
+
+        return manifest
+
+    @classmethod
+    def from_layers(cls, layers, manifest=None):
+        """
+        Copy a list of layers into a new model state.
+
+        :param layers: List of layer weights.
+        :type layers: `list`
+        :param manifest: Manifest of the layers, if already known.
+        :type manifest: `list`
+        :return: The model state.
+        :rtype: :class:`ModelState`
+        """
+        state = cls(manifest or cls.describe(layers))
+        state.assign(layers)
+
+        return state
+
+    @classmethod
+    def from_message(cls, content):
+        """
+        Rebuild the model state of a message, without copying its buffer. A message holding a plain list of
+        layers under `weights` is copied into a new model state.
+
+        :param content: Message holding the `weights` buffer and their `manifest`.
+        :type content: `dict`
+        :return: The model state.
+        :rtype: :class:`ModelState`
+        """
+        if 'manifest' not in content:
+            return cls.from_layers(content['weights'])
+
+        return cls(content['manifest'], content['weights'])
+
+    def to_message(self, **tags):
+        """
+        Return a message holding the buffer and manifest of the model state, along with tags.
+
+        :return: The message.
+        :rtype: `dict`
+        """
+        return dict(tags, weights=self.buffer, manifest=self.manifest)
+
+    def like(self):
+        """
+        Return a new model state with the same manifest, for the next weights of the model.
+
+        :return: The model state, uninitialized.
+        :rtype: :class:`ModelState`
+        """
+        return ModelState(self.manifest)
+
+    def assign(self, layers):
+        """
+        Copy a list of layers into the model state, in place.
+
+        :param layers: List of layer weights, with the shapes of the manifest.
+        :type layers: `list`
+        """
+        if len(layers) != len(self.layers):
+            raise ValueError('Model has %d layers, expected %d' % (len(layers), len(self.layers)))
+
+        for target, layer in zip(self.layers, layers):
+            np.copyto(target, np.asarray(layer).reshape(target.shape), casting='unsafe')
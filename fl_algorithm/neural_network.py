@@ -26,6 +26,7 @@ Author: Tran Ngoc Minh (M.N.Tran@ibm.com).
  limitations under the License.
 """
 import os
+import time
 import logging
 
 import numpy as np
@@ -33,10 +34,19 @@ from keras.utils import to_categorical
 from keras import losses, optimizers
 from keras.models import model_from_json, Sequential
 from keras.layers import Conv2D, MaxPooling2D, Dense, Dropout, Flatten
-from keras.datasets import mnist
 
 import pycloudmessenger.ffl.abstractions as fflapi
 
+from comm.metrics import METRICS
+
+from fl_algorithm import dataset
+from fl_algorithm import compression
+from fl_algorithm.aggregation import StreamingAverage, RobustAverage, RULES
+from fl_algorithm.rounds import RoundPolicy
+from fl_algorithm.checkpoint import Checkpointer
+from fl_algorithm.model_state import ModelState
+from fl_algorithm.pipeline import Pipeline
+
 
 # Set up logger
 logging.basicConfig(
@@ -72,27 +82,53 @@ class BasicParticipant:
         self.round = task_definition['round']
         self.training_size = task_definition['training_size']
         self.test_size = task_definition['test_size']
+        self.seed = task_definition.get('seed', 0)
+        self.compression = task_definition.get('compression', 'none')
+        self.compression_ratio = task_definition.get('compression_ratio', 0.01)
         self.comms = comms
         self.timeout = 600
+        # Per-round timings (in seconds) and metrics
+        self.timings = []
+        # Labels of the measurements recorded by this process
+        self.labels = {'role': type(self).__name__.lower(), 'user': getattr(comms, 'user', None)}
 
-    def load_data(self, train=True):
+    def timer(self, name, round_id):
         """
-        Load data to be used for training/test.
+        Time a step of a round, recorded as the measurement name.
 
-        :param train: Load train or test data.
-        :type train: `bool`
+        :param name: name of the measurement, e.g. `fit_seconds`.
+        :type name: `str`
+        :param round_id: current round.
+        :type round_id: `int`
         """
-        (x_train, y_train), (x_test, y_test) = mnist.load_data()
+        return METRICS.timer(name, round=round_id, **self.labels)
 
-        if train:
-            indices = np.random.choice(np.shape(y_train)[0], self.training_size)
-            x, y = x_train, y_train
+    def compile_model(self, model):
+        """
+        Compile a model for training and evaluation.
 
-        else:
-            indices = np.random.choice(np.shape(y_test)[0], self.test_size)
-            x, y = x_test, y_test
+        :param model: The model.
+        :type model: :class:`keras.models.Model`
+        :return: The compiled model.
+        :rtype: :class:`keras.models.Model`
+        """
+        model.compile(loss=losses.categorical_crossentropy,
+                      optimizer=optimizers.Adam(lr=self.learning_rate),
+                      metrics=['accuracy'])
+
+        return model
 
-        x, y = x[indices], y[indices]
+    def load_data(self, train=True, shard=0):
+        """
+        Load data to be used for training/test, from a shard of the cached dataset.
+
+        :param train: Load train or test data.
+        :type train: `bool`
+        :param shard: Number of the shard.
+        :type shard: `int`
+        """
+        size = self.training_size if train else self.test_size
+        x, y = dataset.load_shard(train, size, shard, seed=self.seed)
 
         return x.reshape(x.shape[0], 28, 28, 1), to_categorical(y, 10)
 
@@ -102,7 +138,7 @@ class Aggregator(BasicParticipant):
     This class implements the functionality of the aggregator.
     """
 
-    def __init__(self, task_definition, comms):
+    def __init__(self, task_definition, comms, checkpoint_dir=None, checkpoint_every=1, resume=False):
         """
         Create a :class:`Aggregator` instance.
 
@@ -110,24 +146,57 @@ class Aggregator(BasicParticipant):
         :type task_definition: `dict`
         :param comms: A communication interface that enables communication between the aggregator and participants.
         :type comms: :class:`pycloudmessenger.ffl.fflapi.Aggregator`
+        :param checkpoint_dir: Directory of the checkpoints of the global model, if any.
+        :type checkpoint_dir: `str`
+        :param checkpoint_every: Number of rounds between checkpoints.
+        :type checkpoint_every: `int`
+        :param resume: Whether to resume training from the latest checkpoint, if any.
+        :type resume: `bool`
         """
         super(Aggregator, self).__init__(task_definition, comms)
         self.feature, self.label = self.load_data(train=False)
+        self.policy = RoundPolicy(task_definition)
+        # Rule aggregating the updates of a round, see aggregation.RULES
+        self.aggregation = task_definition.get('aggregation', 'mean')
+        self.trim_ratio = task_definition.get('trim_ratio', 0.1)
+        self.byzantine = task_definition.get('byzantine', 0)
+        # Whether the platform sums up the updates of a round itself, and sends the aggregator their mean
+        self.server_aggregation = task_definition.get('server_aggregation', False)
+        # Number of groups of a tree task, whose sub-aggregators are the participants of the aggregator
+        self.groups = task_definition.get('groups', 0)
+        self.checkpoint = Checkpointer(checkpoint_dir, checkpoint_every) if checkpoint_dir else None
+        self.resume = resume
+        # Whether the global model of a round is evaluated in the background, on a replica of the model,
+        # while the next round goes on
+        self.pipeline = task_definition.get('pipeline', True)
+        self.evaluator = None
+        self.replica = None
+
+        if self.aggregation not in RULES:
+            raise ValueError('Unknown aggregation rule %s, expected one of %s' % (self.aggregation, RULES))
+
+        if self.server_aggregation and (self.aggregation != 'mean' or self.policy.is_async):
+            raise ValueError('Server aggregation needs the mean aggregation rule and synchronous rounds')
+
+        if self.groups and (self.aggregation != 'mean' or self.policy.policy != 'sync'):
+            raise ValueError('A tree of aggregators needs the mean aggregation rule and sync rounds')
 
     def wait_for_workers_to_join(self):
         """
-        Wait for workers to join until quorum is met.
+        Wait for workers to join until quorum is met, or until all the sub-aggregators joined in a tree task.
         """
+        quorum = self.groups or self.quorum
+
         with self.comms:
             results = self.comms.get_participants()
         LOGGER.debug(results)
 
         if results:
-            if len(results) == self.quorum:
+            if len(results) == quorum:
                 LOGGER.debug('Workers have already joined')
                 return results
 
-        LOGGER.info('Waiting on workers to join (%d of %d present)', len(results), self.quorum)
+        LOGGER.info('Waiting on workers to join (%d of %d present)', len(results), quorum)
 
         ready = False
         while not ready:
@@ -140,33 +209,341 @@ class Aggregator(BasicParticipant):
 
             LOGGER.debug(response)
 
-            if len(results) == self.quorum:
+            if len(results) == quorum:
                 ready = True
 
         return results
 
-    def wait_for_workers_to_complete(self):
+    def wait_for_workers_to_complete(self, average, reference, round_id=None, participants=None):
         """
-        Wait for workers to complete assignment.
+        Wait for workers to complete assignment, folding each model update into the average as soon as
+        it arrives so that aggregation overlaps with waiting for slower participants. The round policy
+        decides how many updates are enough, and whether to stop waiting at a deadline.
+
+        :param average: Aggregate of the model updates of the current round.
+        :type average: :class:`aggregation.StreamingAverage` or :class:`aggregation.RobustAverage`
+        :param reference: Global weights sent at the start of the round, which updates are relative to.
+        :type reference: `list`
+        :param round_id: Current round; updates from other rounds are dropped.
+        :type round_id: `int`
+        :param participants: Set to collect the participants whose updates were aggregated in.
+        :type participants: `set`
+        :return: Number of model updates received.
+        :rtype: `int`
         """
-        results = []
-        complete = False
-        while not complete:
+        target = self.policy.target()
+        deadline = self.policy.expires(time.time())
+        # A participant counts once per round, even if it sends its update again (e.g. after a resume)
+        participants = set() if participants is None else participants
+        # Number of update messages, fewer than the updates they stand for with sub- or server aggregation
+        received = 0
+
+        while average.count < target:
+            timeout = self.timeout
+
+            # Past the deadline, aggregate what has arrived, but never less than one update
+            if deadline is not None and average.count > 0:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    LOGGER.info('Round deadline reached with %d of %d updates', average.count, target)
+                    break
+
             try:
-                response = self.comms.receive(self.timeout)
-                LOGGER.info('Received model update from participant')
+                response = self.comms.receive(timeout)
 
             except Exception as err:
+                if deadline is not None and average.count > 0 and time.time() >= deadline:
+                    continue
+
                 LOGGER.error(err)
                 raise err
 
             if fflapi.Notification.is_participant_updated(response.notification):
-                results.append(response.content)
+                if not self.policy.accepts(response.content.get('round'), round_id):
+                    LOGGER.info('Dropped late model update from round %s', response.content.get('round'))
+                    continue
 
-            if len(results) == self.quorum:
-                complete = True
+                # An update aggregated by the platform stands for the updates of all its participants
+                senders = response.content.get('participants') or [response.notification['participant']]
 
-        return results
+                if participants.intersection(senders):
+                    LOGGER.info('Dropped repeated model update from participant')
+                    continue
+
+                participants.update(senders)
+                received += 1
+                LOGGER.info('Received model update from %d participant(s)', len(senders))
+                with self.timer('aggregation_seconds', round_id):
+                    weights = compression.decode(response.content['update'], reference)
+                    average.add(weights, response.content.get('samples', 1), len(senders))
+
+        METRICS.record('received_updates', received, round=round_id, **self.labels)
+
+        return average.count
+
+    def send_architecture(self, architecture, shard=0, stride=1):
+        """
+        Send the model architecture to each participant, with the number of its training data shard. The
+        participants are numbered in the order they joined, so that no two of them train on the same shard;
+        the participants of a sub-aggregator take every stride-th shard from its own.
+
+        :param architecture: The model architecture, in json.
+        :type architecture: `str`
+        :param shard: Shard of the first participant.
+        :type shard: `int`
+        :param stride: Distance between the shards of two consecutive participants.
+        :type stride: `int`
+        """
+        with self.comms:
+            participants = self.comms.get_participants()
+
+            for index, participant in enumerate(participants):
+                self.comms.send({'model': architecture, 'shard': shard + index * stride,
+                                 'stride': stride * len(participants)}, participant)
+
+    def evaluate_round(self, model, weights, optimizer, round_id, start, end=None):
+        """
+        Evaluate the global model of a round, record the round timings, and checkpoint the model.
+
+        :param model: The model to evaluate the weights with, the global model or a replica of it.
+        :type model: :class:`keras.models.Model`
+        :param weights: The weights of the global model at the end of the round.
+        :type weights: :class:`model_state.ModelState`
+        :param optimizer: The optimizer weights of the global model at the end of the round, if a checkpoint is due.
+        :type optimizer: `list`
+        :param round_id: The round.
+        :type round_id: `int`
+        :param start: Start time of the round.
+        :type start: `float`
+        :param end: End time of the round, by default the end of the evaluation.
+        :type end: `float`
+        """
+        with self.timer('evaluation_seconds', round_id):
+            model.set_weights(weights.layers)
+            [loss, accuracy] = model.evaluate(self.feature, self.label, verbose=0)
+
+        end = time.time() if end is None else end
+        METRICS.record('round_seconds', end - start, round=round_id, **self.labels)
+        LOGGER.info("Round %d, loss %f, val accuracy %f, time %f" % (round_id, loss, accuracy, end - start))
+        self.timings.append({'round': round_id, 'time': end - start, 'loss': float(loss), 'accuracy': float(accuracy)})
+        self.save_checkpoint(weights, optimizer, round_id)
+
+    def end_round(self, model, weights, round_id, start):
+        """
+        Evaluate and checkpoint the global model at the end of a round: in the background on the replica of
+        the model when pipelined, so that the round ends once aggregated, or else right away.
+
+        :param model: The global model.
+        :type model: :class:`keras.models.Model`
+        :param weights: The weights of the global model at the end of the round.
+        :type weights: :class:`model_state.ModelState`
+        :param round_id: The round.
+        :type round_id: `int`
+        :param start: Start time of the round.
+        :type start: `float`
+        """
+        # Taken from the global model now, as the replica evaluating the round in the background has its own
+        optimizer = model.optimizer.get_weights() if self.is_checkpoint_due(round_id) else None
+
+        if self.evaluator is None:
+            self.evaluate_round(model, weights, optimizer, round_id, start)
+        else:
+            self.evaluator.submit(self.evaluate_round, self.replica, weights, optimizer, round_id, start,
+                                  time.time())
+
+    def create_average(self, template):
+        """
+        Create the aggregate of the updates of a round: a streaming weighted mean, or the updates stacked
+        for a robust aggregation rule.
+
+        :param template: List of layer weights giving the shape and type of the model.
+        :type template: `list`
+        :return: The aggregate, empty.
+        :rtype: :class:`aggregation.StreamingAverage` or :class:`aggregation.RobustAverage`
+        """
+        if self.aggregation == 'mean':
+            return StreamingAverage(template)
+
+        return RobustAverage(template, self.aggregation, self.trim_ratio, self.byzantine, capacity=self.quorum)
+
+    def is_checkpoint_due(self, round_id):
+        """
+        Whether the global model is to be checkpointed at the end of a round.
+
+        :param round_id: The round.
+        :type round_id: `int`
+        :rtype: `bool`
+        """
+        return self.checkpoint is not None and self.checkpoint.is_due(round_id, self.round)
+
+    def save_checkpoint(self, weights, optimizer, round_id):
+        """
+        Checkpoint the global model at the end of a round, if one is due.
+
+        :param weights: The weights of the global model.
+        :type weights: :class:`model_state.ModelState`
+        :param optimizer: The optimizer weights of the global model.
+        :type optimizer: `list`
+        :param round_id: The round just completed.
+        :type round_id: `int`
+        """
+        if not self.is_checkpoint_due(round_id):
+            return
+
+        self.checkpoint.save({'round': round_id + 1, 'weights': weights.layers, 'optimizer': optimizer,
+                              'timings': list(self.timings)})
+
+    def restore_checkpoint(self, model):
+        """
+        Restore the global model, optimizer state and timings of the latest checkpoint, when resuming.
+
+        :param model: The global model.
+        :type model: :class:`keras.models.Model`
+        :return: The round to resume from, 0 if there is nothing to resume.
+        :rtype: `int`
+        """
+        state = self.checkpoint.load() if self.resume and self.checkpoint is not None else None
+
+        if state is None:
+            return 0
+
+        model.set_weights(state['weights'])
+        if state['optimizer']:
+            model.optimizer.set_weights(state['optimizer'])
+        self.timings = list(state['timings'])
+
+        LOGGER.info('Resuming from the checkpoint of round %d' % (state['round'] - 1))
+
+        return state['round']
+
+    def train_synchronously(self, model, first_round=0):
+        """
+        Run the training rounds: broadcast the global model, aggregate the updates selected by the round policy.
+        """
+        weights = ModelState.from_layers(model.get_weights())
+        average = self.create_average(weights.layers)
+        start = time.time()
+
+        if first_round < self.round:
+            self.broadcast(weights, first_round)
+
+        for iter in range(first_round, self.round):
+            LOGGER.info("Round " + str(iter))
+
+            with self.comms:
+                average.reset()
+                self.wait_for_workers_to_complete(average, weights.layers, iter)
+                LOGGER.info('Received model updates from participants, start updating the central model')
+
+            # The average goes into a new model state, as the messages sent may still refer to the previous one
+            with self.timer('aggregation_seconds', iter):
+                weights = weights.like()
+                average.result(weights.layers)
+                model.set_weights(weights.layers)
+
+            # The next round starts before this one is evaluated
+            if iter + 1 < self.round:
+                self.broadcast(weights, iter + 1)
+
+            self.end_round(model, weights, iter, start)
+            start = time.time()
+
+    def broadcast(self, weights, round_id):
+        """
+        Start a round: send the global model to the participants.
+
+        :param weights: The weights of the global model.
+        :type weights: :class:`model_state.ModelState`
+        :param round_id: The round.
+        :type round_id: `int`
+        """
+        LOGGER.info('Asking participants to update model weights, do local training and send back model update')
+        tags = {'round': round_id, 'max_staleness': self.policy.staleness()}
+
+        # In a tree task, the platform may aggregate the updates of each group, but not those of sub-aggregators
+        if self.server_aggregation and not self.groups:
+            tags['aggregate'] = self.policy.target()
+            tags['deadline'] = self.policy.deadline if self.policy.policy == 'deadline' else None
+
+        with self.comms:
+            self.comms.send(weights.to_message(**tags))
+
+    def train_asynchronously(self, model, first_round=0):
+        """
+        Apply staleness-weighted model updates as they arrive (FedAsync, or FedBuff with a buffer of several
+        updates) and send the new global model back to the participants whose updates were applied.
+        Each application of the buffered updates counts as a round.
+        """
+        version = first_round
+        versions = {version: ModelState.from_layers(model.get_weights())}
+        deltas = self.create_average(versions[version].layers)
+        samples = 0
+        idle = []
+        start = time.time()
+
+        def dispatch(participant):
+            self.comms.send(versions[version].to_message(round=version, max_staleness=self.policy.staleness()),
+                            participant=participant)
+            assigned[participant] = version
+
+        with self.comms:
+            # Version of the global model each participant is training on
+            assigned = {participant: version for participant in self.comms.get_participants()}
+            self.comms.send(versions[version].to_message(round=version, max_staleness=self.policy.staleness()))
+
+            while version < self.round:
+                response = self.comms.receive(self.timeout)
+
+                if not fflapi.Notification.is_participant_updated(response.notification):
+                    continue
+
+                participant = response.notification['participant']
+                update_round = response.content.get('round')
+
+                if update_round not in versions or not self.policy.accepts(update_round, version):
+                    LOGGER.info('Dropped stale model update from round %s', update_round)
+                    dispatch(participant)
+                    continue
+
+                reference = versions[update_round].layers
+                update_samples = response.content.get('samples', 1)
+
+                with self.timer('aggregation_seconds', version):
+                    weights = compression.decode(response.content['update'], reference)
+                    deltas.add([np.asarray(w) - r for w, r in zip(weights, reference)],
+                               update_samples * self.policy.staleness_weight(version - update_round))
+
+                samples += update_samples
+                idle.append(participant)
+
+                if deltas.count < self.policy.buffer_size:
+                    continue
+
+                # The staleness weights scale the applied step down, on top of weighting the updates
+                scale = self.policy.server_learning_rate * deltas.total_weight / samples
+                current = versions[version]
+
+                with self.timer('aggregation_seconds', version):
+                    versions[version + 1] = current.like()
+                    for c, d, n in zip(current.layers, deltas.result(), versions[version + 1].layers):
+                        np.add(c, scale * d, out=n, casting='unsafe')
+                    model.set_weights(versions[version + 1].layers)
+
+                version += 1
+
+                for participant in idle:
+                    dispatch(participant)
+
+                self.end_round(model, versions[version], version - 1, start)
+                start = time.time()
+
+                idle = []
+                deltas.reset()
+                samples = 0
+
+                # Forget the versions no participant is training on any more
+                for old in [v for v in versions if v != version and v not in assigned.values()]:
+                    del versions[old]
 
     def start(self):
         """
@@ -187,38 +564,31 @@ class Aggregator(BasicParticipant):
         model.add(Dense(128, activation='relu'))
         model.add(Dropout(0.5))
         model.add(Dense(10, activation='softmax'))
-        model.compile(loss=losses.categorical_crossentropy,
-                      optimizer=optimizers.Adam(lr=self.learning_rate),
-                      metrics=['accuracy'])
+        self.compile_model(model)
 
-        LOGGER.info('Distributing neural network architecture to participants')
+        first_round = self.restore_checkpoint(model)
 
-        with self.comms:
-            self.comms.send({'model': model.to_json()})
+        if self.pipeline:
+            self.replica = self.compile_model(model_from_json(model.to_json()))
+            self.evaluator = Pipeline('evaluator')
 
-        import time
-        for iter in range(self.round):
-            start = time.time()
-
-            LOGGER.info("Round " + str(iter))
-            LOGGER.info('Asking participants to update model weights, do local training and send back model update')
-
-            with self.comms:
-                self.comms.send({'weights': model.get_weights()})
-                weight_updates = self.wait_for_workers_to_complete()
-                LOGGER.info('Received model updates from all participants, start updating the central model')
-
-            list_updates = []
-            for weight_update in weight_updates:
-                weight = weight_update['updated_weights']
-                weight = np.array([np.array(w) for w in weight])
-                list_updates.append(weight)
+        # On resume, participants get the architecture again, and then the global model of the checkpoint
+        LOGGER.info('Distributing neural network architecture to participants')
 
-            model.set_weights(np.mean(np.array(list_updates), axis=0))
+        self.send_architecture(model.to_json())
 
-            [loss, accuracy] = model.evaluate(self.feature, self.label, verbose=0)
-            end = time.time()
-            LOGGER.info("Round %d, loss %f, val accuracy %f, time %f" % (iter, loss, accuracy, end - start))
+        try:
+            if self.policy.is_async:
+                self.train_asynchronously(model, first_round)
+            else:
+                self.train_synchronously(model, first_round)
+        finally:
+            if self.evaluator is not None:
+                self.evaluator.close()
+                self.evaluator = None
+
+            if self.checkpoint is not None:
+                self.checkpoint.close()
 
         LOGGER.info('Finished %d rounds, done' % self.round)
         [_, accuracy] = model.evaluate(self.feature, self.label)
@@ -226,7 +596,86 @@ class Aggregator(BasicParticipant):
 
         LOGGER.info('END')
 
-        return {'weights': model.get_weights()}
+        return ModelState.from_layers(model.get_weights()).to_message(final=True)
+
+
+class SubAggregator(Aggregator):
+    """
+    This class implements the functionality of the sub-aggregator of a group, in a tree task: it relays the
+    global model to the participants of its group, and sends the aggregator the weighted average of their
+    updates as a single update.
+    """
+
+    def __init__(self, task_definition, comms, upstream, group):
+        """
+        Create a :class:`SubAggregator` instance.
+
+        :param task_definition: A specification of the ML task to be performed.
+        :type task_definition: `dict`
+        :param comms: A communication interface with the participants of the group, as their aggregator.
+        :type comms: :class:`pycloudmessenger.ffl.fflapi.Aggregator`
+        :param upstream: A communication interface with the aggregator, as one of its participants.
+        :type upstream: :class:`pycloudmessenger.ffl.fflapi.Participant`
+        :param group: Number of the group.
+        :type group: `int`
+        """
+        # The participants are spread evenly over the groups, in the order they joined
+        groups = task_definition['groups']
+        quorum = task_definition['quorum'] // groups + (group < task_definition['quorum'] % groups)
+
+        super(SubAggregator, self).__init__(dict(task_definition, quorum=quorum, groups=0), comms)
+        self.upstream = upstream
+        self.group = group
+
+    def start(self):
+        """
+        Run the SubAggregator, until the aggregator sends the final model.
+        """
+        LOGGER.info('Waiting on quorum of group %d' % self.group)
+        self.wait_for_workers_to_join()
+        LOGGER.info('Quorum of workers found')
+
+        average = None
+
+        while True:
+            with self.upstream:
+                msg = self.upstream.receive(self.timeout)
+
+            if fflapi.Notification.is_aggregator_stopped(msg.notification) or msg.content.get('final', False):
+                LOGGER.info('Relaying the final model to the group')
+                with self.comms:
+                    self.comms.stop_task(msg.content)
+                break
+
+            # The model architecture, sent again by an aggregator resuming from a checkpoint
+            if 'model' in msg.content:
+                self.send_architecture(msg.content['model'], msg.content.get('shard', 0),
+                                       msg.content.get('stride', 1))
+                continue
+
+            round_id = msg.content.get('round')
+            weights = ModelState.from_message(msg.content)
+            self.broadcast(weights, round_id)
+
+            if average is None:
+                average = self.create_average(weights.layers)
+
+            participants = set()
+            with self.comms:
+                average.reset()
+                self.wait_for_workers_to_complete(average, weights.layers, round_id, participants)
+
+            with self.timer('aggregation_seconds', round_id):
+                partial = weights.like()
+                average.result(partial.layers)
+
+            LOGGER.info('Sending the update of group %d to the aggregator' % self.group)
+            with self.upstream:
+                self.upstream.send({'update': {'scheme': 'none', 'layers': partial.layers},
+                                    'samples': average.total_weight, 'round': round_id,
+                                    'participants': sorted(participants)})
+
+        LOGGER.info('END')
 
 
 class Participant(BasicParticipant):
@@ -234,7 +683,7 @@ class Participant(BasicParticipant):
     This class implements the functionality of the participant.
     """
 
-    def __init__(self, task_definition, comms):
+    def __init__(self, task_definition, comms, shard=None):
         """
         Create a :class:`Participant` instance.
 
@@ -242,9 +691,39 @@ class Participant(BasicParticipant):
         :type task_definition: `dict`
         :param comms: A communication interface that enables communication between the aggregator and participants.
         :type comms: :class:`pycloudmessenger.ffl.fflapi.Participant`
+        :param shard: Number of the training data shard, by default the one sent by the aggregator with the
+                      model architecture.
+        :type shard: `int`
         """
         super(Participant, self).__init__(task_definition, comms)
-        self.feature, self.label = self.load_data(train=True)
+
+        self.feature, self.label = self.load_data(train=True, shard=shard) if shard is not None else (None, None)
+        self.compressor = compression.Compressor(self.compression, self.compression_ratio)
+
+    def build_model(self, architecture):
+        """
+        Build and compile the model sent by the aggregator.
+
+        :param architecture: The model architecture, in json.
+        :type architecture: `str`
+        :return: The compiled model.
+        :rtype: :class:`keras.models.Model`
+        """
+        return self.compile_model(model_from_json(architecture))
+
+    def receive_architecture(self, content):
+        """
+        Build the model sent by the aggregator, and load the training data shard it assigned on first use.
+
+        :param content: The message of the aggregator, with the model architecture and the shard.
+        :type content: `dict`
+        :return: The compiled model.
+        :rtype: :class:`keras.models.Model`
+        """
+        if self.feature is None:
+            self.feature, self.label = self.load_data(train=True, shard=content.get('shard', 0))
+
+        return self.build_model(content['model'])
 
     def start(self):
         """
@@ -255,45 +734,57 @@ class Participant(BasicParticipant):
                 msg = self.comms.receive(self.timeout)
                 LOGGER.info("Received model architecture from the aggregator")
 
-            model = model_from_json(msg.content['model'])
-            model.compile(loss=losses.categorical_crossentropy,
-                          optimizer=optimizers.Adam(lr=self.learning_rate),
-                          metrics=['accuracy'])
+            model = self.receive_architecture(msg.content)
 
         except Exception as timeout:
             LOGGER.exception(timeout)
 
-        for iter in range(self.round):
+        # Train on every model received, until the aggregator sends the final model
+        iter = 0
+        while True:
             try:
+                start = time.time()
+
                 with self.comms:
                     msg = self.comms.receive(self.timeout)
 
-                LOGGER.info("Round " + str(iter))
+                if fflapi.Notification.is_aggregator_stopped(msg.notification) or msg.content.get('final', False):
+                    model.set_weights(ModelState.from_message(msg.content).layers)
+                    LOGGER.info('Received the final model from aggregator')
+                    break
+
+                # The architecture is sent again by an aggregator resuming from a checkpoint
+                if 'model' in msg.content:
+                    model = self.receive_architecture(msg.content)
+                    LOGGER.info('Received model architecture again from the resumed aggregator')
+                    continue
+
+                received = time.time()
+                round_id = msg.content.get('round', iter)
+                LOGGER.info("Round " + str(round_id))
                 LOGGER.info('Received model update from the aggregator, start to update local model and train locally')
 
-                weights = msg.content['weights']
+                # Views over the received buffer, shared by set_weights and the encoding of the update
+                weights = ModelState.from_message(msg.content).layers
                 model.set_weights(weights)
-                model.fit(self.feature, self.label, batch_size=self.batch_size, epochs=self.epoch)
-                updated_weights = model.get_weights()
+                with self.timer('fit_seconds', round_id):
+                    model.fit(self.feature, self.label, batch_size=self.batch_size, epochs=self.epoch)
+
+                with self.timer('compression_seconds', round_id):
+                    update = self.compressor.encode(model.get_weights(), weights)
+
+                trained = time.time()
 
                 LOGGER.info('Finished local training and send back model update to the aggregator')
                 with self.comms:
-                    self.comms.send({'updated_weights': updated_weights})
+                    self.comms.send({'update': update, 'samples': len(self.label), 'round': msg.content.get('round')})
+
+                self.timings.append({'round': round_id, 'wait': received - start, 'fit': trained - received,
+                                     'time': time.time() - start})
+                iter += 1
 
             except Exception as timeout:
                 LOGGER.exception(timeout)
+                break
 
-        LOGGER.info('Finished %d rounds, done.' % self.round)
-
-        try:
-            with self.comms:
-                response = self.comms.receive(self.timeout)
-
-            if fflapi.Notification.is_aggregator_stopped(response.notification):
-                weights = response.content['weights']
-                model.set_weights(weights)
-
-                LOGGER.info('Received the final model from aggregator')
-
-        except Exception as timeout:
-            LOGGER.exception(timeout)
+        LOGGER.info('Finished %d rounds, done.' % iter)
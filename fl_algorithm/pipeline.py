@@ -0,0 +1,79 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import queue
+import logging
+import threading
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Pipeline:
+    """
+    This class runs jobs in a background thread, one after the other in the order they are submitted, so that
+    the stage of a round they implement (e.g. evaluating the global model) overlaps with the next round.
+    """
+
+    def __init__(self, name='pipeline'):
+        """
+        Create a :class:`Pipeline` instance and start its thread.
+
+        :param name: Name of the thread.
+        :type name: `str`
+        """
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, function, *args):
+        """
+        Queue a call of function with args and return immediately.
+        """
+        self.jobs.put((function, args))
+
+    def run(self):
+        """
+        Run the queued jobs until closed. A failed job is logged, and the next ones run.
+        """
+        while True:
+            job = self.jobs.get()
+
+            if job is None:
+                return
+
+            function, args = job
+
+            try:
+                function(*args)
+            except Exception as err:
+                LOGGER.exception(err)
+
+    def close(self):
+        """
+        Wait for the queued jobs to complete, and stop the thread.
+        """
+        self.jobs.put(None)
+        self.thread.join()
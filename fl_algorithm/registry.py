@@ -0,0 +1,179 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+import importlib
+import threading
+
+try:
+    from importlib import metadata
+except ImportError:
+    # Python < 3.8: the importlib_metadata backport if installed, otherwise pkg_resources of setuptools
+    try:
+        import importlib_metadata as metadata
+    except ImportError:
+        metadata = None
+
+
+# Entry point group under which installed packages register algorithms, named as in task definitions
+ENTRY_POINT_GROUP = 'musketeer.algorithms'
+# Algorithms of this repository, by name, as 'module:attribute' targets imported on first use only
+ALGORITHMS = {'neural_network.Aggregator': 'fl_algorithm.neural_network:Aggregator',
+              'neural_network.Participant': 'fl_algorithm.neural_network:Participant',
+              'neural_network.SubAggregator': 'fl_algorithm.neural_network:SubAggregator'}
+
+
+def entry_points(group):
+    """
+    Return the entry points of installed packages in a group, on every supported Python version
+    (`metadata.entry_points(group=...)` needs Python 3.10).
+
+    :param group: Entry point group.
+    :type group: `str`
+    :return: List of (name, 'module:attribute' target) pairs.
+    :rtype: `list`
+    """
+    if metadata is None:
+        import pkg_resources
+
+        return [(entry_point.name, '%s:%s' % (entry_point.module_name, '.'.join(entry_point.attrs)))
+                for entry_point in pkg_resources.iter_entry_points(group)]
+
+    return [(entry_point.name, entry_point.value)
+            for distribution in metadata.distributions()
+            for entry_point in distribution.entry_points if entry_point.group == group]
+
+
+class Registry:
+    """
+    This class maps the algorithm names of task definitions (e.g. `neural_network.Aggregator`) to the classes
+    implementing them. Algorithms are registered as 'module:attribute' targets, and their module is only imported
+    when the algorithm is loaded, so that looking an algorithm up never pulls in the dependencies of the others.
+    """
+
+    def __init__(self, group=ENTRY_POINT_GROUP):
+        """
+        Create a :class:`Registry` instance.
+
+        :param group: Entry point group of the algorithms of installed packages, or None for none.
+        :type group: `str`
+        """
+        self.group = group
+        self.targets = {}
+        self.loaded = {}
+        self.scanned = group is None
+        self.lock = threading.Lock()
+
+    def register(self, name, target):
+        """
+        Register an algorithm, replacing any algorithm of the same name.
+
+        :param name: Name of the algorithm, as in task definitions.
+        :type name: `str`
+        :param target: The algorithm class, or its 'module:attribute' target.
+        :type target: `str` or `type`
+        """
+        with self.lock:
+            self.targets[name] = target
+            self.loaded.pop(name, None)
+
+    def scan(self):
+        """
+        Register the algorithms of the entry points of installed packages, once, without loading them.
+        Algorithms registered explicitly take precedence.
+        """
+        with self.lock:
+            if self.scanned:
+                return
+
+            self.scanned = True
+
+            for name, target in entry_points(self.group):
+                self.targets.setdefault(name, target)
+
+    def names(self):
+        """
+        Return the names of the registered algorithms.
+
+        :return: The sorted names.
+        :rtype: `list`
+        """
+        self.scan()
+
+        with self.lock:
+            return sorted(self.targets)
+
+    def load(self, name):
+        """
+        Return the class of an algorithm, importing its module on first use.
+        Throws: ValueError if there is no such algorithm.
+
+        :param name: Name of the algorithm, as in task definitions.
+        :type name: `str`
+        :return: The algorithm class.
+        :rtype: `type`
+        """
+        with self.lock:
+            if name in self.loaded:
+                return self.loaded[name]
+
+            target = self.targets.get(name)
+
+        # Installed packages are only scanned for an algorithm that is not registered already, e.g. built in
+        if target is None:
+            self.scan()
+
+            with self.lock:
+                target = self.targets.get(name)
+
+        if target is None:
+            raise ValueError('Unknown algorithm %s, expected one of %s' % (name, self.names()))
+
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(':')
+            target = getattr(importlib.import_module(module_name), attribute)
+
+        with self.lock:
+            self.loaded[name] = target
+
+        return target
+
+
+# Algorithms available to the aggregator and participants of this process
+REGISTRY = Registry()
+
+for name, target in ALGORITHMS.items():
+    REGISTRY.register(name, target)
+
+
+def load(name):
+    """
+    Return the class of an algorithm of the registry, see :meth:`Registry.load`.
+
+    :param name: Name of the algorithm, as in task definitions.
+    :type name: `str`
+    :return: The algorithm class.
+    :rtype: `type`
+    """
+    return REGISTRY.load(name)
@@ -0,0 +1,108 @@
+'''
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE
+UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by
+the European Union under the Horizon 2020 Program.
+The project started on 01/12/2018 and will be / was completed on 30/11/2021. Thus, in accordance
+with article 30.3 of the Multi-Beneficiary General Model Grant Agreement of the Program, the above
+limitations are in force until 30/11/2025.
+'''
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+# sync: wait for the quorum, first_k: aggregate the first round_k updates, deadline: aggregate the updates
+# received within round_deadline seconds, async: apply staleness-weighted updates as they arrive
+POLICIES = ['sync', 'first_k', 'deadline', 'async']
+
+
+class RoundPolicy:
+    """
+    This class implements the round policy selected by a task definition: when the updates of a round are
+    enough to aggregate, which updates are too late, and how much a stale update weighs.
+    """
+
+    def __init__(self, task_definition):
+        """
+        Create a :class:`RoundPolicy` instance.
+
+        :param task_definition: A specification of the ML task to be performed.
+        :type task_definition: `dict`
+        """
+        self.policy = task_definition.get('round_policy', 'sync')
+
+        if self.policy not in POLICIES:
+            raise ValueError('Unknown round policy %s, expected one of %s' % (self.policy, POLICIES))
+
+        self.quorum = task_definition['quorum']
+        self.k = task_definition.get('round_k', self.quorum)
+        self.deadline = task_definition.get('round_deadline', 60)
+        # Asynchronous mode: updates are buffered until buffer_size of them can be applied together,
+        # and updates more than max_staleness versions behind (if set) are dropped
+        self.buffer_size = task_definition.get('buffer_size', 1)
+        self.max_staleness = task_definition.get('max_staleness')
+        self.staleness_exponent = task_definition.get('staleness_exponent', 0.5)
+        self.server_learning_rate = task_definition.get('server_learning_rate', 1.0)
+
+    @property
+    def is_async(self):
+        """
+        Whether updates are applied asynchronously rather than in rounds.
+        """
+        return self.policy == 'async'
+
+    def target(self):
+        """
+        Number of updates after which a synchronous round is aggregated.
+        """
+        if self.policy == 'first_k':
+            return min(self.k, self.quorum)
+
+        return self.quorum
+
+    def expires(self, start):
+        """
+        Time after which a round started at start is aggregated with the updates received so far, if any.
+        """
+        if self.policy == 'deadline':
+            return start + self.deadline
+
+        return None
+
+    def staleness(self):
+        """
+        Maximum staleness of the updates accepted, as sent along with the model to the platform.
+        """
+        return self.max_staleness if self.is_async else 0
+
+    def accepts(self, update_round, current_round):
+        """
+        Whether an update computed from the model of update_round is accepted at current_round.
+        Untagged updates are always accepted.
+        """
+        if update_round is None or current_round is None:
+            return True
+
+        if self.is_async:
+            return update_round <= current_round and \
+                (self.max_staleness is None or current_round - update_round <= self.max_staleness)
+
+        return update_round == current_round
+
+    def staleness_weight(self, staleness):
+        """
+        Polynomial discount of an update computed from a model staleness versions old.
+        """
+        return (1 + staleness) ** -self.staleness_exponent
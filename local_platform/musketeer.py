@@ -1,26 +1,160 @@
+import json
 import logging
+import os
+import sys
+import zlib
 
 from flask import Flask, make_response, request, jsonify
 
-from pycloudmessenger.ffl.abstractions import Notification
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from comm.broker import Broker, BlobStore, BlobRef, BLOB_MEMORY
+from comm.journal import Journal, SQLiteJournal, SYNCHRONOUS
+from comm.metrics import METRICS
+from comm.updates import densify
 
 
 HOST = '127.0.0.1'
 PORT = 5000
+BAD_REQUEST = 400
 NOT_FOUND = 404
 OK = 200
+PARTIAL_CONTENT = 206
+NOT_MODIFIED = 304
 CONFLICT = 409
+LONG_POLL_TIMEOUT = 30
+# Binary messages are stored and forwarded as opaque bytes
+CONTENT_TYPE = 'application/octet-stream'
+NOTIFICATION_HEADER = 'X-Notification'
+# Header carrying the number of a delivered message, which the receiver acknowledges with its next receive
+MESSAGE_ID_HEADER = 'X-Message-Id'
+# Headers describing a message stored as a blob, to be downloaded in chunks, and the checksum of a chunk
+BLOB_HEADER = 'X-Blob'
+CHECKSUM_HEADER = 'X-Checksum'
+# Blobs never change once stored under their digest
+BLOB_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+JSON_LINES_CONTENT_TYPE = 'application/x-ndjson'
 
 app = Flask(__name__)
 log = logging.getLogger('werkzeug')
 log.disabled = True
 app.logger.disabled = True
 
-definition = {}
-aggregator_queue = []
-participant_queue = {}
-participant_list = []
-task_name = []
+
+
+def create_broker():
+    """
+    Create the broker of the platform. Tasks and queues live in memory, unless MUSKETEER_DB names a SQLite
+    database to record them in, from which they are recovered on restart (with MUSKETEER_DB_SYNC as its
+    synchronous mode). Large messages are kept in memory up to MUSKETEER_BLOB_MEMORY bytes, beyond which the
+    ones still queued are spilled to the MUSKETEER_BLOB_DIR directory, if set; with a database, the queued
+    ones are always written there (by default to a directory next to the database).
+    The broker decodes the binary model updates of the rounds which the aggregator asks it to aggregate.
+    """
+    database = os.environ.get('MUSKETEER_DB')
+    directory = os.environ.get('MUSKETEER_BLOB_DIR')
+    memory = int(os.environ.get('MUSKETEER_BLOB_MEMORY', BLOB_MEMORY))
+
+    if not database:
+        return Broker(BlobStore(directory, memory), Journal(), densify)
+
+    journal = SQLiteJournal(database, os.environ.get('MUSKETEER_DB_SYNC', SYNCHRONOUS))
+    return Broker(BlobStore(directory or database + '.blobs', memory, persistent=True), journal, densify)
+
+
+broker = create_broker()
+
+
+def get_task(user=None):
+    """
+    Return the task named in the request, or None if there is no such task. A participant of a tree task
+    gets the task of its group.
+    """
+    return broker.get_task(request.args.get('task_name'), user)
+
+
+def unknown_task():
+    return make_response('Unknown task', BAD_REQUEST)
+
+
+def wait_timeout():
+    """
+    Read the long-poll timeout of a receive request, capped to LONG_POLL_TIMEOUT.
+    """
+    timeout = request.args.get('timeout', 0, type=float)
+    return max(0, min(timeout, LONG_POLL_TIMEOUT))
+
+
+def read_message():
+    """
+    Read the message and the participant of a send request: a reference to a blob, a raw binary body
+    or json. Return a None message if the blob is unknown.
+    """
+    if 'blob' in request.args:
+        return broker.blobs.get(request.args['blob']), request.args.get('participant')
+
+    if request.mimetype == CONTENT_TYPE:
+        return request.get_data(), request.args.get('participant')
+
+    return request.json['message'], request.json['participant']
+
+
+def ack():
+    """
+    Read the number of the last message acknowledged by a receive request, if any.
+    """
+    return request.args.get('ack', type=int)
+
+
+def binary_response(message, notification=None):
+    """
+    Forward a binary message as is, with its notification (if any) in a header.
+    """
+    response = make_response(message, OK)
+    response.mimetype = CONTENT_TYPE
+
+    if notification is not None:
+        response.headers[NOTIFICATION_HEADER] = json.dumps(notification)
+
+    return response
+
+
+def blob_response(ref, notification=None):
+    """
+    Describe a message stored as a blob, for the receiver to download it in chunks.
+    """
+    response = binary_response(b'', notification)
+    response.headers[BLOB_HEADER] = json.dumps(ref._asdict())
+
+    return response
+
+
+def delivery_response(message_id, message, notification=None):
+    """
+    Deliver a received message, with its number for the receiver to acknowledge it.
+    """
+    if isinstance(message, BlobRef):
+        response = blob_response(message, notification)
+    elif isinstance(message, bytes):
+        response = binary_response(message, notification)
+    elif notification is not None:
+        result = {'notification': notification}
+
+        if message is not None:
+            result.update({'params': message})
+
+        response = make_response(jsonify({'message': result}), OK)
+    else:
+        response = make_response(jsonify({'message': message}), OK)
+
+    response.headers[MESSAGE_ID_HEADER] = str(message_id)
+
+    return response
+
+
+def unknown_blob():
+    return make_response('Unknown blob', NOT_FOUND)
 
 
 @app.route('/reset', methods=['GET', 'POST'])
@@ -28,151 +162,231 @@ def reset():
     """
     Clear in-memory database.
     """
-    global definition
-    global aggregator_queue
-    global participant_queue
-    global participant_list
-    global task_name
-
-    definition = {}
-    aggregator_queue = []
-    participant_queue = {}
-    participant_list = []
-    task_name = []
+    broker.reset()
+    METRICS.reset()
 
     return make_response('', OK)
 
 
 @app.route('/create_task', methods=['POST'])
 def create_task():
-    from datetime import datetime
+    """
+    Create a task; a task created again under the same name replaces the previous one.
+    """
+    broker.create_task(request.args['task_name'], request.args['message'], request.args.get('topology'),
+                       request.args.get('groups', 0, type=int))
 
-    global task_name
-    global definition
+    return make_response('', OK)
+
+
+@app.route('/stop_task', methods=['POST'])
+def stop_task():
+    task = get_task()
+
+    if task is None:
+        return unknown_task()
 
-    message = request.args['message']
-    task_name.append({'task_name': request.args['task_name'], 'status': 'CREATED',
-                      'added': datetime.now().strftime('%Y-%m-%dT%H:%M:%S')})
-    definition.update({'definition': message})
+    task.stop()
 
     return make_response('', OK)
 
 
 @app.route('/task_info', methods=['GET'])
 def task_info():
-    global definition
-    return make_response(jsonify({'message': definition}), OK)
+    task = get_task()
+
+    if task is None:
+        return unknown_task()
+
+    return make_response(jsonify({'message': task.definition}), OK)
 
 
 @app.route('/get_tasks', methods=['GET'])
 def get_tasks():
-    global task_name
-    return make_response(jsonify({'message': task_name}), OK)
+    result = broker.get_tasks()
+
+    return make_response(jsonify({'message': result}), OK)
 
 
 @app.route('/get_joined_tasks', methods=['GET'])
 def get_joined_tasks():
-    global participant_list
-
-    user = request.args['message']
-    result = task_name if user in participant_list else []
+    result = broker.get_joined_tasks(request.args['message'])
 
     return make_response(jsonify({'message': result}), OK)
 
 
 @app.route('/join_task', methods=['POST'])
 def join_task():
-    global aggregator_queue
-    global participant_list
+    task = get_task()
 
-    message = request.args['message']
+    if task is None:
+        return unknown_task()
 
-    if not ((message in participant_list) or ((message, Notification.participant_joined) in aggregator_queue)):
-        aggregator_queue.append((message, Notification.participant_joined))
-        return make_response('', OK)
-    else:
+    if not broker.join_task(task, request.args['message']):
         return make_response('', CONFLICT)
 
+    return make_response('', OK)
+
 
 @app.route('/get_participants', methods=['GET'])
 def get_participants():
-    global participant_list
-    return make_response(jsonify({'message': participant_list}), OK)
+    task = get_task()
+
+    if task is None:
+        return unknown_task()
+
+    return make_response(jsonify({'message': task.participants()}), OK)
 
 
 @app.route('/aggregator_send', methods=['POST'])
 def aggregator_send():
-    global participant_queue
+    task = get_task()
 
-    message = request.json['message']
-    participant = request.json['participant']
+    if task is None:
+        return unknown_task()
 
-    if participant is None:
-        for user in participant_queue.keys():
-            participant_queue[user].append(message)
-    else:
-        participant_queue[participant].append(message)
+    message, participant = read_message()
+
+    if message is None:
+        return unknown_blob()
+
+    task.aggregator_send(message, participant, request.args.get('round', type=int),
+                         request.args.get('max_staleness', type=int), request.args.get('aggregate', type=int),
+                         request.args.get('deadline', type=float))
 
     return make_response('', OK)
 
 
 @app.route('/aggregator_receive', methods=['GET'])
 def aggregator_receive():
-    global aggregator_queue
-    global participant_list
-    global participant_queue
+    task = get_task()
 
-    if len(aggregator_queue) > 0:
-        content = aggregator_queue[0]
+    if task is None:
+        return unknown_task()
 
-        if content[1] is Notification.participant_joined:
-            participant_list.append(content[0])
-            participant_queue.update({content[0]: []})
-            result = {'notification': {'type': Notification.participant_joined, 'participant': content[0]}}
+    content = task.aggregator_receive(wait_timeout(), ack())
 
-        elif content[1] is Notification.participant_updated:
-            msg = {'notification': {'type': Notification.participant_updated, 'participant': content[0][1]}}
-            result = {'params': content[0][0]}
-            result.update(msg)
+    if content is None:
+        return make_response('', NOT_FOUND)
 
-        final_msg = make_response(jsonify({'message': result}), OK)
+    message_id, notification, message = content
 
-        del aggregator_queue[0]
-
-    else:
-        final_msg = make_response('', NOT_FOUND)
-
-    return final_msg
+    return delivery_response(message_id, message, notification)
 
 
 @app.route('/participant_send', methods=['POST'])
 def participant_send():
-    global aggregator_queue
+    message, participant = read_message()
+    task = get_task(participant)
+
+    if task is None:
+        return unknown_task()
 
-    message = request.json['message']
-    participant = request.json['participant']
+    if message is None:
+        return unknown_blob()
 
-    aggregator_queue.append(((message, participant), Notification.participant_updated))
+    # Late updates are dropped silently, the participant simply moves on to the next round
+    task.participant_send(message, participant, request.args.get('round', type=int))
 
     return make_response('', OK)
 
 
 @app.route('/participant_receive', methods=['GET'])
 def participant_receive():
-    global participant_queue
+    task = get_task(request.args['user'])
 
-    user = request.args['user']
+    if task is None:
+        return unknown_task()
 
-    if len(participant_queue[user]) > 0:
-        result = participant_queue[user][0]
-        final_msg = make_response(jsonify({'message': result}), OK)
+    result = task.participant_receive(request.args['user'], wait_timeout(), ack())
 
-        del participant_queue[user][0]
+    if result is None:
+        return make_response('', NOT_FOUND)
 
+    return delivery_response(*result)
+
+
+@app.route('/upload_chunk', methods=['POST'])
+def upload_chunk():
+    """
+    Receive a chunk of a blob upload, rejecting it if its checksum does not match.
+    """
+    if not broker.blobs.put_chunk(request.args['digest'], request.args.get('chunk', type=int), request.get_data(),
+                                  request.args.get('checksum', type=int)):
+        return make_response('Checksum mismatch', BAD_REQUEST)
+
+    return make_response('', OK)
+
+
+@app.route('/upload_status', methods=['GET'])
+def upload_status():
+    """
+    List the chunks of an upload received so far, so that the sender only resends the missing ones.
+    """
+    return make_response(jsonify({'chunks': broker.blobs.received(request.args['digest'])}), OK)
+
+
+@app.route('/commit_upload', methods=['POST'])
+def commit_upload():
+    """
+    Store a complete upload as a blob, named by the sha256 digest of its content.
+    """
+    ref = broker.blobs.commit(request.args['digest'], request.args.get('chunks', type=int))
+
+    if ref is None:
+        return make_response('Incomplete upload', BAD_REQUEST)
+
+    return make_response(jsonify(ref._asdict()), OK)
+
+
+@app.route('/blobs/<digest>', methods=['GET'])
+def get_blob(digest):
+    """
+    Send a blob, or the byte range of it asked for, with its checksum. The digest of a blob is its ETag,
+    so that a conditional request for a blob already held by the client is answered with a 304.
+    """
+    ref = broker.blobs.get(digest)
+
+    if ref is None:
+        return unknown_blob()
+
+    if digest in request.if_none_match:
+        response = make_response('', NOT_MODIFIED)
+    else:
+        span = request.range.range_for_length(ref.size) if request.range else None
+        start, stop = span or (0, ref.size)
+        chunk = broker.blobs.read(digest, start, stop - start)
+
+        if chunk is None:
+            return unknown_blob()
+
+        response = binary_response(chunk)
+        response.headers[CHECKSUM_HEADER] = str(zlib.crc32(chunk))
+
+        if span:
+            response.status_code = PARTIAL_CONTENT
+            response.headers['Content-Range'] = request.range.to_content_range_header(ref.size)
+
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = BLOB_CACHE_CONTROL
+
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Export the measurements of the platform (time spent by messages in the queues, dropped updates) as
+    prometheus text, or as json lines of the individual measurements with format=json.
+    """
+    if request.args.get('format') == 'json':
+        response = make_response(METRICS.to_json_lines(), OK)
+        response.mimetype = JSON_LINES_CONTENT_TYPE
     else:
-        final_msg = make_response('', NOT_FOUND)
+        response = make_response(METRICS.to_prometheus(), OK)
+        response.headers['Content-Type'] = PROMETHEUS_CONTENT_TYPE
 
-    return final_msg
+    return response
 
 
 if __name__ == "__main__":
@@ -26,11 +26,20 @@ The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in acco
 Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
 """
 
+import os
+import sys
+import threading
+
 import pytest
+from werkzeug.serving import make_server
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'local_platform'))
+
 
 def pytest_addoption(parser):
-    parser.addoption("--credentials", required=True)
-    parser.addoption("--platform", required=True)
+    # The platform tests of basic.py need these; the unit tests run without them
+    parser.addoption("--credentials", default="local_credential_sample.json")
+    parser.addoption("--platform", default="local")
 
 
 @pytest.fixture
@@ -62,3 +71,19 @@ def broker_password(request):
     if request.cls:
         request.cls.broker_password = value
     return value
+
+
+@pytest.fixture(scope='session')
+def local_platform():
+    """
+    Serve the local platform from a thread, on a free port, and return its connection details.
+    """
+    import musketeer
+
+    server = make_server('127.0.0.1', 0, musketeer.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield {'url': 'http://127.0.0.1', 'port': server.server_port}
+
+    server.shutdown()
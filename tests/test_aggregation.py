@@ -0,0 +1,99 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import numpy as np
+import pytest
+
+from fl_algorithm.aggregation import RobustAverage, StreamingAverage
+
+
+TEMPLATE = [np.zeros((2, 2), np.float32), np.zeros(3, np.float32)]
+# Each update is its value times the same layers, the last one an outlier
+VALUES = [1.0, 2.0, 3.0, 5.0, 100.0]
+WEIGHTS = [1, 2, 3, 4, 10]
+
+
+def update(value):
+    return [np.full((2, 2), value, np.float32), value * np.array([1, -1, 0], np.float32)]
+
+
+def aggregate(average):
+    for value, weight in zip(VALUES, WEIGHTS):
+        average.add(update(value), weight)
+
+    return average.result()
+
+
+@pytest.mark.parametrize('rule, expected', [
+    # (1 * 1 + 2 * 2 + 3 * 3 + 4 * 5 + 10 * 100) / 20
+    ('mean', 51.7),
+    ('median', 3.0),
+    # int(0.2 * 5) = 1 update trimmed at each end: (2 + 3 + 5) / 3
+    ('trimmed_mean', 10 / 3),
+    # 5 - 1 - 2 = 2 neighbours: the update of 2 has the smallest squared distances, 6 * (1 + 1)
+    ('krum', 2.0)])
+def test_rule(rule, expected):
+    # A capacity of 2 makes the matrix of updates grow
+    result = aggregate(RobustAverage(TEMPLATE, rule, trim_ratio=0.2, byzantine=1, capacity=2, threads=1))
+
+    for layer, reference in zip(result, update(expected)):
+        assert layer.dtype == np.float32
+        np.testing.assert_allclose(layer, reference, rtol=1e-6)
+
+
+def test_streaming_average_matches_mean():
+    average = StreamingAverage(TEMPLATE)
+    result = aggregate(average)
+
+    assert average.count == 5
+    for layer, reference in zip(result, update(51.7)):
+        np.testing.assert_allclose(layer, reference, rtol=1e-6)
+
+
+def test_update_averaged_by_the_platform_is_one_row():
+    average = RobustAverage(TEMPLATE, 'median', threads=1)
+    average.add(update(1.0), 3, count=3)
+    average.add(update(4.0), 1)
+
+    assert (average.count, average.rows) == (4, 2)
+    np.testing.assert_allclose(average.result()[0], np.full((2, 2), 2.5))
+
+    average.reset()
+    with pytest.raises(ValueError):
+        average.result()
+
+
+@pytest.mark.parametrize('trim_ratio', [-0.1, 0.5, 1.0])
+def test_trim_ratio_out_of_range(trim_ratio):
+    with pytest.raises(ValueError):
+        RobustAverage(TEMPLATE, 'trimmed_mean', trim_ratio=trim_ratio, threads=1)
+
+
+def test_trim_ratio_of_zero_is_the_unweighted_mean():
+    result = aggregate(RobustAverage(TEMPLATE, 'trimmed_mean', trim_ratio=0, threads=1))
+
+    # (1 + 2 + 3 + 5 + 100) / 5
+    np.testing.assert_allclose(result[0], np.full((2, 2), 22.2), rtol=1e-6)
@@ -0,0 +1,105 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+
+import pycloudmessenger.ffl.abstractions as fflabc
+
+import comm.localapi as localapi
+from comm.asyncapi import AsyncAggregator, AsyncParticipant
+
+# Timeout of the tests, which would otherwise hang on a deadlock
+TIMEOUT = 30
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(asyncio.wait_for(coroutine, TIMEOUT))
+    finally:
+        loop.close()
+
+
+def create_task(config):
+    """
+    Create a task joined by one participant, and return its name.
+    """
+    task_name = 'test_%s' % uuid.uuid4().hex
+
+    with localapi.User(localapi.Context(config, 'aggregator')) as user:
+        user.create_task(task_name, 'STAR', {'quorum': 1})
+
+    with localapi.User(localapi.Context(config, 'participant')) as user:
+        user.join_task(task_name)
+
+    return task_name
+
+
+async def exchange(config, message):
+    """
+    Broadcast a message and send it back, and return the joins, message and update received.
+    """
+    task_name = create_task(config)
+
+    async with AsyncAggregator(localapi.Context(config, 'aggregator'), task_name) as aggregator, \
+            AsyncParticipant(localapi.Context(config, 'participant'), task_name) as participant:
+        joined = await aggregator.receive(5)
+        await aggregator.send(message)
+        received = await participant.receive(5)
+        await participant.send(received.content)
+        update = await aggregator.receive(5)
+
+    return joined, received, update, aggregator.participant_list
+
+
+@pytest.mark.parametrize('size', [16, 2 ** 18])
+def test_round_trip(local_platform, size):
+    # A pool of a single connection, and blobs of several chunks for the larger messages
+    config = dict(local_platform, pool_size=1, blob_size=2 ** 16, chunk_size=2 ** 18)
+    weights = np.arange(size, dtype=np.float32)
+
+    joined, received, update, participants = run(exchange(config, {'weights': [weights], 'round': 0}))
+
+    assert fflabc.Notification.is_participant_joined(joined.notification)
+    assert participants == ['participant']
+    np.testing.assert_array_equal(received.content['weights'][0], weights)
+    assert fflabc.Notification.is_participant_updated(update.notification)
+    np.testing.assert_array_equal(update.content['weights'][0], weights)
+
+
+def test_receive_timeout(local_platform):
+    task_name = create_task(local_platform)
+
+    async def receive():
+        async with AsyncParticipant(localapi.Context(local_platform, 'participant'), task_name) as participant:
+            await participant.receive(0.5)
+
+    with pytest.raises(localapi.TimedOutException):
+        run(receive())
@@ -0,0 +1,120 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import numpy as np
+import pytest
+
+from comm.broker import Broker, TREE, group_name
+from comm.journal import SQLiteJournal
+from comm.serializer import BinarySerializer
+
+
+def densify(update):
+    return [np.asarray(layer) for layer in update['layers']]
+
+
+def update(value, round_id=0):
+    return BinarySerializer().serialize({'update': {'scheme': 'none', 'layers': [np.full(3, value, np.float32)]},
+                                         'samples': 1, 'round': round_id})
+
+
+def summed_task(users, target):
+    broker = Broker(densify=densify)
+    task = broker.create_task('task', {})
+
+    for user in users:
+        broker.join_task(task, user)
+        task.aggregator_receive()
+
+    task.aggregator_send(b'model', round_id=0, aggregate=target)
+    return task
+
+
+def test_updates_after_the_round_sum_are_dropped():
+    task = summed_task(['a', 'b', 'c'], target=2)
+
+    assert task.participant_send(update(1.0), 'a', round_id=0)
+    assert task.participant_send(update(3.0), 'b', round_id=0)
+    assert not task.participant_send(update(5.0), 'c', round_id=0)
+    assert task.dropped == 1
+
+    message_id, notification, message = task.aggregator_receive()
+    content = BinarySerializer().deserialize(message)
+    assert content['participants'] == ['a', 'b']
+    np.testing.assert_allclose(content['update']['layers'][0], [2.0, 2.0, 2.0])
+    assert task.aggregator_receive(ack=message_id) is None
+
+
+def test_round_sent_again_takes_updates_again():
+    task = summed_task(['a', 'b'], target=1)
+
+    assert task.participant_send(update(1.0), 'a', round_id=0)
+    task.aggregator_receive()
+
+    task.aggregator_send(b'model', round_id=0, aggregate=1)
+    assert task.participant_send(update(3.0), 'b', round_id=0)
+    assert task.dropped == 0
+
+
+class Samples:
+    pass
+
+
+def test_update_header_decoded_as_plain_json():
+    task = summed_task(['a', 'b'], target=2)
+    # An object in the header of an update, json-pickled, which the platform must not build
+    message = BinarySerializer().serialize({'update': {'scheme': 'none', 'layers': [np.ones(3, np.float32)]},
+                                            'samples': Samples(), 'round': 0})
+    assert b'py/object' in message
+
+    assert task.participant_send(message, 'a', round_id=0)
+    assert task.participant_send(update(3.0), 'b', round_id=0)
+
+    # Forwarded to the aggregator as it is, and left out of the sum of the platform
+    assert task.aggregator_receive()[2] == message
+    assert task.sum.participants == ['b']
+
+    with pytest.raises(ValueError):
+        BinarySerializer(trusted=False).deserialize(message)
+
+
+def test_replaced_tree_task_drops_its_groups(tmp_path):
+    journal = SQLiteJournal(str(tmp_path / 'journal.db'))
+    broker = Broker(journal=journal, densify=densify)
+    task = broker.create_task('task', {}, topology=TREE, groups=2)
+    groups = [broker.get_task(group_name('task', group)) for group in range(2)]
+
+    for group in groups:
+        group.start_sum(0, target=1, deadline=60)
+
+    broker.create_task('task', {}, topology=TREE, groups=1)
+
+    # The round timers of the replaced groups are cancelled, and the group left out is forgotten
+    assert all(group.timer is None and group.sum is None for group in groups)
+    assert broker.get_task(group_name('task', 0)) is not groups[0]
+    assert broker.get_task(group_name('task', 1)) is None
+    assert group_name('task', 1) not in [name for name, state in journal.load()[0]]
+    assert task is not broker.get_task('task')
@@ -0,0 +1,77 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import os
+
+import numpy as np
+
+from fl_algorithm.checkpoint import Checkpointer, FILE_NAME
+
+
+def state(round_id):
+    return {'round': round_id, 'weights': [np.full((2, 3), round_id, np.float32)], 'optimizer': [],
+            'timings': [{'round': round_id - 1}]}
+
+
+def test_checkpoint_due_every_rounds_and_after_the_last(tmp_path):
+    checkpoint = Checkpointer(str(tmp_path), every=3)
+    checkpoint.close()
+
+    assert [round_id for round_id in range(7) if checkpoint.is_due(round_id, last_round=7)] == [2, 5, 6]
+
+
+def test_latest_checkpoint_loaded(tmp_path):
+    checkpoint = Checkpointer(str(tmp_path), keep=2)
+
+    for round_id in range(1, 4):
+        checkpoint.save(state(round_id))
+        # Waits for the writer, so that no checkpoint is skipped
+        checkpoint.close()
+        checkpoint = Checkpointer(str(tmp_path), keep=2)
+
+    # The older checkpoints are deleted, and nothing is left half written
+    assert sorted(os.listdir(str(tmp_path))) == [FILE_NAME % 2, FILE_NAME % 3]
+
+    loaded = checkpoint.load()
+    checkpoint.close()
+
+    assert loaded['round'] == 3 and loaded['timings'] == [{'round': 2}]
+    np.testing.assert_array_equal(loaded['weights'][0], state(3)['weights'][0])
+
+
+def test_unreadable_checkpoint_skipped(tmp_path):
+    checkpoint = Checkpointer(str(tmp_path))
+    checkpoint.save(state(1))
+    checkpoint.close()
+
+    with open(os.path.join(str(tmp_path), FILE_NAME % 2), 'wb') as corrupted:
+        corrupted.write(b'\x00\x00')
+
+    assert Checkpointer(str(tmp_path)).load()['round'] == 1
+
+
+def test_nothing_to_load(tmp_path):
+    assert Checkpointer(str(tmp_path / 'checkpoints')).load() is None
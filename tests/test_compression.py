@@ -0,0 +1,88 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import numpy as np
+import pytest
+
+from comm.serializer import BinarySerializer
+from fl_algorithm.compression import SCHEMES, Compressor, decode, densify
+
+
+def model(seed):
+    random = np.random.RandomState(seed)
+    return [random.randn(4, 5).astype(np.float32), random.randn(5).astype(np.float32)]
+
+
+def round_trip(update):
+    """
+    The update as received by the aggregator, through the binary serializer.
+    """
+    serializer = BinarySerializer()
+    return serializer.deserialize(serializer.serialize({'update': update}))['update']
+
+
+# Largest error of each scheme on a delta of peak 1, relative to its peak
+TOLERANCES = {'none': 0, 'delta': 1e-6, 'fp16': 1e-3, 'int8': 0.5 / 127, 'topk': 1e-6}
+
+
+@pytest.mark.parametrize('scheme', SCHEMES)
+def test_round_trip(scheme):
+    reference = model(0)
+    weights = [base + delta for base, delta in zip(reference, model(1))]
+
+    # Top-k keeping every coordinate is exact
+    update = round_trip(Compressor(scheme, ratio=1.0).encode(weights, reference))
+    assert update['scheme'] == scheme
+
+    for decoded, expected, base in zip(decode(update, reference), weights, reference):
+        assert decoded.shape == expected.shape
+        peak = np.max(np.abs(expected - base))
+        np.testing.assert_allclose(decoded, expected, rtol=0, atol=TOLERANCES[scheme] * peak + 1e-6)
+
+
+@pytest.mark.parametrize('scheme', [scheme for scheme in SCHEMES if scheme != 'none'])
+def test_densify_gives_the_deltas(scheme):
+    reference = model(0)
+    weights = [base + delta for base, delta in zip(reference, model(1))]
+    update = round_trip(Compressor(scheme, ratio=1.0).encode(weights, reference))
+
+    for delta, decoded, base in zip(densify(update), decode(update, reference), reference):
+        np.testing.assert_allclose(base + delta.reshape(base.shape), decoded, rtol=0, atol=1e-6)
+
+
+def test_topk_keeps_the_rest_as_residual():
+    reference = model(0)
+    weights = [base + delta for base, delta in zip(reference, model(1))]
+    compressor = Compressor('topk', ratio=0.2)
+
+    update = round_trip(compressor.encode(weights, reference))
+    assert [len(layer['indices']) for layer in update['layers']] == [4, 1]
+
+    # The coordinates sent and those left in the residual add up to the whole update
+    for decoded, residual, expected, base in zip(decode(update, reference), compressor.residual, weights,
+                                                 reference):
+        np.testing.assert_allclose(decoded + residual, expected, rtol=0, atol=1e-6)
+        assert np.count_nonzero(decoded - base) == np.count_nonzero(residual == 0)
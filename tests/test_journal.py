@@ -0,0 +1,104 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import pycloudmessenger.ffl.abstractions as fflabc
+
+import comm.inprocapi as inprocapi
+from comm.broker import Broker, MessageQueue
+from comm.journal import SQLiteJournal
+
+
+def test_unacknowledged_messages_delivered_again():
+    queue = MessageQueue('task', 'participant', 'user')
+    queue.put(b'first')
+    queue.put(b'second')
+
+    assert queue.get() == (1, b'first')
+    assert queue.get(ack=0) == (1, b'first')
+    assert queue.get(ack=1) == (2, b'second')
+    assert queue.get(ack=2) is None
+    assert len(queue) == 0
+
+
+def test_broker_recovers_from_journal(tmp_path):
+    path = str(tmp_path / 'journal.db')
+    broker = Broker(journal=SQLiteJournal(path))
+    task = broker.create_task('task', {'quorum': 2})
+
+    for user in ['a', 'b']:
+        broker.join_task(task, user)
+        task.aggregator_receive()
+
+    task.aggregator_send(b'model', round_id=3)
+    task.participant_send(b'update', 'a', round_id=3)
+
+    # Participant a receives the model without acknowledging it, participant b acknowledges it
+    assert task.participant_receive('a') == (1, b'model')
+    assert task.participant_receive('b') == (1, b'model')
+    assert task.participant_receive('b', ack=1) is None
+    broker.journal.close()
+
+    recovered = Broker(journal=SQLiteJournal(path)).get_task('task')
+
+    assert recovered.definition == {'definition': {'quorum': 2}}
+    assert recovered.round == 3
+    assert recovered.participants() == ['a', 'b']
+    assert recovered.participant_receive('a') == (1, b'model')
+    assert recovered.participant_receive('b') is None
+
+    # The join of b was delivered to the aggregator but not acknowledged, delivering it again registers nobody
+    message_id, notification, message = recovered.aggregator_receive()
+    assert notification['participant'] == 'b'
+
+    message_id, notification, message = recovered.aggregator_receive(ack=message_id)
+    assert (notification['participant'], message) == ('a', b'update')
+    assert recovered.participants() == ['a', 'b']
+
+    recovered.journal.close()
+
+
+def test_join_delivered_again_listed_once(tmp_path, monkeypatch):
+    path = str(tmp_path / 'journal.db')
+    monkeypatch.setattr(inprocapi, 'broker', Broker(journal=SQLiteJournal(path)))
+
+    with inprocapi.User(inprocapi.Context({}, 'creator')) as user:
+        user.create_task('task', 'STAR', {'quorum': 1})
+
+    with inprocapi.User(inprocapi.Context({}, 'alice')) as user:
+        user.join_task('task')
+
+    aggregator = inprocapi.Aggregator(inprocapi.Context({}, 'creator'), 'task')
+    aggregator.receive(1)
+
+    # The platform restarts before the aggregator acknowledges the join
+    inprocapi.broker.journal.close()
+    monkeypatch.setattr(inprocapi, 'broker', Broker(journal=SQLiteJournal(path)))
+
+    assert fflabc.Notification.is_participant_joined(aggregator.receive(1).notification)
+    assert aggregator.participant_list == ['alice']
+    assert aggregator.get_participants() == ['alice']
+
+    inprocapi.broker.journal.close()
@@ -0,0 +1,170 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+import requests
+
+from comm.localapi import BasicParticipant, Context, User, Aggregator, Participant, TimedOutException, \
+    MESSAGE_ID_HEADER
+
+
+def create_task(config, participants=('participant',)):
+    """
+    Create a task joined by participants, and return its name.
+    """
+    task_name = 'test_%s' % uuid.uuid4().hex
+
+    with User(Context(config, 'aggregator')) as user:
+        user.create_task(task_name, 'STAR', {'quorum': len(participants)})
+
+    for participant in participants:
+        with User(Context(config, participant)) as user:
+            user.join_task(task_name)
+
+    return task_name
+
+
+def test_session_outlives_the_users_of_a_context():
+    context = Context({'url': 'http://localhost', 'port': 5000}, user='user')
+
+    with BasicParticipant(context):
+        session = context.pool.session
+
+    with BasicParticipant(context):
+        assert context.pool.session is session
+
+    context.close()
+    assert context.pool.session is None
+    assert context.pool.get() is not session
+
+
+def test_receive_waits_for_a_message(local_platform):
+    task_name = create_task(local_platform)
+    aggregator = Aggregator(Context(local_platform, 'aggregator'), task_name)
+    participant = Participant(Context(local_platform, 'participant'), task_name)
+
+    with aggregator:
+        aggregator.receive(5)
+
+    # Sent while the participant's receive is held open by the platform
+    timer = threading.Timer(0.5, lambda: aggregator.send({'round': 0}))
+    timer.start()
+
+    start = time.time()
+    with participant:
+        message = participant.receive(10)
+
+    assert message.content == {'round': 0}
+    assert 0.4 < time.time() - start < 5
+    timer.join()
+
+
+def test_receive_timeout(local_platform):
+    participant = Participant(Context(local_platform, 'participant'), create_task(local_platform))
+
+    start = time.time()
+    with participant, pytest.raises(TimedOutException):
+        participant.receive(0.5)
+
+    assert 0.5 <= time.time() - start < 5
+
+
+def test_unacknowledged_message_delivered_again(local_platform):
+    task_name = create_task(local_platform)
+
+    with Aggregator(Context(local_platform, 'aggregator'), task_name) as aggregator:
+        aggregator.receive(5)
+        aggregator.send({'round': 0})
+        aggregator.send({'round': 1})
+
+    url = '%s:%d/participant_receive' % (local_platform['url'], local_platform['port'])
+
+    def receive(ack):
+        r = requests.get(url, params={'task_name': task_name, 'user': 'participant', 'timeout': 0, 'ack': ack})
+        return r.status_code, r.headers.get(MESSAGE_ID_HEADER)
+
+    # A receiver that failed to get a message gets it again, until it acknowledges it with its next receive
+    assert receive(0) == (200, '1')
+    assert receive(0) == (200, '1')
+    assert receive(1) == (200, '2')
+    assert receive(2) == (404, None)
+
+    # The client acknowledges each message with its next receive
+    participant = Participant(Context(local_platform, 'participant'), task_name)
+    with Aggregator(Context(local_platform, 'aggregator'), task_name) as aggregator:
+        aggregator.send({'round': 2})
+        aggregator.send({'round': 3})
+
+    with participant:
+        assert [participant.receive(5).content['round'] for _ in range(2)] == [2, 3]
+
+
+def test_tasks_served_at_once(local_platform):
+    first = create_task(local_platform, participants=('a', 'b'))
+    second = create_task(local_platform, participants=('b',))
+
+    aggregators = [Aggregator(Context(local_platform, 'aggregator'), task_name) for task_name in (first, second)]
+
+    # Each aggregator is notified of the joins to its own task only
+    for aggregator, joins in zip(aggregators, (2, 1)):
+        with aggregator:
+            for _ in range(joins):
+                aggregator.receive(5)
+
+            with pytest.raises(TimedOutException):
+                aggregator.receive(0)
+
+    assert aggregators[0].get_participants() == ['a', 'b']
+    assert aggregators[1].get_participants() == ['b']
+
+    # The queues of a participant in both tasks are kept apart
+    with aggregators[0], aggregators[1]:
+        aggregators[0].send({'task': first})
+        aggregators[1].send({'task': second})
+
+    for task_name in (second, first):
+        with Participant(Context(local_platform, 'b'), task_name) as participant:
+            assert participant.receive(5).content == {'task': task_name}
+
+    with User(Context(local_platform, 'b')) as user:
+        joined = [task['task_name'] for task in user.get_joined_tasks()]
+        assert first in joined and second in joined
+
+    with User(Context(local_platform, 'a')) as user:
+        joined = [task['task_name'] for task in user.get_joined_tasks()]
+        assert first in joined and second not in joined
+
+    # Stopping a task leaves the other one running
+    with aggregators[1]:
+        aggregators[1].stop_task({'task': second})
+
+    with User(Context(local_platform, 'a')) as user:
+        status = {task['task_name']: task['status'] for task in user.get_tasks()}
+        assert status[first] == 'CREATED' and status[second] == 'COMPLETE'
@@ -0,0 +1,106 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import json
+
+import requests
+
+from comm.metrics import Metrics, PREFIX
+from comm.localapi import Context, Aggregator, Participant
+from test_localapi import create_task
+
+
+def test_json_lines():
+    metrics = Metrics(max_records=2)
+    metrics.record('fit_seconds', 1.5, task='task', user='a', round=0)
+    metrics.record('fit_seconds', 2.5, task='task', user=None, round=1)
+    metrics.record('dropped_updates', 1, task='task', user='b', round=1)
+
+    records = [json.loads(line) for line in metrics.to_json_lines().splitlines()]
+
+    # The oldest measurement is left out of the export, labels set to None are left out of a measurement
+    assert [(record['name'], record['value']) for record in records] == [('fit_seconds', 2.5), ('dropped_updates', 1)]
+    assert 'user' not in records[0] and records[0]['round'] == 1 and records[1]['user'] == 'b'
+    assert all(isinstance(record['time'], float) for record in records)
+
+
+def test_export_appends(tmp_path):
+    metrics = Metrics()
+    path = str(tmp_path / 'metrics.jsonl')
+
+    metrics.record('fit_seconds', 1.0)
+    metrics.export(path)
+    metrics.record('fit_seconds', 2.0)
+    metrics.export(path)
+
+    with open(path) as lines:
+        assert [json.loads(line)['value'] for line in lines] == [1.0, 1.0, 2.0]
+
+
+def test_prometheus():
+    metrics = Metrics(max_records=1)
+    metrics.record('fit_seconds', 1.5, task='task', user='a', round=0)
+    metrics.record('fit_seconds', 2.5, task='task', user='a', round=1)
+    metrics.record('fit_seconds', 1.0, task='task', user='b"c', round=1)
+    metrics.record('dropped_updates', 1)
+
+    # The summaries cover every measurement, whatever the round, and label values are escaped
+    assert metrics.to_prometheus().splitlines() == [
+        '# TYPE %sdropped_updates summary' % PREFIX,
+        '%sdropped_updates_count 1' % PREFIX,
+        '%sdropped_updates_sum 1.0' % PREFIX,
+        '# TYPE %sfit_seconds summary' % PREFIX,
+        '%sfit_seconds_count{task="task",user="a"} 2' % PREFIX,
+        '%sfit_seconds_sum{task="task",user="a"} 4.0' % PREFIX,
+        '%sfit_seconds_count{task="task",user="b\\"c"} 1' % PREFIX,
+        '%sfit_seconds_sum{task="task",user="b\\"c"} 1.0' % PREFIX]
+
+    metrics.reset()
+    assert metrics.to_json_lines() == '' and metrics.to_prometheus() == '\n'
+
+
+def test_platform_metrics(local_platform):
+    task_name = create_task(local_platform)
+
+    with Aggregator(Context(local_platform, 'aggregator'), task_name) as aggregator:
+        aggregator.receive(5)
+        aggregator.send({'round': 0})
+
+    with Participant(Context(local_platform, 'participant'), task_name) as participant:
+        participant.receive(5)
+
+    url = '%s:%d/metrics' % (local_platform['url'], local_platform['port'])
+
+    r = requests.get(url, params={'format': 'json'})
+    records = [json.loads(line) for line in r.text.splitlines()]
+    waits = [record for record in records if record['name'] == 'queue_wait_seconds' and record['task'] == task_name]
+    assert sorted(record['queue'] for record in waits) == ['aggregator', 'participant']
+    assert all(record['value'] >= 0 for record in waits)
+
+    r = requests.get(url)
+    assert r.headers['Content-Type'].startswith('text/plain')
+    series = '%squeue_wait_seconds_count{queue="participant",task="%s",user="participant"} 1' % (PREFIX, task_name)
+    assert series in r.text.splitlines()
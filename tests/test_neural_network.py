@@ -0,0 +1,149 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+pytest.importorskip('keras')
+
+import comm.inprocapi as fflapi
+from fl_algorithm import dataset
+from fl_algorithm import neural_network
+
+
+DEFINITION = {'quorum': 3, 'round': 2, 'epoch': 1, 'batch_size': 4, 'learning_rate': 0.001,
+              'training_size': 8, 'test_size': 8, 'pipeline': False}
+
+
+@pytest.fixture(autouse=True)
+def synthetic_data(monkeypatch):
+    """
+    Random images instead of the MNIST cache, a different shard for each number.
+    """
+    def load_shard(train, size, shard=0, directory=None, seed=0):
+        random = np.random.RandomState(shard + (0 if train else 1000))
+        return random.rand(size, 28, 28).astype(np.float32), random.randint(0, 10, size)
+
+    monkeypatch.setattr(dataset, 'load_shard', load_shard)
+
+
+def run_task(definition, shards=True, **kwargs):
+    """
+    Run a task on the in-process platform, its participants in threads, and return the aggregator and the
+    participants. The participants are given their shard, or get it from the aggregator unless shards is set.
+    The aggregator is created with kwargs.
+    """
+    task_name = 'test_%s' % uuid.uuid4().hex
+
+    with fflapi.User(fflapi.Context({}, 'aggregator')) as user:
+        user.create_task(task_name, 'STAR', definition)
+
+    participants = []
+    for shard in range(definition['quorum']):
+        context = fflapi.Context({}, '%s_%d' % (task_name, shard))
+
+        with fflapi.User(context) as user:
+            user.join_task(task_name)
+
+        participants.append(neural_network.Participant(definition, fflapi.Participant(context, task_name),
+                                                       shard if shards else None))
+
+    aggregator = neural_network.Aggregator(definition,
+                                           fflapi.Aggregator(fflapi.Context({}, 'aggregator'), task_name), **kwargs)
+    # Daemon threads, so that a failing aggregator fails the test instead of leaving participants waiting
+    threads = [threading.Thread(target=participant.start, daemon=True) for participant in participants]
+
+    for thread in threads:
+        thread.start()
+
+    model = aggregator.start()
+
+    with aggregator.comms:
+        aggregator.comms.stop_task(model)
+
+    for thread in threads:
+        thread.join()
+
+    return aggregator, participants
+
+
+@pytest.mark.parametrize('rule', ['mean', 'trimmed_mean', 'median', 'krum'])
+def test_rounds_with_aggregation_rule(rule):
+    aggregator, participants = run_task(dict(DEFINITION, aggregation=rule, byzantine=0))
+
+    assert [timing['round'] for timing in aggregator.timings] == [0, 1]
+    assert [len(participant.timings) for participant in participants] == [2, 2, 2]
+
+
+def test_shards_assigned_in_join_order():
+    _, participants = run_task(DEFINITION, shards=False)
+
+    for shard, participant in enumerate(participants):
+        features, _ = dataset.load_shard(True, DEFINITION['training_size'], shard)
+        np.testing.assert_array_equal(participant.feature.reshape(features.shape), features)
+
+
+def test_resume_from_checkpoint(tmp_path):
+    first, _ = run_task(DEFINITION, checkpoint_dir=str(tmp_path))
+    weights = first.checkpoint.load()['weights']
+
+    # A longer run resumes after the rounds of the checkpoint, with its global model and timings
+    resumed, participants = run_task(dict(DEFINITION, round=3), checkpoint_dir=str(tmp_path), resume=True)
+
+    assert [timing['round'] for timing in resumed.timings] == [0, 1, 2]
+    assert resumed.timings[:2] == first.timings
+    assert [len(participant.timings) for participant in participants] == [1, 1, 1]
+    assert resumed.checkpoint.load()['round'] == 3
+    assert not all(np.array_equal(old, new) for old, new in zip(weights, resumed.checkpoint.load()['weights']))
+
+
+@pytest.mark.parametrize('pipeline', [True, False])
+def test_evaluation_pipelined_on_the_replica(monkeypatch, pipeline):
+    evaluations = []
+    evaluate_round = neural_network.Aggregator.evaluate_round
+
+    def record(self, model, weights, optimizer, round_id, start, end=None):
+        evaluations.append((model, threading.current_thread().name, end))
+        evaluate_round(self, model, weights, optimizer, round_id, start, end)
+
+    monkeypatch.setattr(neural_network.Aggregator, 'evaluate_round', record)
+    aggregator, _ = run_task(dict(DEFINITION, pipeline=pipeline))
+
+    assert [timing['round'] for timing in aggregator.timings] == [0, 1]
+    assert len(evaluations) == 2
+
+    if pipeline:
+        # Evaluated in the background on the replica, the round timed up to its aggregation
+        assert all(model is aggregator.replica and thread == 'evaluator' and end is not None
+                   for model, thread, end in evaluations)
+        assert aggregator.evaluator is None
+    else:
+        assert aggregator.replica is None
+        assert all(model is not None and thread == threading.current_thread().name and end is None
+                   for model, thread, end in evaluations)
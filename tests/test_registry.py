@@ -0,0 +1,66 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+from fl_algorithm import registry as registry_module
+from fl_algorithm.registry import Registry
+
+
+def test_entry_points_of_installed_packages(tmp_path, monkeypatch):
+    distribution = tmp_path / 'plugin-1.0.dist-info'
+    distribution.mkdir()
+    (distribution / 'METADATA').write_text('Metadata-Version: 2.1\nName: plugin\nVersion: 1.0\n')
+    (distribution / 'entry_points.txt').write_text('[musketeer.algorithms]\n'
+                                                   'plugin.Aggregator = plugin.module:Aggregator\n'
+                                                   '[console_scripts]\n'
+                                                   'plugin = plugin.module:main\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = Registry()
+    registry.register('local.Aggregator', Registry)
+
+    assert registry.names() == ['local.Aggregator', 'plugin.Aggregator']
+    assert registry.load('local.Aggregator') is Registry
+
+
+def test_built_in_algorithm_loaded_without_scanning(monkeypatch):
+    scanned = []
+
+    def entry_points(group):
+        scanned.append(group)
+        return [('plugin.Aggregator', 'fl_algorithm.registry:Registry')]
+
+    monkeypatch.setattr(registry_module, 'entry_points', entry_points)
+
+    registry = Registry()
+    registry.register('local.Aggregator', 'fl_algorithm.registry:Registry')
+
+    assert registry.load('local.Aggregator') is Registry
+    assert scanned == []
+
+    # Installed packages are scanned once, for the first algorithm that is not built in
+    assert registry.load('plugin.Aggregator') is Registry
+    assert registry.names() == ['local.Aggregator', 'plugin.Aggregator']
+    assert scanned == ['musketeer.algorithms']
@@ -0,0 +1,98 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+import pytest
+
+from comm.broker import Broker
+from fl_algorithm.rounds import RoundPolicy
+
+
+def policy(name, **definition):
+    return RoundPolicy(dict(definition, quorum=4, round_policy=name))
+
+
+def test_sync():
+    sync = policy('sync')
+
+    assert not sync.is_async
+    assert (sync.target(), sync.expires(10), sync.staleness()) == (4, None, 0)
+    assert sync.accepts(3, 3) and sync.accepts(None, 3)
+    assert not sync.accepts(2, 3)
+
+
+def test_first_k():
+    assert policy('first_k', round_k=2).target() == 2
+    assert policy('first_k', round_k=6).target() == 4
+    assert policy('first_k').target() == 4
+    assert not policy('first_k', round_k=2).accepts(2, 3)
+
+
+def test_deadline():
+    deadline = policy('deadline', round_deadline=5)
+
+    assert (deadline.target(), deadline.expires(10)) == (4, 15)
+    assert not deadline.accepts(2, 3)
+
+
+def test_async():
+    asynchronous = policy('async', max_staleness=2, staleness_exponent=1)
+
+    assert asynchronous.is_async
+    assert asynchronous.staleness() == 2
+    assert asynchronous.accepts(1, 3) and asynchronous.accepts(3, 3)
+    assert not asynchronous.accepts(0, 3)
+    assert not asynchronous.accepts(4, 3)
+    assert asynchronous.staleness_weight(0) == 1
+    assert asynchronous.staleness_weight(3) == 0.25
+    assert policy('async').accepts(0, 100)
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        policy('sometimes')
+
+
+@pytest.mark.parametrize('name, delivered', [('sync', [3]), ('async', [3, 2, 1])])
+def test_platform_drops_late_updates(name, delivered):
+    rounds = policy(name, max_staleness=2)
+    task = Broker().create_task('task', {})
+    task.join('user')
+    task.aggregator_receive()
+
+    task.aggregator_send(b'model', round_id=3, max_staleness=rounds.staleness())
+
+    for round_id in [3, 2, 1, 0]:
+        assert task.participant_send(round_id, 'user', round_id=round_id) == (round_id in delivered)
+
+    assert task.dropped == 4 - len(delivered)
+
+    received = []
+    message = task.aggregator_receive()
+    while message is not None:
+        received.append(message[2])
+        message = task.aggregator_receive(ack=message[0])
+
+    assert received == delivered
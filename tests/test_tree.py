@@ -0,0 +1,69 @@
+
+"""
+ Licensed to the Apache Software Foundation (ASF) under one or more
+ contributor license agreements.  See the NOTICE file distributed with
+ this work for additional information regarding copyright ownership.
+ The ASF licenses this file to You under the Apache License, Version 2.0
+ (the "License"); you may not use this file except in compliance with
+ the License.  You may obtain a copy of the License at
+ 
+ http://www.apache.org/licenses/LICENSE-2.0
+ 
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+IBM-Review-Requirement: Art30.3 - DO NOT TRANSFER OR EXCLUSIVELY LICENSE THE FOLLOWING CODE UNTIL 30/11/2025!
+Please note that the following code was developed for the project MUSKETEER in DRL funded by the European Union
+under the Horizon 2020 Program.
+The project started on 01/12/2018 and was completed on 30/11/2021. Thus, in accordance with article 30.3 of the
+Multi-Beneficiary General Model Grant Agreement of the Program, the above limitations are in force until 30/11/2025.
+"""
+
+from pycloudmessenger.ffl.abstractions import Notification
+
+from comm.broker import TREE, Broker, group_name
+
+
+def test_participants_routed_to_group_tasks():
+    broker = Broker()
+    task = broker.create_task('task', {}, TREE, groups=2)
+
+    # The sub-aggregators join the task on behalf of their group
+    assert task.size() == 2
+    assert task.is_joined('task/0') and task.is_joined('task/1')
+
+    users = ['a', 'b', 'c']
+    for user in users:
+        assert broker.join_task(task, user)
+
+    assert not broker.join_task(task, 'a')
+
+    # The participants are spread evenly over the groups, in the order they joined
+    assert task.routes == {'a': 'task/0', 'b': 'task/1', 'c': 'task/0'}
+    assert broker.get_task('task', 'a') is broker.get_task(group_name('task', 0))
+    assert broker.get_task('task', 'b') is broker.get_task(group_name('task', 1))
+    assert broker.get_task('task') is task
+    assert broker.get_task('task', 'task/0') is task
+
+    # Their joins and updates reach the sub-aggregator of their group, not the aggregator
+    group = broker.get_task('task', 'b')
+    message_id, notification, _ = group.aggregator_receive()
+    assert notification == {'type': Notification.participant_joined, 'participant': 'b'}
+    assert group.participants() == ['b']
+
+    assert group.participant_send(b'update', 'b')
+    assert group.aggregator_receive(ack=message_id)[1:] == \
+        ({'type': Notification.participant_updated, 'participant': 'b'}, b'update')
+
+    joined = []
+    message = task.aggregator_receive()
+    while message is not None:
+        joined.append(message[1]['participant'])
+        message = task.aggregator_receive(ack=message[0])
+
+    assert joined == ['task/0', 'task/1']